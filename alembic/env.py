@@ -33,6 +33,19 @@ from sqlmodel import SQLModel
 from models.models import User
 target_metadata = SQLModel.metadata
 
+# Objetos da busca textual (db/search_index.py) ficam fora do autogenerate: o índice GIN é de
+# expressão e as tabelas FTS5 (com as tabelas internas *_fts_*) só existem no sqlite.
+# São criados e removidos pela migration b2e9d4a61f35.
+from db.search_index import SEARCH_INDEXES, SEARCH_TABLES, fts_table
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not any(name == fts_table(table) or name.startswith(f"{fts_table(table)}_") for table in SEARCH_TABLES)
+    return True
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and name in SEARCH_INDEXES)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -57,6 +70,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -78,7 +93,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name, include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,37 @@
+"""add query indexes
+
+Revision ID: 3b1e6f0a9c47
+Revises: 882bdf2bd842
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1e6f0a9c47'
+down_revision: Union[str, Sequence[str], None] = '882bdf2bd842'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_project_owner_id'), 'project', ['owner_id'], unique=False)
+    op.create_index('ix_projectuserlink_user_id_project_role', 'projectuserlink', ['user_id', 'project_role'], unique=False)
+    op.create_index(op.f('ix_task_assigned_to_id'), 'task', ['assigned_to_id'], unique=False)
+    op.create_index('ix_task_project_id_assigned_to_id', 'task', ['project_id', 'assigned_to_id'], unique=False)
+    op.create_index('ix_task_project_id_status', 'task', ['project_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_project_id_status', table_name='task')
+    op.drop_index('ix_task_project_id_assigned_to_id', table_name='task')
+    op.drop_index(op.f('ix_task_assigned_to_id'), table_name='task')
+    op.drop_index('ix_projectuserlink_user_id_project_role', table_name='projectuserlink')
+    op.drop_index(op.f('ix_project_owner_id'), table_name='project')
@@ -0,0 +1,58 @@
+"""add project task stats
+
+Revision ID: 5d2c8a7e4f10
+Revises: 3b1e6f0a9c47
+Create Date: 2026-10-18 14:03:52.118734
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8a7e4f10'
+down_revision: Union[str, Sequence[str], None] = '3b1e6f0a9c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS_VALUES = {'TODO': 'todo', 'IN_PROGRESS': 'inprogress', 'DONE': 'done'}
+URGENCY_VALUES = {'LOW': 'low', 'MEDIUM': 'medium', 'HIGH': 'high'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stats = op.create_table('projecttaskstat',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'dimension', 'value')
+    )
+
+    # Preenche os contadores com as tasks existentes
+    task = sa.table('task', sa.column('project_id', sa.Integer()), sa.column('status', sa.String()),
+                    sa.column('urgency', sa.String()), sa.column('assigned_to_id', sa.Uuid()))
+    grouped = (sa.select(task.c.project_id, task.c.status, task.c.urgency, task.c.assigned_to_id, sa.func.count())
+               .where(task.c.project_id.isnot(None))
+               .group_by(task.c.project_id, task.c.status, task.c.urgency, task.c.assigned_to_id))
+    counts: Counter = Counter()
+    for project_id, status, urgency, assigned_to_id, count in op.get_bind().execute(grouped):
+        counts[(project_id, 'status', STATUS_VALUES[status])] += count
+        counts[(project_id, 'urgency', URGENCY_VALUES[urgency])] += count
+        counts[(project_id, 'assignee', str(assigned_to_id) if assigned_to_id else '')] += count
+    if counts:
+        op.bulk_insert(stats, [
+            {'project_id': project_id, 'dimension': dimension, 'value': value, 'count': count}
+            for (project_id, dimension, value), count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('projecttaskstat')
@@ -0,0 +1,46 @@
+"""add user sessions
+
+Revision ID: 8c4f2e1b7a93
+Revises: 5d2c8a7e4f10
+Create Date: 2026-10-18 16:21:07.553420
+
+"""
+from typing import Sequence, Union
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2e1b7a93'
+down_revision: Union[str, Sequence[str], None] = '5d2c8a7e4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('usersession',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_usersession_user_id'), 'usersession', ['user_id'], unique=False)
+    op.create_index(op.f('ix_usersession_expires_at'), 'usersession', ['expires_at'], unique=False)
+    # Os refresh tokens antigos (sem jti) deixam de valer: os usuários fazem login de novo
+    with op.batch_alter_table('privatedata') as batch_op:
+        batch_op.drop_column('refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('privatedata') as batch_op:
+        batch_op.add_column(sa.Column('refresh_token', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.drop_index(op.f('ix_usersession_expires_at'), table_name='usersession')
+    op.drop_index(op.f('ix_usersession_user_id'), table_name='usersession')
+    op.drop_table('usersession')
@@ -0,0 +1,37 @@
+"""add version counters
+
+Revision ID: a7d3e5c1f284
+Revises: 8c4f2e1b7a93
+Create Date: 2026-10-18 18:02:41.318205
+
+"""
+from typing import Sequence, Union
+
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5c1f284'
+down_revision: Union[str, Sequence[str], None] = '8c4f2e1b7a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('project') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('tasks_version', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('project') as batch_op:
+        batch_op.drop_column('tasks_version')
+        batch_op.drop_column('version')
@@ -0,0 +1,66 @@
+"""add search indexes
+
+Revision ID: b2e9d4a61f35
+Revises: a7d3e5c1f284
+Create Date: 2026-10-18 21:14:07.512830
+
+"""
+from typing import Sequence, Union
+
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e9d4a61f35'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e5c1f284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Cópia do que db/search_index.py define (a migration não depende do código da aplicação).
+# No sqlite, batch_alter_table em task/project recria a tabela e apaga os triggers abaixo:
+# uma migration futura que fizer isso precisa recriá-los.
+TABLES = ('task', 'project')
+
+
+def fts_create_statements(table: str) -> list:
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(title, description, content='{table}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF title, description ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        f"INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        # Indexa as linhas que já existem
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        if dialect == 'postgresql':
+            op.execute(sa.text(
+                f"CREATE INDEX ix_{table}_search ON {table} USING gin "
+                f"(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))"
+            ))
+        elif dialect == 'sqlite':
+            for statement in fts_create_statements(table):
+                op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        if dialect == 'postgresql':
+            op.execute(sa.text(f"DROP INDEX IF EXISTS ix_{table}_search"))
+        elif dialect == 'sqlite':
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}"))
+            op.execute(sa.text(f"DROP TABLE IF EXISTS {table}_fts"))
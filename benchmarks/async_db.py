@@ -0,0 +1,135 @@
+"""
+Throughput concorrente por worker: Session síncrona (antes) vs AsyncSession (depois).
+
+Cada requisição executa uma consulta com latência simulada (função SQL bench_sleep,
+que roda na thread do driver) e lista os projetos. Com a Session síncrona a latência
+bloqueia o event loop do worker; com a AsyncSession as requisições se sobrepõem.
+
+    python -m benchmarks.async_db --requests 200 --concurrency 1 8 32 --latency-ms 5
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from db.database import get_engine, dispose_engine
+from dependencies.dependencies import get_session
+from models.models import Project, User
+
+
+def register_bench_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+
+def seed(sync_engine, projects: int):
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        owner = User(name="bench", email="bench@localhost.com")
+        session.add(owner)
+        session.flush()
+        for i in range(projects):
+            session.add(Project(title=f"project {i}", description="bench", owner_id=owner.id))
+        session.commit()
+
+
+def build_sync_app(sync_engine, latency_ms: int) -> FastAPI:
+    # Mesmo padrão das rotas antes da migração: handler async usando Session síncrona
+    def get_sync_session():
+        with Session(sync_engine) as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/projects")
+    async def list_projects(session: Session = Depends(get_sync_session)):
+        session.exec(select(func.bench_sleep(latency_ms))).first()
+        return session.exec(select(Project).limit(20)).all()
+
+    return app
+
+
+def build_async_app(latency_ms: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/projects")
+    async def list_projects(session: AsyncSession = Depends(get_session)):
+        (await session.exec(select(func.bench_sleep(latency_ms)))).first()
+        return (await session.exec(select(Project).limit(20))).all()
+
+    return app
+
+
+async def run_load(app: FastAPI, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one_request():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/projects")
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await client.get("/projects")  # aquecimento do pool
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def main(args):
+    # NullPool: com o pool padrão o handler bloqueia o event loop esperando uma conexão
+    # que só é devolvida no teardown da dependência, travando o worker sob concorrência alta
+    sync_engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    event.listen(sync_engine, "connect", register_bench_sleep)
+    event.listen(get_engine().sync_engine, "connect", register_bench_sleep)
+    seed(sync_engine, args.projects)
+
+    apps = {
+        "sync (antes)": build_sync_app(sync_engine, args.latency_ms),
+        "async (depois)": build_async_app(args.latency_ms),
+    }
+
+    print(f"{'modo':<16}{'concorrência':>14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for concurrency in args.concurrency:
+        for name, app in apps.items():
+            result = await run_load(app, args.requests, concurrency)
+            print(f"{name:<16}{concurrency:>14}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency-ms", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
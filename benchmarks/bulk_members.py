@@ -0,0 +1,98 @@
+"""
+Entrada e saída de uma equipe num projeto: uma requisição por usuário
+(POST /projects/{id}/add_user, PATCH /projects/{id}/remove_user), que carrega a
+lista de participantes a cada chamada, vs endpoints em lote
+(POST /projects/{id}/add_users, PATCH /projects/{id}/remove_users).
+
+    python -m benchmarks.bulk_members --users 200 800
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.config import settings
+from core.security import pwd_context
+from db.database import dispose_engine
+from main import app
+from models.models import PrivateData, Role, User
+
+ADMIN_EMAIL = "bench-admin@localhost.com"
+ADMIN_PASSWORD = "benchmark"
+
+
+def seed(sync_engine, users: int) -> list:
+    SQLModel.metadata.drop_all(sync_engine)
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        admin = User(name="admin", email=ADMIN_EMAIL, role=Role.ADMIN)
+        session.add(admin)
+        session.add(PrivateData(user_id=admin.id, hashed_password=pwd_context.hash(ADMIN_PASSWORD)))
+        session.commit()
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    with sync_engine.begin() as conn:
+        conn.execute(insert(User.__table__), [  # type: ignore
+            {"id": user_id, "name": f"user {i}", "email": f"user{i}@bench.com", "role": Role.USER.name}
+            for i, user_id in enumerate(user_ids)
+        ])
+    return [str(user_id) for user_id in user_ids]
+
+
+async def measure(users: int) -> dict:
+    sync_engine = create_engine(settings.DATABASE_URL)
+    user_ids = seed(sync_engine, users)
+    await dispose_engine()
+
+    timings = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        single = (await client.post("/projects/", json={"title": "single"}, headers=headers)).json()["id"]
+        bulk = (await client.post("/projects/", json={"title": "bulk"}, headers=headers)).json()["id"]
+
+        start = time.perf_counter()
+        for user_id in user_ids:
+            (await client.post(f"/projects/{single}/add_user", json={"user_id": user_id}, headers=headers)).raise_for_status()
+        timings["adicionar por requisição"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for user_id in user_ids:
+            (await client.patch(f"/projects/{single}/remove_user", json={"user_id": user_id}, headers=headers)).raise_for_status()
+        timings["remover por requisição"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        (await client.post(f"/projects/{bulk}/add_users", json=[{"user_id": user_id, "project_role": "editor"} for user_id in user_ids],
+                           headers=headers)).raise_for_status()
+        timings["adicionar em lote"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        (await client.patch(f"/projects/{bulk}/remove_users", json=user_ids, headers=headers)).raise_for_status()
+        timings["remover em lote"] = time.perf_counter() - start
+
+    await dispose_engine()
+    sync_engine.dispose()
+    return timings
+
+
+async def main(args):
+    print(f"{'usuários':<10}{'operação':<26}{'tempo (s)':>10}{'usuários/s':>12}")
+    for users in args.users:
+        timings = await measure(users)
+        for name, seconds in timings.items():
+            print(f"{users:<10}{name:<26}{seconds:>10.2f}{users / seconds:>12.0f}")
+        for operation in ("adicionar", "remover"):
+            gain = timings[f"{operation} por requisição"] / timings[f"{operation} em lote"]
+            print(f"{users:<10}{operation + ': ganho do lote':<26}{gain:>9.0f}x")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[200, 800])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Throughput de criação e atualização de tasks: uma requisição por task
+(POST/PATCH /projects/{id}/task...) vs endpoints em lote (/projects/{id}/tasks/bulk).
+
+    python -m benchmarks.bulk_tasks --tasks 5000
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.config import settings
+from core.security import pwd_context
+from db.database import dispose_engine
+from main import app
+from models.models import PrivateData, Role, User
+
+ADMIN_EMAIL = "bench-admin@localhost.com"
+ADMIN_PASSWORD = "benchmark"
+
+
+def seed(sync_engine):
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        admin = User(name="admin", email=ADMIN_EMAIL, role=Role.ADMIN)
+        session.add(admin)
+        session.add(PrivateData(user_id=admin.id, hashed_password=pwd_context.hash(ADMIN_PASSWORD)))
+        session.commit()
+
+
+async def main(args):
+    sync_engine = create_engine(settings.DATABASE_URL)
+    seed(sync_engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        admin_id = (await client.get("/me", headers=headers)).json()["id"]
+        project_id = (await client.post("/projects/", json={"title": "bench"}, headers=headers)).json()["id"]
+
+        payload = [{"title": f"task {i}", "description": "bench", "assigned_to_id": admin_id} for i in range(args.tasks)]
+
+        start = time.perf_counter()
+        single_ids = []
+        for task in payload:
+            response = await client.post(f"/projects/{project_id}/tasks", json=task, headers=headers)
+            single_ids.append(response.json()["id"])
+        single_create = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for task_id in single_ids:
+            await client.patch(f"/projects/{project_id}/task/{task_id}", json={"status": "done"}, headers=headers)
+        single_update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post(f"/projects/{project_id}/tasks/bulk", json=payload, headers=headers)
+        bulk_create = time.perf_counter() - start
+        bulk_ids = [result["id"] for result in response.json()]
+
+        start = time.perf_counter()
+        await client.patch(f"/projects/{project_id}/tasks/bulk", json=[{"id": task_id, "status": "done"} for task_id in bulk_ids], headers=headers)
+        bulk_update = time.perf_counter() - start
+
+    print(f"{'operação':<12}{'por requisição (tasks/s)':>26}{'em lote (tasks/s)':>20}{'ganho':>8}")
+    for name, single, bulk in (("criar", single_create, bulk_create), ("atualizar", single_update, bulk_update)):
+        print(f"{name:<12}{args.tasks / single:>26.0f}{args.tasks / bulk:>20.0f}{single / bulk:>7.0f}x")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
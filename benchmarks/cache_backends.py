@@ -0,0 +1,206 @@
+"""
+Backends do cache compartilhado (core.cache.Cache): memory, shm e redis (contra o
+servidor RESP de benchmarks.resp_server, numa thread própria).
+
+Primeiro confere a semântica com dois "workers" (duas instâncias de Cache com
+backends separados apontando para o mesmo armazenamento): leitura compartilhada,
+invalidação por chave, por grupo e do namespace, gravação atrasada depois de uma
+invalidação concorrente, single-flight, colisão na janela de sondagem do shm com
+slots expirados e backend fora do ar. Sai com código 1 se
+alguma verificação falhar. Depois mede a latência de acerto e de falha + gravação.
+
+    python -m benchmarks.cache_backends --iterations 5000
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from typing import Callable, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+from benchmarks.report import summarize
+from benchmarks.resp_server import RESPServer
+from core.cache import Cache
+from core.cache_backends import CacheBackend, MemoryBackend, RedisBackend, SharedMemoryBackend
+
+VALUE = {"id": "2f1a1c9e-5b53-4c6b-9d1e-8f7e6c5d4b3a", "name": "bench", "email": "bench@localhost.com", "role": "user"}
+
+
+def start_resp_server() -> int:
+    ready = threading.Event()
+    port: List[int] = []
+
+    def run():
+        async def serve():
+            server = await RESPServer().start()
+            port.append(server.sockets[0].getsockname()[1])
+            ready.set()
+            await server.serve_forever()
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+# Cada fábrica devolve um backend novo (um "worker") sobre o mesmo armazenamento
+def backend_factories(port: int) -> Dict[str, Callable[[], CacheBackend]]:
+    shm_path = os.path.join(env.BENCH_DIR, "cache.shm")
+    memory = MemoryBackend(10000)
+    return {
+        "memory": lambda: memory,
+        "shm": lambda: SharedMemoryBackend(shm_path, 4096, 1024),
+        "redis": lambda: RedisBackend(f"redis://127.0.0.1:{port}/0", 4, 0.5),
+    }
+
+
+class Loader:
+    def __init__(self, value, delay: float = 0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.value
+
+
+async def check_backend(name: str, factory: Callable[[], CacheBackend]) -> List[str]:
+    failures = []
+    worker_a = Cache(f"check-{name}", ttl=60, maxsize=1000, backend=factory())
+    worker_b = Cache(f"check-{name}", ttl=60, maxsize=1000, backend=factory())
+
+    def expect(condition: bool, message: str):
+        if not condition:
+            failures.append(f"[{name}] {message}")
+
+    first = Loader({"v": 1})
+    await worker_a.get_or_load("k", first)
+    await worker_a.get_or_load("k", first)
+    expect(first.calls == 1, "segunda leitura no mesmo worker não veio do cache")
+
+    second = Loader({"v": 2})
+    await worker_b.get_or_load("k", second)
+    expect(second.calls == 0, "outro worker não leu a entrada compartilhada")
+
+    await worker_a.invalidate("k")
+    value = await worker_b.get_or_load("k", second)
+    expect(second.calls == 1 and value == {"v": 2}, "invalidação por chave não chegou ao outro worker")
+
+    grouped = Loader([1])
+    await worker_b.get_or_load("7:a", grouped, group="7")
+    await worker_b.get_or_load("7:b", grouped, group="7")
+    await worker_a.invalidate_group("7")
+    await worker_b.get_or_load("7:a", grouped, group="7")
+    await worker_b.get_or_load("7:b", grouped, group="7")
+    expect(grouped.calls == 4, "invalidação do grupo não descartou as entradas")
+
+    await worker_b.get_or_load("k", second)
+    await worker_a.clear()
+    await worker_b.get_or_load("k", second)
+    expect(second.calls == 2, "invalidação do namespace não descartou a entrada")
+
+    # Leitura do banco antes da invalidação e gravação depois: a entrada fica com a versão antiga
+    stale = Loader({"v": "antigo"}, delay=0.05)
+    pending = asyncio.create_task(worker_b.get_or_load("race", stale))
+    await asyncio.sleep(0.01)
+    await worker_a.invalidate("race")
+    await pending
+    fresh = Loader({"v": "novo"})
+    value = await worker_b.get_or_load("race", fresh)
+    expect(fresh.calls == 1 and value == {"v": "novo"}, "gravação atrasada sobreviveu à invalidação")
+
+    slow = Loader({"v": "sf"}, delay=0.05)
+    results = await asyncio.gather(*[worker_a.get_or_load("flight", slow) for _ in range(50)])
+    expect(slow.calls == 1 and all(result == {"v": "sf"} for result in results), f"single-flight carregou {slow.calls} vezes")
+    return failures
+
+
+# Tabela com PROBE slots (a janela de toda chave cobre a tabela): a chave vai para o último slot
+# livre, os anteriores expiram e a chave é regravada. Ela precisa continuar num único slot, senão
+# o delete apaga só a primeira cópia e o valor antigo volta
+async def check_shm_probe_collision() -> List[str]:
+    path = os.path.join(env.BENCH_DIR, "collision.shm")
+    backend = SharedMemoryBackend(path, SharedMemoryBackend.PROBE, 256)
+    for i in range(SharedMemoryBackend.PROBE - 1):
+        await backend.set(f"filler-{i}", b"x", 0.05)
+    key = "chave"
+    await backend.set(key, b"old", 60)
+    backend._lock(exclusive=False)
+    try:
+        digest = backend._digest(key)
+        moved = backend._find(digest, time.time()) != backend._slots_for(digest)[0]
+    finally:
+        backend._unlock()
+    await asyncio.sleep(0.1)
+    await backend.set(key, b"new", 60)
+    failures = []
+    if not moved:
+        failures.append("[shm] cenário inválido: a chave ficou no primeiro slot da janela")
+    if await backend.get_many([key]) != [b"new"]:
+        failures.append("[shm] regravação depois da expiração dos slots anteriores não leu o valor novo")
+    await backend.delete(key)
+    if await backend.get_many([key]) != [None]:
+        failures.append("[shm] valor antigo voltou depois do delete (cópia duplicada na janela)")
+    await backend.close()
+    return failures
+
+
+async def check_backend_down() -> List[str]:
+    cache = Cache("check-down", ttl=60, maxsize=1000, backend=RedisBackend("redis://127.0.0.1:1/0", 2, 0.2))
+    loader = Loader({"v": 1})
+    value = await cache.get_or_load("k", loader)
+    await cache.invalidate("k")
+    if value != {"v": 1} or cache.errors < 2:
+        return ["[redis] backend fora do ar deveria virar falha de cache"]
+    return []
+
+
+async def measure(coroutine: Callable, iterations: int) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        call_start = time.perf_counter()
+        await coroutine(i)
+        samples.append(time.perf_counter() - call_start)
+    return summarize(samples, time.perf_counter() - start, scale=1e6)
+
+
+async def run(args: argparse.Namespace) -> Tuple[List[str], dict]:
+    factories = backend_factories(start_resp_server())
+    failures = []
+    for name, factory in factories.items():
+        failures += await check_backend(name, factory)
+    failures += await check_shm_probe_collision()
+    failures += await check_backend_down()
+
+    results = {}
+    for name, factory in factories.items():
+        cache = Cache(f"bench-{name}", ttl=60, maxsize=args.iterations * 2, backend=factory())
+        loader = Loader(VALUE)
+
+        async def hit(i: int):
+            await cache.get_or_load("user", loader)
+
+        async def miss(i: int):
+            await cache.get_or_load(f"user-{i}", loader)
+
+        results[f"{name}_hit"] = await measure(hit, args.iterations)
+        results[f"{name}_miss_and_set"] = await measure(miss, args.iterations)
+        await cache.backend.close()
+    return failures, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    failures, results = asyncio.run(run(parser.parse_args()))
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    print(json.dumps({"latency_us": results}, indent=2))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,112 @@
+"""
+Gerador de dados para benchmarks, no padrão do scripts/seed_admin.py: cria N
+usuários (todos com a mesma senha, o hash é calculado uma vez), projetos com
+dono e participantes e tasks distribuídas entre os projetos. Determinístico
+para uma mesma seed.
+
+    python -m benchmarks.datagen --users 1000 --projects 100 --members 10 --tasks 100000
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from core.security import get_password_hash
+from db.database import async_session, create_db_and_tables, dispose_engine
+from dependencies.task_stats import count_task
+from models.models import PrivateData, Project, ProjectRole, ProjectTaskStat, ProjectUserLink, Role, StatusTask, Task, UrgencyTask, User
+
+PASSWORD = "benchmark"
+BATCH_SIZE = 5000
+
+
+@dataclass
+class Dataset:
+    user_ids: List[uuid.UUID]
+    emails: List[str]
+    project_owners: Dict[int, uuid.UUID]
+    project_members: Dict[int, List[uuid.UUID]]
+    task_ids: Dict[int, List[int]] = field(default_factory=dict)
+    admin_email: str = "bench-admin@localhost.com"
+    password: str = PASSWORD
+
+
+async def insert_batches(session, table, rows: List[dict]):
+    for start in range(0, len(rows), BATCH_SIZE):
+        await session.exec(insert(table), params=rows[start:start + BATCH_SIZE])  # type: ignore
+
+
+async def generate(users: int, projects: int, members: int, tasks: int, seed: int = 42) -> Dataset:
+    rng = random.Random(seed)
+    await create_db_and_tables()
+    hashed_password = get_password_hash(PASSWORD)
+
+    dataset = Dataset(user_ids=[], emails=[], project_owners={}, project_members={})
+    user_rows, private_rows = [], []
+    for i in range(users + 1):
+        user_id = uuid.UUID(int=rng.getrandbits(128))
+        email = dataset.admin_email if i == 0 else f"user{i}@localhost.com"
+        user_rows.append({"id": user_id, "name": f"user {i}", "email": email, "role": (Role.ADMIN if i == 0 else Role.USER).name})
+        private_rows.append({"user_id": user_id, "hashed_password": hashed_password})
+        if i:
+            dataset.user_ids.append(user_id)
+            dataset.emails.append(email)
+
+    project_rows, link_rows = [], []
+    for project_id in range(1, projects + 1):
+        owner_id = rng.choice(dataset.user_ids)
+        others = rng.sample([user_id for user_id in dataset.user_ids if user_id != owner_id], min(members, users - 1))
+        dataset.project_owners[project_id] = owner_id
+        dataset.project_members[project_id] = [owner_id, *others]
+        project_rows.append({"id": project_id, "title": f"project {project_id}", "description": "bench", "owner_id": owner_id})
+        link_rows.append({"project_id": project_id, "user_id": owner_id, "project_role": ProjectRole.MANAGER.name})
+        link_rows += [{"project_id": project_id, "user_id": user_id, "project_role": rng.choice(list(ProjectRole)).name} for user_id in others]
+
+    task_rows, stats = [], {}
+    statuses, urgencies = list(StatusTask), list(UrgencyTask)
+    for i in range(tasks):
+        project_id = rng.randint(1, projects)
+        status_task, urgency = rng.choice(statuses), rng.choice(urgencies)
+        assigned_to_id = rng.choice(dataset.project_members[project_id])
+        task_rows.append({"title": f"task {i}", "description": "bench", "status": status_task.name, "urgency": urgency.name,
+                          "project_id": project_id, "assigned_to_id": assigned_to_id})
+        count_task(stats.setdefault(project_id, Counter()), status_task, urgency, assigned_to_id)
+    stat_rows = [{"project_id": project_id, "dimension": dimension, "value": value, "count": count}
+                 for project_id, counts in stats.items() for (dimension, value), count in counts.items()]
+
+    async with async_session() as session:
+        await insert_batches(session, User.__table__, user_rows)
+        await insert_batches(session, PrivateData.__table__, private_rows)
+        await insert_batches(session, Project.__table__, project_rows)
+        await insert_batches(session, ProjectUserLink.__table__, link_rows)
+        await insert_batches(session, Task.__table__, task_rows)
+        await insert_batches(session, ProjectTaskStat.__table__, stat_rows)
+        await session.commit()
+        for task_id, project_id in (await session.exec(select(Task.id, Task.project_id))).all():
+            dataset.task_ids.setdefault(project_id, []).append(task_id)  # type: ignore
+    return dataset
+
+
+async def main(args):
+    start = time.perf_counter()
+    await generate(args.users, args.projects, args.members, args.tasks, args.seed)
+    print(f"{args.users} usuários, {args.projects} projetos, {args.tasks} tasks em {time.perf_counter() - start:.1f}s ({env.BENCH_DIR})")
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,15 @@
+"""
+Ambiente isolado para a suíte de benchmarks: importado antes de qualquer módulo
+da aplicação, aponta o DATABASE_URL para um SQLite temporário (nunca para o banco
+do .env) e define um SECRET_KEY.
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
@@ -0,0 +1,95 @@
+"""
+Pico de memória ao ler todas as tasks de um projeto: objetos ORM com os
+relacionamentos do TaskRead (como GET /projects/{id}/tasks montava a lista)
+vs o gerador de GET /projects/{id}/tasks/export (tuplas cruas com yield_per).
+
+    python -m benchmarks.export --tasks 10000 100000
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import delete, insert
+from sqlmodel import SQLModel, create_engine, select
+
+from core.config import settings
+from db.database import async_session, dispose_engine
+from dependencies.export import ExportFormat, stream_rows
+from models.models import Project, Task, User
+from routes.project_routes import task_export_columns, task_read_options
+
+PROJECT_ID = 1
+USER_ID = uuid.uuid4()
+
+
+def seed(sync_engine, tasks: int, batch: int = 20000):
+    with sync_engine.begin() as conn:
+        conn.execute(delete(Task.__table__))  # type: ignore
+        for start in range(0, tasks, batch):
+            conn.execute(insert(Task.__table__), [  # type: ignore
+                {"title": f"task {i}", "description": "bench " * 10, "status": "TODO", "urgency": "LOW",
+                 "project_id": PROJECT_ID, "assigned_to_id": USER_ID}
+                for i in range(start, min(start + batch, tasks))
+            ])
+
+
+async def load_orm():
+    statement = select(Task).where(Task.project_id == PROJECT_ID).options(*task_read_options).order_by(Task.id)
+    async with async_session() as session:
+        return len((await session.exec(statement)).all())
+
+
+async def load_stream():
+    statement = (select(*task_export_columns.values()).select_from(Task)  # type: ignore
+                 .outerjoin(User, Task.assigned_to_id == User.id)
+                 .where(Task.project_id == PROJECT_ID).order_by(Task.id))
+    size = 0
+    async for chunk in stream_rows(statement, list(task_export_columns), ExportFormat.NDJSON):
+        size += len(chunk)
+    return size
+
+
+async def measure(load) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    await load()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed
+
+
+async def main(args):
+    sync_engine = create_engine(settings.DATABASE_URL)
+    SQLModel.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"id": USER_ID, "name": "bench", "email": "bench@bench.local", "role": "USER"}])  # type: ignore
+        conn.execute(insert(Project.__table__), [{"id": PROJECT_ID, "title": "bench", "owner_id": USER_ID}])  # type: ignore
+
+    print(f"{'tasks':>10}{'ORM (MiB)':>12}{'ORM (s)':>10}{'export (MiB)':>15}{'export (s)':>12}")
+    for tasks in args.tasks:
+        seed(sync_engine, tasks)
+        orm_peak, orm_time = await measure(load_orm)
+        stream_peak, stream_time = await measure(load_stream)
+        print(f"{tasks:>10}{orm_peak:>12.1f}{orm_time:>10.2f}{stream_peak:>15.1f}{stream_time:>12.2f}")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10000, 100000])
+    asyncio.run(main(parser.parse_args()))
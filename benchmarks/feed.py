@@ -0,0 +1,229 @@
+"""
+Feed de alterações (core.feed + dependencies.events): custo de manter muitas conexões
+SSE abertas e de distribuir um evento para todas.
+
+Primeiro confere a semântica sobre os geradores do stream, sem HTTP: retomada pelo
+Last-Event-ID, "reset" quando o histórico não cobre o ponto pedido, quando falta um
+evento na sequência e quando a fila de uma conexão lenta enche, e entrega entre dois
+workers pelo broker redis (contra o servidor RESP de benchmarks.resp_server), com
+"reset" depois que o servidor cai e volta. Sai com código 1 se algo falhar.
+
+Depois abre N conexões (geradores de stream_events esperando eventos), mede a memória
+por conexão e o tempo para um evento chegar a todas.
+
+    python -m benchmarks.feed --connections 1000 10000 --events 50
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.report import summarize
+from benchmarks.resp_server import RESPServer
+from core.feed import FeedEvent, FeedHub, RedisBroker
+from dependencies.events import stream_events
+
+PROJECT = 1
+
+
+def event(seq: int, prev: int = -1) -> FeedEvent:
+    return FeedEvent(PROJECT, seq, seq - 1 if prev == -1 else prev, "task.updated", {"task_id": seq})
+
+
+def parse(chunk: bytes) -> List[dict]:
+    parsed = []
+    for block in chunk.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            parsed.append(fields)
+    return parsed
+
+
+async def next_events(stream: AsyncIterator[bytes]) -> List[dict]:
+    return parse(await asyncio.wait_for(stream.__anext__(), 1))
+
+
+# Leitura da sequência atual do projeto, como a rota faz no banco
+def sequence(seq: Optional[int]) -> Callable[[], Awaitable[Optional[int]]]:
+    async def load_seq() -> Optional[int]:
+        return seq
+    return load_seq
+
+
+async def check_stream() -> List[str]:
+    failures = []
+
+    def expect(condition: bool, message: str):
+        if not condition:
+            failures.append(message)
+
+    hub = FeedHub(queue_size=4, history_size=8, history_projects=10)
+    for seq in range(1, 11):
+        hub.dispatch(event(seq))
+
+    # Retomada coberta pelo histórico (eventos 3..10 guardados)
+    stream = stream_events(hub, PROJECT, sequence(10), 4, None)
+    received = await next_events(stream)
+    expect([item["id"] for item in received] == ["5", "6", "7", "8", "9", "10"], f"retomada devolveu {received}")
+    await stream.aclose()
+
+    # Ponto anterior ao histórico: reset com o id atual
+    stream = stream_events(hub, PROJECT, sequence(10), 1, None)
+    received = await next_events(stream)
+    expect(len(received) == 1 and received[0]["event"] == "reset" and received[0]["id"] == "10", f"histórico insuficiente devolveu {received}")
+    await stream.aclose()
+
+    # Stream que nunca começou (cliente saiu antes do primeiro byte) não deixa assinatura
+    await stream_events(hub, PROJECT, sequence(10), None, None).aclose()
+    expect(hub.stats()["connections"] == 0, "stream não iniciado deixou assinatura")
+
+    # Projeto excluído antes da leitura da sequência: o stream termina sem eventos
+    received = [chunk async for chunk in stream_events(hub, PROJECT, sequence(None), None, None)]
+    expect(received == [] and hub.stats()["connections"] == 0, f"projeto excluído devolveu {received}")
+
+    # Evento publicado entre a assinatura e a leitura da sequência não sai duplicado
+    async def publish_while_reading() -> int:
+        hub.dispatch(event(11))
+        return 11
+
+    stream = stream_events(hub, PROJECT, publish_while_reading, None, None)
+    received = await next_events(stream)
+    expect([item["event"] for item in received] == ["ready"], f"início devolveu {received}")
+    hub.dispatch(event(12))
+    received = await next_events(stream)
+    expect([item["id"] for item in received] == ["12"], f"evento repetido ou perdido: {received}")
+
+    # Heartbeat: um timer do worker acorda as conexões paradas com um comentário SSE
+    hub.ping_all()
+    ping = await asyncio.wait_for(stream.__anext__(), 1)
+    expect(ping == b": ping\n\n", f"heartbeat devolveu {ping!r}")
+
+    # Lacuna na sequência (evento de outro worker perdido): reset antes do evento seguinte
+    hub.dispatch(event(15, prev=14))
+    received = await next_events(stream)
+    expect([item["event"] for item in received] == ["reset", "task.updated"], f"lacuna devolveu {received}")
+
+    # Conexão lenta: a fila enche, o publicador não espera e a conexão recebe reset
+    for seq in range(16, 16 + hub.queue_size + 2):
+        hub.dispatch(event(seq))
+    received = await next_events(stream)
+    expect(received[0]["event"] == "reset" and hub.overflows == 1, f"fila cheia devolveu {received[:2]}")
+    await stream.aclose()
+    expect(hub.stats()["connections"] == 0, "conexões encerradas continuaram assinadas")
+    return failures
+
+
+async def check_redis_broker() -> List[str]:
+    failures = []
+    resp = RESPServer()
+    server = await resp.start()
+    port = server.sockets[0].getsockname()[1]
+    url = f"redis://127.0.0.1:{port}/0"
+    hubs = [FeedHub(16, 16, 10), FeedHub(16, 16, 10)]
+    brokers = [RedisBroker(hub, url, "bench:feed", 2, 0.5) for hub in hubs]
+    for broker in brokers:
+        await broker.start()
+
+    subscription = hubs[1].subscribe(PROJECT)
+    await brokers[0].publish(event(1))
+    await asyncio.wait_for(subscription.wait(), 1)
+    if [item.seq for item in subscription.drain()] != [1]:
+        failures.append("[redis] evento publicado num worker não chegou ao outro")
+
+    # Servidor cai e volta na mesma porta: quem estava conectado recebe reset
+    server.close()
+    for writers in resp.channels.values():
+        for writer in list(writers):
+            writer.close()
+    await asyncio.sleep(0.2)
+    server = await RESPServer().start(port=port)
+    try:
+        await asyncio.wait_for(subscription.wait(), 10)
+    except asyncio.TimeoutError:
+        pass
+    if not subscription.overflowed or brokers[1].reconnects < 1:
+        failures.append("[redis] reconexão do broker não gerou reset")
+    for broker in brokers:
+        await broker.close()
+    server.close()
+    return failures
+
+
+class Delivery:
+    def __init__(self, connections: int):
+        self.connections = connections
+        self.count = 0
+        self.done = asyncio.Event()
+
+    def next_event(self):
+        self.count = 0
+        self.done = asyncio.Event()
+
+    def received(self):
+        self.count += 1
+        if self.count == self.connections:
+            self.done.set()
+
+
+async def idle_stream(stream: AsyncIterator[bytes], delivery: Delivery):
+    async for _ in stream:
+        delivery.received()
+
+
+async def measure_fanout(connections: int, events: int) -> dict:
+    hub = FeedHub(queue_size=256, history_size=256, history_projects=10)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    streams = [stream_events(hub, PROJECT, sequence(0), None, None) for _ in range(connections)]
+    for stream in streams:
+        await stream.__anext__()  # retry + ready
+    delivery = Delivery(connections)
+    tasks = [asyncio.create_task(idle_stream(stream, delivery)) for stream in streams]
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_connection = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / connections
+
+    samples, dispatch = [], []
+    start = time.perf_counter()
+    for seq in range(1, events + 1):
+        delivery.next_event()
+        call_start = time.perf_counter()
+        hub.dispatch(event(seq))
+        dispatch.append(time.perf_counter() - call_start)
+        await delivery.done.wait()
+        samples.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        "bytes_per_connection": round(per_connection),
+        "dispatch_ms": summarize(dispatch, elapsed, scale=1e3),
+        "delivered_to_all_ms": summarize(samples, elapsed, scale=1e3),
+    }
+
+
+async def run(args: argparse.Namespace):
+    failures = await check_stream()
+    failures += await check_redis_broker()
+    results = {}
+    for connections in args.connections:
+        results[str(connections)] = await measure_fanout(connections, args.events)
+    return failures, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--events", type=int, default=50)
+    failures, results = asyncio.run(run(parser.parse_args()))
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    print(json.dumps({"connections": results}, indent=2))
+    sys.exit(1 if failures else 0)
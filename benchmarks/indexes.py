@@ -0,0 +1,171 @@
+"""
+Planos de execução e latência das consultas mais quentes, sem e com os índices
+da migration 3b1e6f0a9c47 (task.project_id/status, task.project_id/assigned_to_id,
+task.assigned_to_id, project.owner_id, projectuserlink.user_id/project_role).
+
+Usa um SQLite temporário por padrão; --database-url aceita um PostgreSQL vazio
+(as tabelas são recriadas).
+
+    python -m benchmarks.indexes --tasks 1000000 --runs 200
+"""
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import Uuid, bindparam, create_engine, insert, text
+
+from models.models import Project, ProjectRole, ProjectUserLink, StatusTask, Task, UrgencyTask, User
+from sqlmodel import SQLModel
+
+INDEXED_TABLES = (Task.__table__, Project.__table__, ProjectUserLink.__table__)  # type: ignore
+
+# Consultas equivalentes às geradas por get_tasks, get_all_projects e o cascade do delete_project
+QUERIES = {
+    "get_tasks (project_id, assigned_to_id)":
+        "SELECT id FROM task WHERE project_id = :project_id AND assigned_to_id = :user_id ORDER BY id LIMIT 100",
+    "tasks por status (project_id, status)":
+        "SELECT id FROM task WHERE project_id = :project_id AND status = :status ORDER BY id LIMIT 100",
+    "cascade delete (project_id)":
+        "SELECT id FROM task WHERE project_id = :project_id",
+    "minhas tasks (assigned_to_id)":
+        "SELECT id FROM task WHERE assigned_to_id = :user_id ORDER BY id LIMIT 100",
+    "get_all_projects (owner_id, user_id + project_role)":
+        "SELECT id FROM project WHERE owner_id = :user_id OR id IN "
+        "(SELECT project_id FROM projectuserlink WHERE user_id = :user_id AND project_role = :role)",
+}
+
+
+def seed(engine, users: int, projects: int, members: int, tasks: int, batch: int = 20000) -> dict:
+    rng = random.Random(42)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(users)]
+    project_members = {}
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [  # type: ignore
+            {"id": user_id, "name": f"user {i}", "email": f"user{i}@bench.local", "role": "USER"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(insert(Project.__table__), [  # type: ignore
+            {"id": project_id, "title": f"project {project_id}", "description": "bench", "owner_id": rng.choice(user_ids)}
+            for project_id in range(1, projects + 1)
+        ])
+        links = []
+        for project_id in range(1, projects + 1):
+            project_members[project_id] = rng.sample(user_ids, members)
+            links += [
+                {"project_id": project_id, "user_id": user_id, "project_role": rng.choice(list(ProjectRole)).name}
+                for user_id in project_members[project_id]
+            ]
+        conn.execute(insert(ProjectUserLink.__table__), links)  # type: ignore
+
+    statuses = [status.name for status in StatusTask]
+    urgencies = [urgency.name for urgency in UrgencyTask]
+    for start in range(0, tasks, batch):
+        rows = []
+        for i in range(start, min(start + batch, tasks)):
+            project_id = rng.randint(1, projects)
+            rows.append({
+                "title": f"task {i}", "description": "bench",
+                "status": rng.choice(statuses), "urgency": rng.choice(urgencies),
+                "project_id": project_id, "assigned_to_id": rng.choice(project_members[project_id]),
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Task.__table__), rows)  # type: ignore
+    return project_members
+
+
+def set_indexes(engine, enabled: bool):
+    with engine.begin() as conn:
+        for table in INDEXED_TABLES:
+            for index in table.indexes:
+                if enabled:
+                    index.create(conn, checkfirst=True)
+                else:
+                    index.drop(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+
+def statement(sql: str):
+    # user_id precisa do tipo Uuid para ser convertido igual à coluna (CHAR(32) no SQLite)
+    if ":user_id" in sql:
+        return text(sql).bindparams(bindparam("user_id", type_=Uuid()))
+    return text(sql)
+
+
+def explain(conn, sql: str, params: dict) -> list:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    rows = conn.execute(statement(prefix + sql), params).all()
+    return [row[-1] for row in rows]
+
+
+def measure(engine, project_members: dict, runs: int) -> dict:
+    rng = random.Random(7)
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            samples = []
+            plan = None
+            for _ in range(runs):
+                project_id = rng.choice(list(project_members))
+                params = {
+                    "project_id": project_id,
+                    "user_id": rng.choice(project_members[project_id]),
+                    "status": rng.choice(list(StatusTask)).name,
+                    "role": ProjectRole.MANAGER.name,
+                }
+                if plan is None:
+                    plan = explain(conn, sql, params)
+                start = time.perf_counter()
+                conn.execute(statement(sql), params).all()
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            results[name] = {
+                "plan": plan,
+                "p50_ms": statistics.median(samples) * 1000,
+                "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            }
+    return results
+
+
+def main(args):
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='taskmanager-bench-')}/bench.db"
+    engine = create_engine(database_url)
+
+    start = time.perf_counter()
+    project_members = seed(engine, args.users, args.projects, args.members, args.tasks)
+    print(f"seed: {args.tasks} tasks em {time.perf_counter() - start:.1f}s\n")
+
+    set_indexes(engine, enabled=False)
+    before = measure(engine, project_members, args.runs)
+    set_indexes(engine, enabled=True)
+    after = measure(engine, project_members, args.runs)
+
+    for name in QUERIES:
+        print(f"== {name}")
+        for label, result in (("sem índices", before[name]), ("com índices", after[name])):
+            print(f"  {label}: p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms")
+            for line in result["plan"]:
+                print(f"      {line}")
+        print()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=200)
+    main(parser.parse_args())
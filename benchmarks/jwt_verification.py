@@ -0,0 +1,147 @@
+"""
+Custo de autenticação por requisição: verificação do access token por backend
+(python-jose, hmac, PyJWT se instalado), com e sem o cache de tokens de core.tokens,
+e o get_current_user completo com o usuário já no cache.
+
+Antes de medir confere que tokens expirados nunca saem do cache (inclusive com a
+entrada ainda dentro do TTL) e que tokens adulterados são recusados; sai com código 1 se algo falhar.
+
+    python -m benchmarks.jwt_verification --iterations 20000
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from datetime import timedelta
+from typing import Callable, Dict
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+from fastapi import HTTPException
+from jose import JWTError
+
+from benchmarks.report import summarize
+from core.cache import TTLCache
+from core.config import settings
+from core.security import create_access_token
+from core.tokens import JWT_BACKENDS, TokenVerifier
+from dependencies.dependencies import get_current_user, user_cache
+from models.models import User
+
+
+def backends() -> Dict[str, Callable]:
+    found = {}
+    for name, factory in JWT_BACKENDS.items():
+        try:
+            found[name] = factory(settings.SECRET_KEY, settings.ALGORITHM)
+        except (RuntimeError, ValueError) as error:
+            print(f"backend {name} ignorado: {error}", file=sys.stderr)
+    return found
+
+
+def verifier(backend: Callable) -> TokenVerifier:
+    return TokenVerifier(backend, TTLCache(f"bench-tokens-{uuid.uuid4()}", maxsize=1000, ttl=3600))
+
+
+def rejects(verifier: TokenVerifier, token: str) -> bool:
+    try:
+        verifier.decode(token)
+    except JWTError:
+        return True
+    return False
+
+
+def check_expiration(name: str, backend: Callable) -> bool:
+    ok = True
+    token_verifier = verifier(backend)
+
+    token = create_access_token({"sub": str(uuid.uuid4())}, expires_delta=timedelta(seconds=1))
+    token_verifier.decode(token)
+    token_verifier.decode(token)
+    if token_verifier.cache.hits != 1:
+        print(f"[{name}] o token válido não foi servido pelo cache", file=sys.stderr)
+        ok = False
+    time.sleep(2.1)
+    if not rejects(token_verifier, token):
+        print(f"[{name}] token expirado aceito", file=sys.stderr)
+        ok = False
+
+    # Entrada com TTL maior que o exp (ex.: relógio ajustado): o exp é conferido de novo no acerto
+    token = create_access_token({"sub": str(uuid.uuid4())}, expires_delta=timedelta(seconds=1))
+    claims = token_verifier.decode(token)
+    token_verifier.cache.set(token.rpartition(".")[2], (token, claims), ttl=3600)
+    time.sleep(2.1)
+    if not rejects(token_verifier, token):
+        print(f"[{name}] token expirado servido pelo cache", file=sys.stderr)
+        ok = False
+
+    # Mesma assinatura com outro payload não aproveita a entrada do cache
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    token_verifier.decode(token)
+    header, payload, signature = token.split(".")
+    forged = ".".join([header, payload[:-2] + ("A" if payload[-2] != "A" else "B") + payload[-1], signature])
+    if not rejects(token_verifier, forged):
+        print(f"[{name}] token adulterado aceito", file=sys.stderr)
+        ok = False
+    return ok
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict:
+    for _ in range(10):
+        func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_start)
+    return summarize(samples, time.perf_counter() - start, scale=1e6)
+
+
+async def measure_async(func, iterations: int) -> dict:
+    for _ in range(10):
+        await func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - call_start)
+    return summarize(samples, time.perf_counter() - start, scale=1e6)
+
+
+def main(args: argparse.Namespace):
+    found = backends()
+    if not all([check_expiration(name, backend) for name, backend in found.items()]):
+        sys.exit(1)
+
+    user = User(id=uuid.uuid4(), name="bench", email="bench@localhost.com")
+    token = create_access_token({"sub": str(user.id)})
+    results = {}
+    for name, backend in found.items():
+        results[f"{name}_uncached"] = measure(lambda: backend(token), args.iterations)
+        cached = verifier(backend)
+        results[f"{name}_cached"] = measure(lambda: cached.decode(token), args.iterations)
+
+    # Dependência completa com o usuário em cache: não toca o banco, então a sessão não é usada
+    async def load_user():
+        return user.model_dump(mode="json")
+    asyncio.run(user_cache.get_or_load(str(user.id), load_user))
+    results["get_current_user"] = asyncio.run(measure_async(lambda: get_current_user(token, None), args.iterations))  # type: ignore
+
+    invalid = token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1]
+
+    async def rejected():
+        try:
+            await get_current_user(invalid, None)  # type: ignore
+        except HTTPException:
+            pass
+    results["get_current_user_invalid"] = asyncio.run(measure_async(rejected, args.iterations))
+    print(json.dumps({"backend": settings.JWT_BACKEND, "algorithm": settings.ALGORITHM, "latency_us": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
@@ -0,0 +1,138 @@
+"""
+Driver de carga em processo: as requisições passam pelo app ASGI completo
+(middlewares, dependências, banco SQLite) via httpx.ASGITransport, sem rede.
+
+Cenários: login, me, project_list, task_list, task_create, task_update. Cada
+cenário roda N requisições com C clientes concorrentes e reporta p50/p95/p99,
+throughput e o pico de memória alocada (tracemalloc, em uma passada separada).
+
+    python -m benchmarks.load --requests 500 --concurrency 8
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from typing import Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+
+import httpx
+
+from benchmarks.datagen import Dataset, generate
+from benchmarks.report import summarize
+from db.database import dispose_engine
+from main import app
+from models.models import StatusTask, UrgencyTask
+
+SCENARIOS = ("login", "me", "project_list", "task_list", "task_create", "task_update")
+
+
+class LoadDriver:
+    def __init__(self, client: httpx.AsyncClient, dataset: Dataset, seed: int = 7):
+        self.client = client
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        # Atua como dono do projeto 1: tem acesso total aos próprios projetos
+        self.user_id = dataset.project_owners[1]
+        self.email = dataset.emails[dataset.user_ids.index(self.user_id)]
+        self.projects = [project_id for project_id, owner_id in dataset.project_owners.items() if owner_id == self.user_id]
+        self.headers: Dict[str, str] = {}
+
+    async def setup(self):
+        response = await self.login()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def login(self) -> Awaitable[httpx.Response]:
+        return self.client.post("/auth/login", data={"username": self.email, "password": self.dataset.password})
+
+    def me(self) -> Awaitable[httpx.Response]:
+        return self.client.get("/me", headers=self.headers)
+
+    def project_list(self) -> Awaitable[httpx.Response]:
+        return self.client.get("/projects/", headers=self.headers)
+
+    def task_list(self) -> Awaitable[httpx.Response]:
+        return self.client.get(f"/projects/{self.rng.choice(self.projects)}/tasks", headers=self.headers)
+
+    def task_create(self) -> Awaitable[httpx.Response]:
+        project_id = self.rng.choice(self.projects)
+        task = {"title": "load test", "description": "bench", "urgency": self.rng.choice(list(UrgencyTask)).value, "assigned_to_id": str(self.user_id)}
+        return self.client.post(f"/projects/{project_id}/tasks", json=task, headers=self.headers)
+
+    def task_update(self) -> Awaitable[httpx.Response]:
+        project_id = self.rng.choice([project_id for project_id in self.projects if self.dataset.task_ids.get(project_id)])
+        task_id = self.rng.choice(self.dataset.task_ids[project_id])
+        return self.client.patch(f"/projects/{project_id}/task/{task_id}", json={"status": self.rng.choice(list(StatusTask)).value}, headers=self.headers)
+
+    async def run(self, scenario: str, requests: int, concurrency: int) -> dict:
+        request: Callable[[], Awaitable[httpx.Response]] = getattr(self, scenario)
+        samples: List[float] = []
+        errors = 0
+        remaining = iter(range(requests))
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await request()
+                samples.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        result = summarize(samples, time.perf_counter() - start)
+        result.update({"concurrency": concurrency, "errors": errors})
+        return result
+
+    # Pico de memória (KiB) acima do estado inicial durante requisições sequenciais
+    async def allocations(self, scenario: str, requests: int) -> float:
+        request: Callable[[], Awaitable[httpx.Response]] = getattr(self, scenario)
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(requests):
+            await request()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (peak - baseline) / 1024
+
+
+async def run_load(dataset: Dataset, requests: int, concurrency: int, login_requests: int, alloc_requests: int,
+                   scenarios=SCENARIOS) -> Dict[str, dict]:
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        driver = LoadDriver(client, dataset)
+        await driver.setup()
+        for scenario in scenarios:
+            count = login_requests if scenario == "login" else requests
+            await driver.run(scenario, max(1, count // 10), concurrency)  # aquecimento
+            results[scenario] = await driver.run(scenario, count, concurrency)
+            results[scenario]["alloc_peak_kib"] = await driver.allocations(scenario, min(alloc_requests, count))
+    return results
+
+
+async def main(args):
+    dataset = await generate(args.users, args.projects, args.members, args.tasks)
+    results = await run_load(dataset, args.requests, args.concurrency, args.login_requests, args.alloc_requests, args.scenarios)
+    print(json.dumps(results, indent=2))
+    await dispose_engine()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--alloc-requests", type=int, default=50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Custo da instrumentação por requisição (MetricsMiddleware + eventos SQL):
+throughput de GET /projects/{id}/tasks e GET /me sem o middleware e com
+METRICS_SAMPLE_RATE em 0, 0.1 e 1. As rodadas são intercaladas para diluir ruído.
+
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 5
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.security import pwd_context
+from core.request_metrics import MetricsMiddleware
+from core.config import settings
+from db.database import dispose_engine
+from main import app
+from models.models import PrivateData, Project, ProjectRole, ProjectUserLink, Role, Task, User
+
+ADMIN_EMAIL = "bench-admin@localhost.com"
+ADMIN_PASSWORD = "benchmark"
+MODES = ("sem middleware", "sample 0", "sample 0.1", "sample 1")
+
+
+def seed(sync_engine) -> int:
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        admin = User(name="admin", email=ADMIN_EMAIL, role=Role.ADMIN)
+        session.add(admin)
+        session.add(PrivateData(user_id=admin.id, hashed_password=pwd_context.hash(ADMIN_PASSWORD)))
+        project = Project(title="bench", description="bench", owner_id=admin.id)
+        session.add(project)
+        session.flush()
+        session.add(ProjectUserLink(project_id=project.id, user_id=admin.id, project_role=ProjectRole.MANAGER))
+        session.add_all([Task(title=f"task {i}", description="bench", project_id=project.id, assigned_to_id=admin.id) for i in range(20)])
+        session.commit()
+        return project.id  # type: ignore
+
+
+# O stack de middlewares é montado na primeira requisição; zerar middleware_stack força remontar
+def configure(mode: str, base_middleware: list):
+    middleware = [m for m in base_middleware if m.cls is not MetricsMiddleware]
+    if mode != "sem middleware":
+        metrics = next(m for m in base_middleware if m.cls is MetricsMiddleware)
+        metrics.kwargs["sample_rate"] = float(mode.split()[1])
+        middleware.insert(0, metrics)
+    app.user_middleware = middleware
+    app.middleware_stack = None
+
+
+async def run(client, paths, headers, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        await client.get(paths[i % len(paths)], headers=headers)
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args):
+    sync_engine = create_engine(settings.DATABASE_URL)
+    project_id = seed(sync_engine)
+    base_middleware = list(app.user_middleware)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        paths = [f"/projects/{project_id}/tasks", "/me"]
+        await run(client, paths, headers, args.requests // 4)
+
+        results = {mode: [] for mode in MODES}
+        for _ in range(args.rounds):
+            for mode in MODES:
+                configure(mode, base_middleware)
+                results[mode].append(await run(client, paths, headers, args.requests))
+
+    baseline = statistics.median(results[MODES[0]])
+    print(f"{'modo':<16}{'req/s (mediana)':>18}{'overhead':>10}")
+    for mode in MODES:
+        throughput = statistics.median(results[mode])
+        print(f"{mode:<16}{throughput:>18.0f}{(baseline / throughput - 1) * 100:>9.1f}%")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
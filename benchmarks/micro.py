@@ -0,0 +1,114 @@
+"""
+Micro-benchmarks de operações quentes, fora do servidor:
+
+- jwt_encode / jwt_decode: create_access_token e jwt.decode do python-jose (o caminho antigo)
+- jwt_decode_hmac: verificação pelo backend hmac de core.tokens, sem cache
+- jwt_verify_cached: decode_token como em get_current_user (acerto no cache de tokens)
+- password_verify: verify_password (pbkdf2, o custo do login)
+- serialize_tasks / serialize_projects: validação + serialização de 100 itens pelo
+  response_model (TaskRead / ProjectRead), do mesmo jeito que o FastAPI faz antes
+  de renderizar o JSON
+
+    python -m benchmarks.micro --duration 2
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from typing import Callable, Dict, List
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+
+from jose import jwt
+from pydantic import TypeAdapter
+
+from benchmarks.report import summarize
+from core.config import settings
+from core.security import create_access_token, get_password_hash, verify_password
+from core.tokens import decode_token, hmac_backend
+from models.models import Project, ProjectRead, Task, TaskRead, User
+
+PASSWORD = "benchmark"
+ITEMS = 100
+
+
+def sample_tasks() -> List[Task]:
+    owner = User(id=uuid.uuid4(), name="owner", email="owner@localhost.com")
+    users = [User(id=uuid.uuid4(), name=f"user {i}", email=f"user{i}@localhost.com") for i in range(10)]
+    project = Project(id=1, title="project", description="bench", owner_id=owner.id, owner=owner)
+    return [Task(id=i, title=f"task {i}", description="bench", project_id=1, project=project,
+                 assigned_to_id=users[i % 10].id, assigned_to=users[i % 10]) for i in range(ITEMS)]
+
+
+def sample_projects() -> List[Project]:
+    users = [User(id=uuid.uuid4(), name=f"user {i}", email=f"user{i}@localhost.com") for i in range(10)]
+    return [Project(id=i, title=f"project {i}", description="bench", owner_id=users[0].id, owner=users[0], participants=users)
+            for i in range(ITEMS)]
+
+
+def serializer(model, items) -> Callable[[], str]:
+    adapter = TypeAdapter(List[model])
+
+    def serialize():
+        value = adapter.validate_python(items, from_attributes=True)
+        return json.dumps(adapter.dump_python(value, mode="json"))
+    return serialize
+
+
+def benchmarks() -> Dict[str, Callable[[], object]]:
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    hashed_password = get_password_hash(PASSWORD)
+    decode_hmac = hmac_backend(settings.SECRET_KEY, settings.ALGORITHM)
+    return {
+        "jwt_encode": lambda: create_access_token({"sub": "2f1a1c9e-5b53-4c6b-9d1e-8f7e6c5d4b3a"}),
+        "jwt_decode": lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        "jwt_decode_hmac": lambda: decode_hmac(token),
+        "jwt_verify_cached": lambda: decode_token(token),
+        "password_verify": lambda: verify_password(PASSWORD, hashed_password),
+        "serialize_tasks": serializer(TaskRead, sample_tasks()),
+        "serialize_projects": serializer(ProjectRead, sample_projects()),
+    }
+
+
+# Roda até max_iterations ou até esgotar duration segundos (mínimo de MIN_ITERATIONS amostras)
+MIN_ITERATIONS = 10
+
+
+def measure(func: Callable[[], object], max_iterations: int, duration: float, alloc_iterations: int) -> dict:
+    for _ in range(3):
+        func()
+    samples = []
+    start = time.perf_counter()
+    deadline = start + duration
+    while len(samples) < max_iterations and (len(samples) < MIN_ITERATIONS or time.perf_counter() < deadline):
+        call_start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_start)
+    result = summarize(samples, time.perf_counter() - start, scale=1e6)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for _ in range(alloc_iterations):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["alloc_peak_kib"] = (peak - baseline) / 1024
+    return result
+
+
+# Latências em microssegundos
+def run_micro(max_iterations: int, duration: float, alloc_iterations: int) -> Dict[str, dict]:
+    return {name: measure(func, max_iterations, duration, alloc_iterations) for name, func in benchmarks().items()}
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--iterations", type=int, default=5000, help="máximo de execuções por micro-benchmark")
+    parser.add_argument("--duration", type=float, default=2.0, help="tempo máximo (s) por micro-benchmark")
+    parser.add_argument("--alloc-iterations", type=int, default=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(json.dumps(run_micro(args.iterations, args.duration, args.alloc_iterations), indent=2))
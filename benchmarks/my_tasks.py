@@ -0,0 +1,125 @@
+"""
+Visão "minhas tasks" de um usuário que participa de muitos projetos: uma requisição
+por projeto (GET /projects/{id}/tasks?mines=true) vs uma única GET /me/tasks, com o
+plano da consulta do /me/tasks (índice de Task.assigned_to_id) numa tabela de tasks
+cheia, a maioria atribuída a outros usuários.
+
+    python -m benchmarks.my_tasks --projects 40 --tasks 50000 --runs 20
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+from sqlalchemy import insert, text
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.config import settings
+from core.security import pwd_context
+from db.database import dispose_engine
+from dependencies.my_tasks import my_tasks_statement
+from main import app
+from models.models import PrivateData, Project, ProjectRole, ProjectUserLink, Role, Task, User
+
+EMAIL = "bench-user@localhost.com"
+PASSWORD = "benchmark"
+PAGE_SIZE = 1000
+
+
+def seed(sync_engine, projects: int, tasks: int, others: int, batch: int = 20000) -> User:
+    rng = random.Random(42)
+    SQLModel.metadata.drop_all(sync_engine)
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        user = User(name="bench", email=EMAIL, role=Role.USER)
+        session.add(user)
+        session.add(PrivateData(user_id=user.id, hashed_password=pwd_context.hash(PASSWORD)))
+        session.commit()
+        session.refresh(user)
+        session.expunge(user)
+
+    other_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(others)]
+    with sync_engine.begin() as conn:
+        conn.execute(insert(User.__table__), [  # type: ignore
+            {"id": other_id, "name": f"user {i}", "email": f"user{i}@bench.com", "role": Role.USER.name}
+            for i, other_id in enumerate(other_ids)
+        ])
+        conn.execute(insert(Project.__table__), [  # type: ignore
+            {"id": project_id, "title": f"project {project_id}", "description": "bench", "owner_id": rng.choice(other_ids)}
+            for project_id in range(1, projects + 1)
+        ])
+        conn.execute(insert(ProjectUserLink.__table__), [  # type: ignore
+            {"project_id": project_id, "user_id": user.id, "project_role": ProjectRole.EDITOR.name}
+            for project_id in range(1, projects + 1)
+        ])
+        # Cerca de 1% das tasks é do usuário medido (cabe numa página de PAGE_SIZE)
+        for start in range(0, tasks, batch):
+            conn.execute(insert(Task.__table__), [  # type: ignore
+                {"title": f"task {i}", "description": "bench", "status": "TODO", "urgency": "LOW",
+                 "project_id": rng.randint(1, projects),
+                 "assigned_to_id": user.id if rng.random() < 0.01 else rng.choice(other_ids)}
+                for i in range(start, min(start + batch, tasks))
+            ])
+        conn.execute(text("ANALYZE"))
+    return user
+
+
+def explain(sync_engine, user: User) -> list:
+    with sync_engine.connect() as conn:
+        statement = my_tasks_statement(user, None, None).order_by(Task.id).limit(PAGE_SIZE)
+        compiled = statement.compile(conn, compile_kwargs={"literal_binds": True})
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        return [row[-1] for row in conn.execute(text(prefix + str(compiled))).all()]
+
+
+async def main(args):
+    sync_engine = create_engine(settings.DATABASE_URL)
+    start = time.perf_counter()
+    user = seed(sync_engine, args.projects, args.tasks, args.others)
+    print(f"seed: {args.tasks} tasks em {args.projects} projetos ({time.perf_counter() - start:.1f}s)\n")
+    await dispose_engine()
+
+    per_project, single = [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            found_per_project = 0
+            for project_id in range(1, args.projects + 1):
+                response = await client.get(f"/projects/{project_id}/tasks", params={"mines": "true", "limit": PAGE_SIZE}, headers=headers)
+                response.raise_for_status()
+                found_per_project += len(response.json())
+            per_project.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            response = await client.get("/me/tasks", params={"limit": PAGE_SIZE}, headers=headers)
+            response.raise_for_status()
+            single.append(time.perf_counter() - start)
+            found_single = sum(len(group["tasks"]) for group in response.json())
+
+    assert found_single == found_per_project, (found_single, found_per_project)
+    print(f"{found_single} tasks do usuário, mediana de {args.runs} execuções")
+    print(f"{args.projects} x GET /projects/{{id}}/tasks?mines=true  {statistics.median(per_project) * 1000:8.1f} ms")
+    print(f"1 x GET /me/tasks                          {statistics.median(single) * 1000:8.1f} ms")
+    print(f"ganho: {statistics.median(per_project) / statistics.median(single):.0f}x\n")
+    print("plano do GET /me/tasks:")
+    for line in explain(sync_engine, user):
+        print(f"    {line}")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--others", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
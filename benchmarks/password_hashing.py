@@ -0,0 +1,103 @@
+"""
+Logins concorrentes e latência de uma rota leve (equivalente ao /me com o usuário
+em cache) no mesmo worker: verificação de senha inline no event loop (antes)
+vs no pool de threads de core.security (depois).
+
+    python -m benchmarks.password_hashing --logins 8 --duration 5
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from core.config import settings
+from core.security import get_password_hash, hashing_stats, verify_password, verify_password_async
+
+PASSWORD = "benchmark-password"
+
+
+def build_app(hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/inline")
+    async def login_inline():
+        if not verify_password(PASSWORD, hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/login/pool")
+    async def login_pool():
+        if not await verify_password_async(PASSWORD, hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/me")
+    async def me():
+        return {"id": "bench"}
+
+    return app
+
+
+async def run_scenario(app: FastAPI, mode: str, logins: int, readers: int, duration: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    deadline = time.perf_counter() + duration
+    login_count = 0
+    me_latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login_loop():
+            nonlocal login_count
+            while time.perf_counter() < deadline:
+                response = await client.post(f"/login/{mode}")
+                response.raise_for_status()
+                login_count += 1
+                await asyncio.sleep(0)  # o ASGITransport não tem I/O de rede para ceder o loop
+
+        async def me_loop():
+            # Latência medida a partir do horário agendado, não de quando a corrotina
+            # voltou a rodar: o tempo com o event loop bloqueado entra na conta
+            scheduled = time.perf_counter()
+            while scheduled < deadline:
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                response = await client.get("/me")
+                me_latencies.append(time.perf_counter() - scheduled)
+                response.raise_for_status()
+                scheduled += 0.01
+
+        await asyncio.gather(*[login_loop() for _ in range(logins)], *[me_loop() for _ in range(readers)])
+
+    me_latencies.sort()
+    return {
+        "logins_per_s": login_count / duration,
+        "me_p50_ms": statistics.median(me_latencies) * 1000,
+        "me_p99_ms": me_latencies[min(len(me_latencies) - 1, int(len(me_latencies) * 0.99))] * 1000,
+        "me_requests": len(me_latencies),
+    }
+
+
+async def main(args):
+    app = build_app(get_password_hash(PASSWORD))
+    print(f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}\n")
+    print(f"{'modo':<10}{'logins/s':>10}{'/me p50 ms':>12}{'/me p99 ms':>12}{'/me reqs':>10}")
+    for mode in ("inline", "pool"):
+        result = await run_scenario(app, mode, args.logins, args.readers, args.duration)
+        print(f"{mode:<10}{result['logins_per_s']:>10.1f}{result['me_p50_ms']:>12.2f}{result['me_p99_ms']:>12.2f}{result['me_requests']:>10}")
+    print(f"\nfila do pool: {hashing_stats.snapshot()['wait_time_seconds']['count']} verificações")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=8, help="clientes fazendo login em loop")
+    parser.add_argument("--readers", type=int, default=4, help="clientes chamando /me em loop")
+    parser.add_argument("--duration", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,128 @@
+"""
+Verifica que os endpoints de listagem executam um número fixo de queries SQL,
+independente da quantidade de linhas (regressão de N+1 por lazy load).
+
+Semeia o banco em duas escalas, conta os statements executados por requisição
+e sai com código 1 se a contagem crescer junto com os dados.
+
+    python -m benchmarks.query_count --scales 5 50
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="taskmanager-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.config import settings
+from core.security import pwd_context
+from db.database import get_engine, dispose_engine
+from main import app
+from models.models import PrivateData, Project, ProjectRole, ProjectUserLink, Role, Task, User
+
+ADMIN_EMAIL = "bench-admin@localhost.com"
+ADMIN_PASSWORD = "benchmark"
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def seed(sync_engine, rows: int) -> dict:
+    SQLModel.metadata.drop_all(sync_engine)
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        admin = User(name="admin", email=ADMIN_EMAIL, role=Role.ADMIN)
+        session.add(admin)
+        session.add(PrivateData(user_id=admin.id, hashed_password=pwd_context.hash(ADMIN_PASSWORD)))
+        users = [User(name=f"user {i}", email=f"user{i}@localhost.com") for i in range(rows)]
+        session.add_all(users)
+        projects = [Project(title=f"project {i}", description="bench", owner_id=admin.id) for i in range(rows)]
+        session.add_all(projects)
+        session.flush()
+        for project in projects:
+            for user in users:
+                session.add(ProjectUserLink(project_id=project.id, user_id=user.id, project_role=ProjectRole.EDITOR))
+        first = projects[0]
+        tasks = [Task(title=f"task {i}", description="bench", project_id=first.id, assigned_to_id=(admin if i % 2 else users[i]).id) for i in range(rows)]
+        session.add_all(tasks)
+        extra_user = User(name="extra", email="extra@localhost.com")
+        session.add(extra_user)
+        session.commit()
+        return {"project_id": first.id, "task_id": tasks[0].id, "extra_user_id": str(extra_user.id),
+                "user_ids": [str(user.id) for user in users]}
+
+
+async def measure(ids: dict) -> dict:
+    counter = StatementCounter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        project_id, task_id = ids["project_id"], ids["task_id"]
+        requests = {
+            "GET /projects/": ("GET", "/projects/", None),
+            "GET /projects/{id}": ("GET", f"/projects/{project_id}", None),
+            "GET /projects/{id}/tasks": ("GET", f"/projects/{project_id}/tasks", None),
+            "GET /projects/{id}/task/{task_id}": ("GET", f"/projects/{project_id}/task/{task_id}", None),
+            "GET /projects/{id}/stats": ("GET", f"/projects/{project_id}/stats", None),
+            "GET /me/tasks": ("GET", "/me/tasks", None),
+            "POST /projects/{id}/add_user": ("POST", f"/projects/{project_id}/add_user", {"user_id": ids["extra_user_id"]}),
+            "POST /projects/{id}/add_users": ("POST", f"/projects/{project_id}/add_users",
+                                              [{"user_id": user_id, "project_role": "manager"} for user_id in ids["user_ids"]]),
+            "PATCH /projects/{id}/remove_users": ("PATCH", f"/projects/{project_id}/remove_users", ids["user_ids"]),
+        }
+        counts = {}
+        sync_engine = get_engine().sync_engine
+        event.listen(sync_engine, "before_cursor_execute", counter)
+        try:
+            for name, (method, url, body) in requests.items():
+                counter.count = 0
+                response = await client.request(method, url, json=body, headers=headers)
+                response.raise_for_status()
+                counts[name] = counter.count
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", counter)
+    return counts
+
+
+async def main(args) -> int:
+    sync_engine = create_engine(settings.DATABASE_URL)
+    results = {}
+    for rows in args.scales:
+        ids = seed(sync_engine, rows)
+        await dispose_engine()
+        results[rows] = await measure(ids)
+
+    failed = False
+    print(f"{'endpoint':<36}" + "".join(f"{f'{rows} linhas':>12}" for rows in args.scales))
+    for name in results[args.scales[0]]:
+        counts = [results[rows][name] for rows in args.scales]
+        failed |= len(set(counts)) > 1
+        print(f"{name:<36}" + "".join(f"{count:>12}" for count in counts))
+
+    await dispose_engine()
+    sync_engine.dispose()
+    if failed:
+        print("ERRO: o número de queries cresce com o número de linhas")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[5, 50])
+    sys.exit(asyncio.run(main(parser.parse_args())))
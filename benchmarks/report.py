@@ -0,0 +1,67 @@
+"""
+Resumo de amostras (p50/p95/p99, throughput) e comparação do JSON da suíte
+contra um baseline gravado.
+"""
+from importlib import metadata
+from typing import Dict, List, Sequence, Tuple
+import statistics
+
+# Métrica -> True quando maior é melhor
+COMPARED_METRICS = {"p50": False, "p95": False, "p99": False, "throughput": True, "alloc_peak_kib": False}
+# p99 é exibido mas não reprova a execução: com poucas amostras é ruído demais
+INFORMATIONAL_METRICS = ("p99",)
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+
+# Latências em segundos convertidas por scale (1000 = ms, 1e6 = µs); throughput em operações/s
+def summarize(samples: List[float], elapsed: float, scale: float = 1000.0) -> dict:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "mean": statistics.fmean(samples) * scale if samples else 0.0,
+        "p50": percentile(samples, 0.50) * scale,
+        "p95": percentile(samples, 0.95) * scale,
+        "p99": percentile(samples, 0.99) * scale,
+    }
+
+
+# Retorna (linhas para imprimir, regressões) comparando cada métrica de cada benchmark
+# presente nos dois resultados; regressão = piora relativa maior que threshold
+def diff(results: dict, baseline: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    lines, regressions = [], []
+    lines.append(f"{'benchmark':<34}{'métrica':<16}{'baseline':>12}{'atual':>12}{'variação':>10}")
+    for section in ("load", "micro", "startup"):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                lines.append(f"{section}.{name:<29}{'(sem baseline)':<16}")
+                continue
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                if metric not in current or not previous.get(metric):
+                    continue
+                change = current[metric] / previous[metric] - 1
+                worse = -change if higher_is_better else change
+                flag = ""
+                if worse > threshold and metric not in INFORMATIONAL_METRICS:
+                    flag = "  REGRESSÃO"
+                    regressions.append(f"{section}.{name}.{metric}")
+                elif worse > threshold:
+                    flag = "  (pior)"
+                lines.append(f"{section + '.' + name:<34}{metric:<16}{previous[metric]:>12.3f}{current[metric]:>12.3f}{change * 100:>9.1f}%{flag}")
+    return lines, regressions
+
+
+def versions(packages: Sequence[str]) -> Dict[str, str]:
+    found = {}
+    for package in packages:
+        try:
+            found[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            found[package] = "not installed"
+    return found
@@ -0,0 +1,116 @@
+"""
+Servidor mínimo do protocolo do Redis (RESP2) em memória, para testar e medir o
+backend redis de core.cache_backends sem um Redis de verdade. Implementa só o que
+o backend usa: PING, AUTH, SELECT, GET, MGET, SET (EX/PX/NX), DEL e FLUSHDB, e o
+PUBLISH/SUBSCRIBE do broker redis do feed (core.feed).
+
+    python -m benchmarks.resp_server --port 6390
+    CACHE_BACKEND=redis CACHE_URL=redis://localhost:6390/0 uvicorn main:app
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import time
+
+
+class RESPServer:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self.commands = 0
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item[0]
+
+    @staticmethod
+    def encode(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(RESPServer.encode(item) for item in value)
+        if isinstance(value, Exception):
+            return b"-ERR %s\r\n" % str(value).encode()
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def execute(self, args: List[bytes], writer: Optional[asyncio.StreamWriter] = None):
+        self.commands += 1
+        command = args[0].upper()
+        if command in (b"PING", b"AUTH", b"SELECT"):
+            return "PONG" if command == b"PING" else "OK"
+        if command == b"GET":
+            return self._get(args[1])
+        if command == b"MGET":
+            return [self._get(key) for key in args[1:]]
+        if command == b"SET":
+            key, value, options = args[1], args[2], [option.upper() for option in args[3:]]
+            expires_at = None
+            if b"PX" in options:
+                expires_at = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+            elif b"EX" in options:
+                expires_at = time.monotonic() + int(options[options.index(b"EX") + 1])
+            if b"NX" in options and self._get(key) is not None:
+                return None
+            self.data[key] = (value, expires_at)
+            return "OK"
+        if command == b"DEL":
+            return sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+        if command == b"SUBSCRIBE" and writer is not None:
+            self.channels.setdefault(args[1], set()).add(writer)
+            return [b"subscribe", args[1], 1]
+        if command == b"PUBLISH":
+            message = self.encode([b"message", args[1], args[2]])
+            subscribers = [subscriber for subscriber in self.channels.get(args[1], ()) if not subscriber.is_closing()]
+            for subscriber in subscribers:
+                subscriber.write(message)
+            return len(subscribers)
+        if command == b"FLUSHDB":
+            self.data.clear()
+            return "OK"
+        return ValueError(f"unknown command '{command.decode()}'")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                count = int(line[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self.encode(self.execute(args, writer)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for subscribers in self.channels.values():
+                subscribers.discard(writer)
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def main(args: argparse.Namespace):
+    server = await RESPServer().start(args.host, args.port)
+    print(f"listening on {args.host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    asyncio.run(main(parser.parse_args()))
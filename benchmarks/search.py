@@ -0,0 +1,143 @@
+"""
+Latência do GET /search (dependencies.search) com a tabela de tasks cheia: termos
+raros, comuns, prefixos e dois termos, no escopo de um usuário comum (projetos em que
+participa) e de um admin (todos os projetos). Mostra o plano de cada consulta.
+
+Títulos e descrições usam um vocabulário com frequência de Zipf, então os termos
+comuns aparecem em boa parte das tasks: é o caso em que o limite de candidatos
+(SEARCH_MAX_CANDIDATES) segura o custo do ranking.
+
+Usa um SQLite temporário (FTS5) por padrão; --database-url aceita um PostgreSQL vazio
+(as tabelas e o índice GIN são recriados).
+
+    python -m benchmarks.search --tasks 1000000 --runs 100
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import itertools
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert, text
+
+from core.config import settings
+from dependencies.search import search_statement, search_terms
+from models.models import Project, ProjectRole, ProjectUserLink, Role, Task, User
+from sqlmodel import SQLModel
+
+VOCABULARY = [f"{prefix}{suffix}" for prefix in ("rel", "cad", "fin", "api", "dep", "tes", "doc", "ui")
+              for suffix in ("atorio", "astro", "anceiro", "integracao", "loy", "te", "umento", "tela", "ao", "ema")]
+VOCABULARY += [f"termo{i}" for i in range(5000)]
+WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+QUERIES = {
+    "termo raro": "termo4000",
+    "termo comum": VOCABULARY[0],
+    "prefixo": "rel",
+    "dois termos": f"{VOCABULARY[1]} {VOCABULARY[5]}",
+}
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=WEIGHTS, k=count))
+
+
+def seed(engine, users: int, projects: int, members: int, tasks: int, batch: int = 20000) -> uuid.UUID:
+    rng = random.Random(42)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [  # type: ignore
+            {"id": user_id, "name": f"user {i}", "email": f"user{i}@bench.local", "role": "USER"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(insert(Project.__table__), [  # type: ignore
+            {"id": project_id, "title": words(rng, 3), "description": words(rng, 8), "owner_id": rng.choice(user_ids)}
+            for project_id in range(1, projects + 1)
+        ])
+        conn.execute(insert(ProjectUserLink.__table__), [  # type: ignore
+            {"project_id": project_id, "user_id": user_id, "project_role": ProjectRole.EDITOR.name}
+            for project_id in range(1, projects + 1) for user_id in rng.sample(user_ids, members)
+        ])
+
+    for start in range(0, tasks, batch):
+        with engine.begin() as conn:
+            conn.execute(insert(Task.__table__), [  # type: ignore
+                {"title": words(rng, 4), "description": words(rng, 12), "status": "TODO", "urgency": "LOW",
+                 "project_id": rng.randint(1, projects), "assigned_to_id": None}
+                for _ in range(start, min(start + batch, tasks))
+            ])
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return user_ids[0]
+
+
+def explain(conn, statement) -> list:
+    compiled = statement.compile(conn, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return [row[-1] for row in conn.execute(text(prefix + str(compiled))).all()]
+
+
+def measure(engine, user: User, runs: int, limit: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for name, q in QUERIES.items():
+            statement = search_statement(conn.dialect.name, user, search_terms(q), None,
+                                         settings.SEARCH_MAX_CANDIDATES).limit(limit)
+            samples = []
+            found = 0
+            for _ in range(runs):
+                start = time.perf_counter()
+                found = len(conn.execute(statement).all())
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            results[name] = {
+                "plan": explain(conn, statement),
+                "found": found,
+                "p50_ms": statistics.median(samples) * 1000,
+                "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            }
+    return results
+
+
+def main(args):
+    database_url = args.database_url or f"sqlite:///{env.BENCH_DIR}/search.db"
+    engine = create_engine(database_url)
+
+    start = time.perf_counter()
+    member_id = seed(engine, args.users, args.projects, args.members, args.tasks)
+    print(f"seed: {args.tasks} tasks em {time.perf_counter() - start:.1f}s "
+          f"(SEARCH_MAX_CANDIDATES={settings.SEARCH_MAX_CANDIDATES})\n")
+
+    scopes = {
+        "usuário": User(id=member_id, role=Role.USER),
+        "admin": User(id=uuid.uuid4(), role=Role.ADMIN),
+    }
+    for scope, user in scopes.items():
+        results = measure(engine, user, args.runs, args.limit)
+        for name, result in results.items():
+            print(f"== {name} ({scope}): {result['found']} resultados  "
+                  f"p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms")
+            if args.plans:
+                for line in result["plan"]:
+                    print(f"      {line}")
+        print()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--plans", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,149 @@
+"""
+Vazão da serialização das listas de 10k itens (tasks, projetos e usuários), nos dois
+caminhos dos endpoints de lista:
+
+- response_model: objetos ORM carregados com os relacionamentos do schema de leitura,
+  validados e serializados pelo response_field da rota (fastapi.routing.serialize_response)
+  e codificados pelo JSONResponse, como o FastAPI faz por padrão;
+- fast: tuplas do SELECT -> dicts -> JSON pelo pydantic-core (dependencies.serialization,
+  FAST_LIST_SERIALIZATION=true; o json_response da rota usa o mesmo to_json).
+
+Mede a leitura no banco e a serialização separadamente, em itens por segundo, e confere
+que os dois caminhos geram o mesmo JSON.
+
+    python -m benchmarks.serialization --items 10000 --runs 5
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic_core import to_json
+from sqlalchemy import insert
+from sqlmodel import SQLModel, create_engine, select
+
+from core.config import settings
+from db.database import async_session, dispose_engine
+from dependencies.serialization import (participants_statement, project_dicts, project_list_statement, task_dicts,
+                                        task_list_statement, user_dicts, user_list_statement)
+from models.models import Project, ProjectRead, ProjectRole, ProjectUserLink, Role, Task, TaskRead, User, UserRead
+from routes.project_routes import project_read_options, task_read_options
+
+MEMBERS = 5
+
+
+def seed(items: int, batch: int = 20000):
+    engine = create_engine(settings.DATABASE_URL)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    user_ids = [uuid.UUID(int=i + 1) for i in range(items)]
+    with engine.begin() as conn:
+        for start in range(0, items, batch):
+            conn.execute(insert(User.__table__), [  # type: ignore
+                {"id": user_ids[i], "name": f"user {i}", "email": f"user{i}@bench.com", "role": Role.USER.name}
+                for i in range(start, min(start + batch, items))
+            ])
+            conn.execute(insert(Project.__table__), [  # type: ignore
+                {"id": i + 1, "title": f"project {i}", "description": "bench " * 5, "owner_id": user_ids[i]}
+                for i in range(start, min(start + batch, items))
+            ])
+            conn.execute(insert(ProjectUserLink.__table__), [  # type: ignore
+                {"project_id": i + 1, "user_id": user_ids[(i + k) % items], "project_role": ProjectRole.EDITOR.name}
+                for i in range(start, min(start + batch, items)) for k in range(MEMBERS)
+            ])
+            conn.execute(insert(Task.__table__), [  # type: ignore
+                {"title": f"task {i}", "description": "bench " * 10, "status": "TODO", "urgency": "LOW",
+                 "project_id": 1 + i % 100, "assigned_to_id": user_ids[i % items]}
+                for i in range(start, min(start + batch, items))
+            ])
+    engine.dispose()
+
+
+# Mesmas consultas dos endpoints, sem a paginação (uma página de 10k itens)
+async def load_orm(kind: str) -> list:
+    statement = {
+        "tasks": select(Task).options(*task_read_options).order_by(Task.id),
+        "projects": select(Project).options(*project_read_options).order_by(Project.id),
+        "users": select(User).order_by(User.id),
+    }[kind]
+    async with async_session() as session:
+        return list((await session.exec(statement)).all())
+
+
+async def load_fast(kind: str) -> list:
+    async with async_session() as session:
+        if kind == "tasks":
+            return task_dicts((await session.exec(task_list_statement().order_by(Task.id))).all())
+        if kind == "projects":
+            rows = (await session.exec(project_list_statement().order_by(Project.id))).all()
+            participant_rows = (await session.exec(participants_statement([row.id for row in rows]))).all()
+            return project_dicts(rows, participant_rows)
+        return user_dicts((await session.exec(user_list_statement().order_by(User.id))).all())
+
+
+def response_field(model):
+    async def endpoint():
+        pass
+    return APIRoute("/", endpoint, response_model=List[model]).response_field
+
+
+async def serialize_default(field, objects: list) -> bytes:
+    return JSONResponse(await serialize_response(field=field, response_content=objects)).body
+
+
+async def measure(kind: str, model, runs: int) -> dict:
+    field = response_field(model)
+    samples: dict = {"response_model": {"load": [], "serialize": []}, "fast": {"load": [], "serialize": []}}
+    bodies = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        objects = await load_orm(kind)
+        loaded = time.perf_counter()
+        bodies["response_model"] = await serialize_default(field, objects)
+        done = time.perf_counter()
+        samples["response_model"]["load"].append(loaded - start)
+        samples["response_model"]["serialize"].append(done - loaded)
+
+        start = time.perf_counter()
+        rows = await load_fast(kind)
+        loaded = time.perf_counter()
+        bodies["fast"] = to_json(rows)
+        done = time.perf_counter()
+        samples["fast"]["load"].append(loaded - start)
+        samples["fast"]["serialize"].append(done - loaded)
+
+    assert json.loads(bodies["response_model"]) == json.loads(bodies["fast"]), f"{kind}: JSON diferente"
+    items = len(objects)
+    results = {}
+    for mode, phases in samples.items():
+        load, serialize = statistics.median(phases["load"]), statistics.median(phases["serialize"])
+        results[mode] = {"load_ms": load * 1000, "serialize_ms": serialize * 1000,
+                         "serialize_items_per_s": items / serialize, "total_items_per_s": items / (load + serialize),
+                         "bytes": len(bodies[mode])}
+    return results
+
+
+async def main(args):
+    seed(args.items)
+    print(f"{args.items} itens por lista, mediana de {args.runs} execuções\n")
+    for kind, model in (("tasks", TaskRead), ("projects", ProjectRead), ("users", UserRead)):
+        results = await measure(kind, model, args.runs)
+        for mode, result in results.items():
+            print(f"{kind:<9} {mode:<15} leitura {result['load_ms']:8.1f} ms  serialização {result['serialize_ms']:8.1f} ms  "
+                  f"{result['serialize_items_per_s']:>10,.0f} itens/s  (total {result['total_items_per_s']:>9,.0f} itens/s)")
+        speedup = results["fast"]["total_items_per_s"] / results["response_model"]["total_items_per_s"]
+        print(f"{kind:<9} fast é {speedup:.1f}x mais rápido no total\n")
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
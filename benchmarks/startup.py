@@ -0,0 +1,103 @@
+"""
+Tempo de subida de um worker, cada execução num interpretador novo (como um worker do
+gunicorn que nasce ou é reciclado pelo --max-requests): import da aplicação (main),
+lifespan e a primeira requisição (GET /me autenticado, que lê o usuário no banco).
+"total" vai do início do processo até a resposta.
+
+O import não pode abrir conexão nem criar tabelas: o banco da execução é criado antes,
+como fariam as migrations.
+
+Sai com código 1 se o p50 do import ou da primeira resposta passar do orçamento
+(--max-import-ms, --max-first-request-ms). Também roda na suíte (benchmarks.suite),
+comparado com o baseline.
+
+    python -m benchmarks.startup --runs 10
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from benchmarks.report import summarize
+from core.config import settings
+from core.security import create_access_token
+from models.models import Role, User
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Roda no interpretador novo e imprime os tempos (segundos) em JSON
+CHILD = """
+import asyncio, json, os, time
+import httpx
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def first_request():
+    async with main.app.router.lifespan_context(main.app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/me", headers={"Authorization": "Bearer " + os.environ["BENCH_TOKEN"]})
+            response.raise_for_status()
+        return started, time.perf_counter()
+
+started, answered = asyncio.run(first_request())
+print(json.dumps({"import": imported - start, "lifespan": started - imported, "first_request": answered - imported}))
+"""
+
+
+def seed() -> str:
+    engine = create_engine(settings.DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(name="startup", email="startup@bench.com", role=Role.USER)
+        session.add(user)
+        session.commit()
+        token = create_access_token({"sub": str(user.id)})
+    engine.dispose()
+    return token
+
+
+def measure_once(token: str) -> dict:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env={**os.environ, "BENCH_TOKEN": token},
+                            capture_output=True, text=True, check=True).stdout
+    total = time.perf_counter() - start
+    return {**json.loads(output.strip().splitlines()[-1]), "total": total}
+
+
+def run_startup(runs: int) -> dict:
+    token = seed()
+    measure_once(token)  # aquece o cache de bytecode (__pycache__) e o page cache
+    samples: dict = {"import": [], "lifespan": [], "first_request": [], "total": []}
+    for _ in range(runs):
+        for phase, seconds in measure_once(token).items():
+            samples[phase].append(seconds)
+    return {phase: summarize(values, sum(values)) for phase, values in samples.items()}
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--startup-runs", type=int, default=10, help="processos medidos no startup")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=2000)
+    parser.add_argument("--max-first-request-ms", type=float, default=250)
+    args = parser.parse_args()
+    results = run_startup(args.runs)
+    print(json.dumps(results, indent=2))
+    budgets = {"import": args.max_import_ms, "first_request": args.max_first_request_ms}
+    over = [f"{phase}: p50 {results[phase]['p50']:.0f} ms > {budget:.0f} ms"
+            for phase, budget in budgets.items() if results[phase]["p50"] > budget]
+    for line in over:
+        print(f"acima do orçamento: {line}", file=sys.stderr)
+    sys.exit(1 if over else 0)
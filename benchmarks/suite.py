@@ -0,0 +1,94 @@
+"""
+Suíte reprodutível: gera os dados (benchmarks.datagen), roda os cenários de
+carga (benchmarks.load), os micro-benchmarks (benchmarks.micro) e o tempo de
+subida de um worker (benchmarks.startup) contra um SQLite temporário, grava o
+resultado em JSON e compara com o baseline.
+
+Sai com código 1 quando alguma métrica piora mais que --threshold em relação
+ao baseline (latências e alocações maiores, throughput menor). Os números
+dependem da máquina: grave o baseline no mesmo ambiente em que a suíte roda.
+
+    python -m benchmarks.suite                                   # roda e compara com benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline                   # regrava o baseline
+    python -m benchmarks.suite --output results.json --threshold 0.3
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import platform
+import sys
+
+from benchmarks import load, micro, startup
+from benchmarks.datagen import generate
+from benchmarks.report import diff, versions
+from db.database import dispose_engine
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+TRACKED_PACKAGES = ("fastapi", "starlette", "sqlmodel", "sqlalchemy", "pydantic", "pydantic-core", "python-jose", "passlib", "aiosqlite")
+
+
+async def run(args) -> dict:
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": versions(TRACKED_PACKAGES),
+            "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "save_baseline")},
+        },
+    }
+    if "load" in args.parts:
+        dataset = await generate(args.users, args.projects, args.members, args.tasks)
+        results["load"] = await load.run_load(dataset, args.requests, args.concurrency, args.login_requests, args.alloc_requests)
+        await dispose_engine()
+    if "micro" in args.parts:
+        results["micro"] = micro.run_micro(args.iterations, args.duration, args.alloc_iterations)
+    if "startup" in args.parts:
+        results["startup"] = startup.run_startup(args.startup_runs)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    load.add_arguments(parser)
+    micro.add_arguments(parser)
+    startup.add_arguments(parser)
+    parser.add_argument("--parts", nargs="+", choices=("load", "micro", "startup"), default=["load", "micro", "startup"])
+    parser.add_argument("--output", type=Path, default=None, help="grava o JSON do resultado neste arquivo")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="grava o resultado como novo baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora relativa tolerada (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline gravado em {args.baseline}")
+        return 0
+    if not args.output:
+        print(json.dumps(results, indent=2))
+
+    if not args.baseline.exists():
+        print(f"sem baseline em {args.baseline}; rode com --save-baseline para criar")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"]["packages"] != results["meta"]["packages"]:
+        print("versões de pacotes diferentes do baseline:")
+        for package, version in results["meta"]["packages"].items():
+            if baseline["meta"]["packages"].get(package) != version:
+                print(f"  {package}: {baseline['meta']['packages'].get(package)} -> {version}")
+    lines, regressions = diff(results, baseline, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Cadastro de usuários: uma requisição por usuário (POST /users/) vs lote JSON
+(POST /users/bulk) vs importação de CSV (POST /users/import). Durante a importação
+do CSV um cliente faz logins em sequência, para mostrar quanto um login espera pelo
+pool de hash (PASSWORD_HASH_WORKERS) enquanto o lote está sendo processado.
+
+    python -m benchmarks.user_import --users 1000
+"""
+from benchmarks import env  # noqa: F401  (precisa vir antes dos módulos da aplicação)
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from core.config import settings
+from core.security import pwd_context
+from db.database import dispose_engine
+from main import app
+from models.models import PrivateData, Role, User
+
+ADMIN_EMAIL = "bench-admin@localhost.com"
+ADMIN_PASSWORD = "benchmark"
+
+
+def seed(sync_engine):
+    SQLModel.metadata.drop_all(sync_engine)
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        admin = User(name="admin", email=ADMIN_EMAIL, role=Role.ADMIN)
+        session.add(admin)
+        session.add(PrivateData(user_id=admin.id, hashed_password=pwd_context.hash(ADMIN_PASSWORD)))
+        session.commit()
+
+
+def users_payload(prefix: str, users: int) -> list:
+    return [{"name": f"{prefix} {i}", "email": f"{prefix}{i}@bench.com", "password": "benchmark"} for i in range(users)]
+
+
+async def login_while(client: httpx.AsyncClient, running: asyncio.Task) -> list:
+    samples = []
+    while not running.done():
+        start = time.perf_counter()
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main(args):
+    sync_engine = create_engine(settings.DATABASE_URL)
+    seed(sync_engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        start = time.perf_counter()
+        for user in users_payload("single", args.users):
+            (await client.post("/users/", json=user, headers=headers)).raise_for_status()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post("/users/bulk", json=users_payload("bulk", args.users), headers=headers)
+        bulk = time.perf_counter() - start
+        assert all(result["status_code"] == 200 for result in response.json())
+
+        lines = ["name,email,password"] + [f"{user['name']},{user['email']},{user['password']}" for user in users_payload("csv", args.users)]
+        files = {"file": ("users.csv", "\n".join(lines).encode(), "text/csv")}
+        start = time.perf_counter()
+        running = asyncio.create_task(client.post("/users/import", files=files, headers=headers))
+        logins = await login_while(client, running)
+        response = await running
+        csv_import = time.perf_counter() - start
+        assert all(result["status_code"] == 200 for result in response.json())
+
+    print(f"{args.users} usuários, PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}")
+    print(f"{'modo':<20}{'tempo (s)':>10}{'usuários/s':>12}{'ganho':>8}")
+    for name, seconds in (("POST /users/", single), ("POST /users/bulk", bulk), ("POST /users/import", csv_import)):
+        print(f"{name:<20}{seconds:>10.2f}{args.users / seconds:>12.0f}{single / seconds:>7.1f}x")
+    if logins:
+        print(f"\nlogins durante a importação: {len(logins)}  p50 {statistics.median(logins) * 1000:.0f} ms  "
+              f"máx {max(logins) * 1000:.0f} ms")
+
+    await dispose_engine()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from core.cache_backends import CacheBackend, MemoryBackend, build_cache_backend
+from core.config import settings
+
+logger = logging.getLogger("taskmanager.cache")
+
+# Caches registrados por nome (TTLCache e Cache), expostos em GET /admin/cache
+caches: Dict[str, Any] = {}
+
+# LRU limitado com expiração por item. Roda no event loop do worker, sem locks.
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]):
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+# Backend compartilhado (shm/redis) usado por todos os Cache do processo; None = memory
+shared_backend: Optional[CacheBackend] = build_cache_backend(
+    settings.CACHE_BACKEND, settings.CACHE_URL, settings.CACHE_SHM_PATH, settings.CACHE_SHM_SLOTS,
+    settings.CACHE_SHM_SLOT_SIZE, settings.CACHE_POOL_SIZE, settings.CACHE_TIMEOUT_SECONDS)
+
+async def close_cache_backend():
+    if shared_backend is not None:
+        await shared_backend.close()
+
+MISSING = object()
+
+def new_version() -> bytes:
+    return secrets.token_hex(8).encode()
+
+# Cache com namespace sobre um CacheBackend, para dados lidos por todos os workers.
+# Os valores precisam ser serializáveis em JSON (o carregador já deve devolvê-los assim).
+#
+# Invalidação versionada: cada entrada é gravada junto com os marcadores de versão
+# vigentes do namespace, do grupo (opcional) e da própria chave, e só é aceita se
+# eles ainda forem os mesmos. Invalidar é trocar o marcador por um valor aleatório
+# novo no backend, então com shm/redis todos os workers enxergam a invalidação na
+# leitura seguinte (marcadores e entrada vêm numa única leitura: um MGET no Redis).
+# Uma entrada gravada por quem leu do banco antes de uma invalidação concorrente
+# fica com o marcador antigo e é descartada. Um marcador ausente (expirado ou
+# removido pelo LRU) é recriado com um valor novo, o que só causa falhas de cache.
+#
+# Single-flight: num mesmo worker, requisições simultâneas pela mesma chave ausente
+# esperam o carregamento da primeira em vez de irem todas ao banco.
+# Falhas do backend não derrubam a requisição: viram falha de cache e são contadas.
+class Cache:
+    def __init__(self, name: str, ttl: float, maxsize: int, backend: Optional[CacheBackend] = None):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend or shared_backend or MemoryBackend(maxsize)
+        self.prefix = f"{settings.CACHE_PREFIX}:{name}"
+        self.version_ttl = max(settings.CACHE_VERSION_TTL_SECONDS, ttl)
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+        caches[name] = self
+
+    def _version_keys(self, key: str, group: Optional[str]) -> List[str]:
+        keys = [f"{self.prefix}:v"]
+        if group is not None:
+            keys.append(f"{self.prefix}:g:{group}:v")
+        keys.append(f"{self.prefix}:k:{key}:v")
+        return keys
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        logger.warning("cache %s: %s failed: %r", self.name, operation, error)
+
+    # Retorna (valor ou MISSING, marcadores vigentes para gravar a entrada)
+    async def _lookup(self, key: str, group: Optional[str]) -> Tuple[Any, List[str]]:
+        version_keys = self._version_keys(key, group)
+        *versions, entry = await self.backend.get_many(version_keys + [f"{self.prefix}:e:{key}"])
+        if entry is not None and None not in versions:
+            stored_versions, value = json.loads(entry)
+            if stored_versions == [version.decode() for version in versions]:  # type: ignore
+                return value, stored_versions
+        current = []
+        for version_key, version in zip(version_keys, versions):
+            if version is None:
+                version = await self.backend.add(version_key, new_version(), self.version_ttl)
+            current.append(version.decode())
+        return MISSING, current
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], group: Optional[str] = None) -> Any:
+        try:
+            value, versions = await self._lookup(key, group)
+        except Exception as error:
+            self._failed("get", error)
+            return await loader()
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # Só carrega por conta própria se quem foi cancelado foi o primeiro
+                if not flight.cancelled():
+                    raise
+            return await loader()
+
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._flights[key] = flight
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        finally:
+            self._flights.pop(key, None)
+        flight.set_result(value)
+
+        # None (ex.: registro inexistente) não é guardado
+        if value is not None:
+            try:
+                await self.backend.set(f"{self.prefix}:e:{key}", json.dumps([versions, value], separators=(",", ":")).encode(), self.ttl)
+            except Exception as error:
+                self._failed("set", error)
+        return value
+
+    async def _bump(self, version_key: str):
+        try:
+            await self.backend.set(version_key, new_version(), self.version_ttl)
+            self.invalidations += 1
+        except Exception as error:
+            self._failed("invalidate", error)
+
+    async def invalidate(self, key: str):
+        await self._bump(f"{self.prefix}:k:{key}:v")
+        try:
+            await self.backend.delete(f"{self.prefix}:e:{key}")
+        except Exception as error:
+            self._failed("delete", error)
+
+    async def invalidate_group(self, group: str):
+        await self._bump(f"{self.prefix}:g:{group}:v")
+
+    async def clear(self):
+        await self._bump(f"{self.prefix}:v")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        try:
+            backend = self.backend.stats()
+        except Exception as error:
+            backend = {"backend": self.backend.name, "error": repr(error)}
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "in_flight": len(self._flights),
+            **backend,
+        }
@@ -0,0 +1,388 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+# Armazenamento dos caches compartilhados (core.cache.Cache). Todos guardam bytes com TTL;
+# quem serializa, versiona e invalida é o Cache, então os backends são intercambiáveis.
+#   memory: LRU do próprio processo (um por cache), como o TTLCache
+#   shm:    tabela hash num arquivo mapeado em memória (mmap), compartilhada pelos workers do mesmo host
+#   redis:  qualquer servidor que fale o protocolo do Redis (RESP), compartilhado entre hosts
+
+class CacheBackendError(Exception):
+    pass
+
+class CacheBackend:
+    name = "base"
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    # Grava só se a chave não existir; retorna o valor que ficou gravado
+    async def add(self, key: str, value: bytes, ttl: float) -> bytes:
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+    async def close(self):
+        pass
+
+class MemoryBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bytes:
+        current = self._get(key)
+        if current is not None:
+            return current
+        await self.set(key, value, ttl)
+        return value
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "size": len(self._data), "maxsize": self.maxsize, "evictions": self.evictions}
+
+# Tabela hash de tamanho fixo num arquivo mapeado por todos os workers do host
+# (por padrão em /dev/shm, ou seja, só memória). Cada slot guarda o hash da chave,
+# a expiração (relógio de parede, comum aos processos), o tamanho e o valor.
+# A chave é procurada em PROBE slots consecutivos; sem espaço, o slot que expira
+# primeiro é substituído. Valores maiores que o slot não são guardados.
+# flock serializa o acesso entre processos; as operações não cedem o event loop.
+class SharedMemoryBackend(CacheBackend):
+    name = "shm"
+    MAGIC = b"TMCACHE1"
+    HEADER = struct.Struct("<8sQQ")
+    SLOT = struct.Struct("<16sdI")
+    PROBE = 8
+    EMPTY = bytes(16)
+
+    def __init__(self, path: str, slots: int, slot_size: int):
+        if slot_size <= self.SLOT.size:
+            raise ValueError("CACHE_SHM_SLOT_SIZE is too small")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.size = self.HEADER.size + slots * slot_size
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+        self.evictions = 0
+        self.oversized = 0
+
+    # Aberto sob demanda em cada processo (os workers do gunicorn podem nascer de um fork)
+    def _open(self):
+        import fcntl
+        if self._map is not None and self._pid == os.getpid():
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(fd, self.HEADER.size, 0)
+            if os.fstat(fd).st_size != self.size or header != self.HEADER.pack(self.MAGIC, self.slots, self.slot_size):
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, self.HEADER.pack(self.MAGIC, self.slots, self.slot_size), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._map, self._pid = fd, mmap.mmap(fd, self.size), os.getpid()
+
+    def _lock(self, exclusive: bool):
+        import fcntl
+        self._open()
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)  # type: ignore
+
+    def _unlock(self):
+        import fcntl
+        fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore
+
+    def _slots_for(self, digest: bytes) -> List[int]:
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        return [self.HEADER.size + ((start + i) % self.slots) * self.slot_size for i in range(self.PROBE)]
+
+    def _find(self, digest: bytes, now: float) -> Optional[int]:
+        for offset in self._slots_for(digest):
+            slot_hash, expires_at, _ = self.SLOT.unpack_from(self._map, offset)  # type: ignore
+            if slot_hash == digest and expires_at > now:
+                return offset
+        return None
+
+    def _read(self, offset: int) -> bytes:
+        length = self.SLOT.unpack_from(self._map, offset)[2]  # type: ignore
+        start = offset + self.SLOT.size
+        return self._map[start:start + length]  # type: ignore
+
+    # A janela inteira é percorrida antes de reaproveitar um slot vazio ou expirado: se a
+    # chave já está mais adiante, é esse slot que recebe o valor (uma segunda cópia faria o
+    # valor antigo voltar depois de um delete). Cópias extras, se existirem, são apagadas.
+    def _write(self, digest: bytes, value: bytes, ttl: float, now: float):
+        matches, free, victim, victim_expires = [], None, None, None
+        for offset in self._slots_for(digest):
+            slot_hash, expires_at, _ = self.SLOT.unpack_from(self._map, offset)  # type: ignore
+            if slot_hash == digest:
+                matches.append(offset)
+            elif free is None and (slot_hash == self.EMPTY or expires_at <= now):
+                free = offset
+            elif victim_expires is None or expires_at < victim_expires:
+                victim, victim_expires = offset, expires_at
+        if matches:
+            target = matches[0]
+            for offset in matches[1:]:
+                self._map[offset:offset + 16] = self.EMPTY  # type: ignore
+        elif free is not None:
+            target = free
+        else:
+            target = victim
+            self.evictions += 1
+        self.SLOT.pack_into(self._map, target, digest, now + ttl, len(value))  # type: ignore
+        self._map[target + self.SLOT.size:target + self.SLOT.size + len(value)] = value  # type: ignore
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.time()
+        self._lock(exclusive=False)
+        try:
+            values = []
+            for key in keys:
+                offset = self._find(self._digest(key), now)
+                values.append(self._read(offset) if offset is not None else None)
+            return values
+        finally:
+            self._unlock()
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.slot_size - self.SLOT.size:
+            self.oversized += 1
+            return
+        self._lock(exclusive=True)
+        try:
+            self._write(self._digest(key), value, ttl, time.time())
+        finally:
+            self._unlock()
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bytes:
+        digest, now = self._digest(key), time.time()
+        self._lock(exclusive=True)
+        try:
+            offset = self._find(digest, now)
+            if offset is not None:
+                return self._read(offset)
+            self._write(digest, value, ttl, now)
+            return value
+        finally:
+            self._unlock()
+
+    async def delete(self, key: str):
+        digest = self._digest(key)
+        self._lock(exclusive=True)
+        try:
+            # Todas as cópias da chave na janela, vivas ou expiradas
+            for offset in self._slots_for(digest):
+                if self.SLOT.unpack_from(self._map, offset)[0] == digest:  # type: ignore
+                    self._map[offset:offset + 16] = self.EMPTY  # type: ignore
+        finally:
+            self._unlock()
+
+    def stats(self) -> dict:
+        now = time.time()
+        self._lock(exclusive=False)
+        try:
+            used = sum(1 for i in range(self.slots)
+                       if self.SLOT.unpack_from(self._map, self.HEADER.size + i * self.slot_size)[1] > now)  # type: ignore
+        finally:
+            self._unlock()
+        return {"backend": self.name, "path": self.path, "slots": self.slots, "slot_size": self.slot_size,
+                "used": used, "evictions": self.evictions, "oversized": self.oversized}
+
+    async def close(self):
+        if self._map is not None and self._pid == os.getpid():
+            self._map.close()
+            os.close(self._fd)  # type: ignore
+        self._map = self._fd = self._pid = None
+
+class RESPConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        line = await self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise CacheBackendError("Connection closed by the cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise CacheBackendError(payload.decode(errors="replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self.reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [await self.read_reply() for _ in range(length)]
+        raise CacheBackendError(f"Unexpected reply: {line!r}")
+
+    async def execute(self, *args):
+        self.writer.write(self.encode(*args))
+        await self.writer.drain()
+        return await self.read_reply()
+
+    def close(self):
+        self.writer.close()
+
+# Cliente mínimo do protocolo do Redis (RESP2) sobre asyncio, sem dependências:
+# só GET/MGET/SET/DEL/AUTH/SELECT. Conexões reaproveitadas num pool por event loop.
+# Uma conexão com erro ou timeout é descartada e o erro vira CacheBackendError.
+class RedisBackend(CacheBackend):
+    name = "redis"
+
+    def __init__(self, url: str, pool_size: int, timeout: float):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError("CACHE_URL must be a redis:// URL")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: List[RESPConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.errors = 0
+
+    # Conexão nova (já autenticada e no banco da URL), fora do pool: quem chama é dono dela e a
+    # fecha. O pool usa para abrir conexões; o feed, para o SUBSCRIBE, que prende a conexão
+    async def connect(self) -> RESPConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = RESPConnection(reader, writer)
+        try:
+            if self.password:
+                await conn.execute(*(["AUTH", self.username] if self.username else ["AUTH"]), self.password)
+            if self.db:
+                await conn.execute("SELECT", self.db)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    async def execute(self, *args):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._idle, self._slots = loop, [], asyncio.Semaphore(self.pool_size)
+        async with self._slots:  # type: ignore
+            conn = self._idle.pop() if self._idle else None
+            try:
+                if conn is None:
+                    conn = await asyncio.wait_for(self.connect(), self.timeout)
+                reply = await asyncio.wait_for(conn.execute(*args), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, CacheBackendError) as error:
+                self.errors += 1
+                if conn is not None:
+                    conn.close()
+                raise CacheBackendError(f"{args[0]} failed: {error!r}") from error
+            except BaseException:
+                if conn is not None:
+                    conn.close()
+                raise
+            self._idle.append(conn)
+            return reply
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self.execute("MGET", *keys)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bytes:
+        if await self.execute("SET", key, value, "NX", "PX", max(1, int(ttl * 1000))) is not None:
+            return value
+        current = await self.execute("GET", key)
+        return value if current is None else current
+
+    async def delete(self, key: str):
+        await self.execute("DEL", key)
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "host": self.host, "port": self.port, "db": self.db,
+                "pool_size": self.pool_size, "idle_connections": len(self._idle), "errors": self.errors}
+
+    async def close(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle = []
+
+def default_shm_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "taskmanager-cache")
+
+# Um backend compartilhado por processo para todos os caches; o memory é criado por cache
+def build_cache_backend(name: str, url: Optional[str], shm_path: Optional[str], shm_slots: int, shm_slot_size: int,
+                        pool_size: int, timeout: float) -> Optional[CacheBackend]:
+    if name == "memory":
+        return None
+    if name == "shm":
+        if os.name != "posix":
+            raise RuntimeError("CACHE_BACKEND=shm requires a POSIX system")
+        return SharedMemoryBackend(shm_path or default_shm_path(), shm_slots, shm_slot_size)
+    if name == "redis":
+        if not url:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL")
+        return RedisBackend(url, pool_size, timeout)
+    raise ValueError(f"Unknown cache backend: {name}")
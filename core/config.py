@@ -1,23 +1,136 @@
 from dotenv import load_dotenv
 import os
 load_dotenv()
-from passlib.context import CryptContext
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 try:
     SECRET_KEY = os.getenv("SECRET_KEY") or os.environ["SECRET_KEY"]
 except KeyError:
     raise KeyError("SECRET_KEY environment variable not set")
 ALGORITHM = os.getenv("ALGORITHM") or "HS256"
+# Formato síncrono (o mesmo do Alembic); db/database.py troca pelo driver assíncrono ao criar o engine
+DATABASE_URL = os.getenv("DATABASE_URL") or None
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") or 120)
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS") or 7)
+# Sessões expiradas são apagadas a cada SESSION_PURGE_INTERVAL_SECONDS por worker (0 desliga)
+SESSION_PURGE_INTERVAL_SECONDS = float(os.getenv("SESSION_PURGE_INTERVAL_SECONDS") or 3600)
+# Verificação de JWT: "auto" (hmac para HS256/384/512, python-jose para os demais), "jose", "hmac" ou "pyjwt"
+JWT_BACKEND = (os.getenv("JWT_BACKEND") or "auto").lower()
+# Claims verificados ficam em cache por worker até o exp do token (0 desliga)
+JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE") or 10000)
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Pool de conexões por worker: o total no banco é WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
+DB_POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() in ("1", "true", "yes")
+
+# Caches de usuários autenticados, participação em projetos e leitura de projetos. Com CACHE_BACKEND=memory
+# cada worker tem o seu e o TTL limita quanto tempo outro worker pode continuar usando um dado alterado ou removido;
+# MAX_SIZE só vale para o backend memory
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE") or 10000)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS") or 30)
+MEMBERSHIP_CACHE_MAX_SIZE = int(os.getenv("MEMBERSHIP_CACHE_MAX_SIZE") or 50000)
+MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS") or 30)
+PROJECT_CACHE_MAX_SIZE = int(os.getenv("PROJECT_CACHE_MAX_SIZE") or 10000)
+PROJECT_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_CACHE_TTL_SECONDS") or 30)
+
+# Onde ficam os caches de usuários, participações e projetos:
+# "memory" (por worker), "shm" (memória compartilhada entre os workers do host) ou "redis" (CACHE_URL)
+CACHE_BACKEND = (os.getenv("CACHE_BACKEND") or "memory").lower()
+CACHE_URL = os.getenv("CACHE_URL") or None
+CACHE_PREFIX = os.getenv("CACHE_PREFIX") or "taskmanager"
+CACHE_SHM_PATH = os.getenv("CACHE_SHM_PATH") or None
+CACHE_SHM_SLOTS = int(os.getenv("CACHE_SHM_SLOTS") or 16384)
+CACHE_SHM_SLOT_SIZE = int(os.getenv("CACHE_SHM_SLOT_SIZE") or 1024)
+CACHE_POOL_SIZE = int(os.getenv("CACHE_POOL_SIZE") or 10)
+CACHE_TIMEOUT_SECONDS = float(os.getenv("CACHE_TIMEOUT_SECONDS") or 0.5)
+# Tempo de vida dos marcadores de versão usados na invalidação (ver core/cache.py)
+CACHE_VERSION_TTL_SECONDS = float(os.getenv("CACHE_VERSION_TTL_SECONDS") or 86400)
+
+# Feed de alterações por projeto (SSE): "memory" entrega só no próprio worker, "redis" usa PUBLISH/SUBSCRIBE
+# em FEED_URL (padrão: CACHE_URL). Cada conexão tem uma fila de até FEED_QUEUE_SIZE eventos; os últimos
+# FEED_HISTORY_SIZE eventos de até FEED_HISTORY_PROJECTS projetos ficam guardados para a retomada
+FEED_BROKER = (os.getenv("FEED_BROKER") or "memory").lower()
+FEED_URL = os.getenv("FEED_URL") or None
+FEED_QUEUE_SIZE = int(os.getenv("FEED_QUEUE_SIZE") or 256)
+FEED_HISTORY_SIZE = int(os.getenv("FEED_HISTORY_SIZE") or 256)
+FEED_HISTORY_PROJECTS = int(os.getenv("FEED_HISTORY_PROJECTS") or 1000)
+FEED_HEARTBEAT_SECONDS = float(os.getenv("FEED_HEARTBEAT_SECONDS") or 15)
+FEED_RETRY_MS = int(os.getenv("FEED_RETRY_MS") or 3000)
+
+# Busca textual (GET /search): no máximo SEARCH_MAX_CANDIDATES ocorrências de tasks e de projetos são
+# ranqueadas por consulta, o que limita o custo para termos muito comuns
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES") or 1000)
+
+# Listas (GET /projects, /projects/{id}/tasks, /users) montadas direto das tuplas do SELECT e codificadas
+# uma vez, sem validar a resposta de novo contra o response_model (ver dependencies/serialization.py)
+FAST_LIST_SERIALIZATION = (os.getenv("FAST_LIST_SERIALIZATION") or "false").lower() in ("1", "true", "yes")
+
+# Hash/verificação de senha rodam fora do event loop, em um pool limitado de threads
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or min(4, os.cpu_count() or 1))
+
+# Fração das requisições com tempo/SQL medidos (0 desliga); a contagem de requisições é sempre feita
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE") or 1.0)
+# Se definido, GET /metrics exige "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+SERVER_TIMING_ENABLED = (os.getenv("SERVER_TIMING_ENABLED") or "true").lower() in ("1", "true", "yes")
+
+# Diagnóstico do banco: queries lentas (com EXPLAIN) e N+1 (mesmo statement repetido numa requisição)
+DB_DIAGNOSTICS_ENABLED = (os.getenv("DB_DIAGNOSTICS_ENABLED") or "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS") or 200)
+SLOW_QUERY_EXPLAIN = (os.getenv("SLOW_QUERY_EXPLAIN") or "true").lower() in ("1", "true", "yes")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD") or 10)
+DIAGNOSTICS_BUFFER_SIZE = int(os.getenv("DIAGNOSTICS_BUFFER_SIZE") or 200)
 
 class Settings(BaseSettings):
     SECRET_KEY: str = SECRET_KEY
     ALGORITHM: str = ALGORITHM
+    DATABASE_URL: Optional[str] = DATABASE_URL
     ACCESS_TOKEN_EXPIRE_MINUTES: int = ACCESS_TOKEN_EXPIRE_MINUTES
     REFRESH_TOKEN_EXPIRE_DAYS: int = REFRESH_TOKEN_EXPIRE_DAYS
+    SESSION_PURGE_INTERVAL_SECONDS: float = SESSION_PURGE_INTERVAL_SECONDS
+    JWT_BACKEND: str = JWT_BACKEND
+    JWT_CACHE_MAX_SIZE: int = JWT_CACHE_MAX_SIZE
+    DB_POOL_SIZE: int = DB_POOL_SIZE
+    DB_MAX_OVERFLOW: int = DB_MAX_OVERFLOW
+    DB_POOL_TIMEOUT: float = DB_POOL_TIMEOUT
+    DB_POOL_RECYCLE: int = DB_POOL_RECYCLE
+    DB_POOL_PRE_PING: bool = DB_POOL_PRE_PING
+    USER_CACHE_MAX_SIZE: int = USER_CACHE_MAX_SIZE
+    USER_CACHE_TTL_SECONDS: float = USER_CACHE_TTL_SECONDS
+    MEMBERSHIP_CACHE_MAX_SIZE: int = MEMBERSHIP_CACHE_MAX_SIZE
+    MEMBERSHIP_CACHE_TTL_SECONDS: float = MEMBERSHIP_CACHE_TTL_SECONDS
+    PROJECT_CACHE_MAX_SIZE: int = PROJECT_CACHE_MAX_SIZE
+    PROJECT_CACHE_TTL_SECONDS: float = PROJECT_CACHE_TTL_SECONDS
+    CACHE_BACKEND: str = CACHE_BACKEND
+    CACHE_URL: Optional[str] = CACHE_URL
+    CACHE_PREFIX: str = CACHE_PREFIX
+    CACHE_SHM_PATH: Optional[str] = CACHE_SHM_PATH
+    CACHE_SHM_SLOTS: int = CACHE_SHM_SLOTS
+    CACHE_SHM_SLOT_SIZE: int = CACHE_SHM_SLOT_SIZE
+    CACHE_POOL_SIZE: int = CACHE_POOL_SIZE
+    CACHE_TIMEOUT_SECONDS: float = CACHE_TIMEOUT_SECONDS
+    CACHE_VERSION_TTL_SECONDS: float = CACHE_VERSION_TTL_SECONDS
+    FEED_BROKER: str = FEED_BROKER
+    FEED_URL: Optional[str] = FEED_URL
+    FEED_QUEUE_SIZE: int = FEED_QUEUE_SIZE
+    FEED_HISTORY_SIZE: int = FEED_HISTORY_SIZE
+    FEED_HISTORY_PROJECTS: int = FEED_HISTORY_PROJECTS
+    FEED_HEARTBEAT_SECONDS: float = FEED_HEARTBEAT_SECONDS
+    FEED_RETRY_MS: int = FEED_RETRY_MS
+    SEARCH_MAX_CANDIDATES: int = SEARCH_MAX_CANDIDATES
+    FAST_LIST_SERIALIZATION: bool = FAST_LIST_SERIALIZATION
+    PASSWORD_HASH_WORKERS: int = PASSWORD_HASH_WORKERS
+    METRICS_SAMPLE_RATE: float = METRICS_SAMPLE_RATE
+    METRICS_TOKEN: Optional[str] = METRICS_TOKEN
+    SERVER_TIMING_ENABLED: bool = SERVER_TIMING_ENABLED
+    DB_DIAGNOSTICS_ENABLED: bool = DB_DIAGNOSTICS_ENABLED
+    SLOW_QUERY_THRESHOLD_MS: float = SLOW_QUERY_THRESHOLD_MS
+    SLOW_QUERY_EXPLAIN: bool = SLOW_QUERY_EXPLAIN
+    N_PLUS_ONE_THRESHOLD: int = N_PLUS_ONE_THRESHOLD
+    DIAGNOSTICS_BUFFER_SIZE: int = DIAGNOSTICS_BUFFER_SIZE
 
 settings = Settings()
\ No newline at end of file
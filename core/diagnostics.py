@@ -0,0 +1,103 @@
+import json
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from core.config import settings
+from core.request_metrics import route_path
+
+logger = logging.getLogger("taskmanager.db.diagnostics")
+
+SLOW_QUERY = "slow_query"
+N_PLUS_ONE = "n_plus_one"
+
+# Statements que tocam estas tabelas não têm os parâmetros registrados (hash de senha, ids de sessão)
+REDACTED_TABLES = ("privatedata", "usersession")
+MAX_PARAMETERS_LENGTH = 1000
+
+def format_parameters(statement: str, parameters: Any, executemany: bool = False) -> Optional[str]:
+    if any(table in statement.lower() for table in REDACTED_TABLES):
+        return "<redacted>"
+    if executemany and parameters:
+        parameters = parameters[0]
+    text = repr(parameters)
+    return text if len(text) <= MAX_PARAMETERS_LENGTH else text[:MAX_PARAMETERS_LENGTH] + "..."
+
+# Achados recentes num buffer circular (os mais antigos são descartados) e no log estruturado
+class Diagnostics:
+    def __init__(self, enabled: bool, slow_query_ms: float, explain: bool, n_plus_one_threshold: int, buffer_size: int):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.findings: deque = deque(maxlen=buffer_size)
+        self.totals = {SLOW_QUERY: 0, N_PLUS_ONE: 0}
+
+    def record(self, finding: Dict[str, Any]):
+        finding["timestamp"] = time.time()
+        self.findings.append(finding)
+        self.totals[finding["type"]] += 1
+        logger.warning(json.dumps(finding, default=str))
+
+    def snapshot(self, limit: int) -> dict:
+        return {
+            "enabled": self.enabled,
+            "slow_query_threshold_ms": self.slow_query_ms,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "totals": dict(self.totals),
+            "findings": list(self.findings)[-limit:][::-1],
+        }
+
+diagnostics = Diagnostics(
+    enabled=settings.DB_DIAGNOSTICS_ENABLED,
+    slow_query_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    buffer_size=settings.DIAGNOSTICS_BUFFER_SIZE,
+)
+
+# Statements executados pela requisição corrente, agrupados pelo texto SQL (com placeholders),
+# que é igual para todas as execuções de um mesmo lazy load ou session.get em loop
+class RequestQueries:
+    __slots__ = ("scope", "counts", "parameters")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.counts: Dict[str, int] = {}
+        self.parameters: Dict[str, Any] = {}
+
+    def add(self, statement: str, parameters: Any):
+        count = self.counts.get(statement, 0)
+        if not count:
+            self.parameters[statement] = parameters
+        self.counts[statement] = count + 1
+
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+class DiagnosticsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not diagnostics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = current_queries.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_queries.reset(token)
+            for statement, count in queries.counts.items():
+                if count > diagnostics.n_plus_one_threshold:
+                    diagnostics.record({
+                        "type": N_PLUS_ONE,
+                        "method": scope["method"],
+                        "route": route_path(scope),
+                        "statement": statement,
+                        "count": count,
+                        "parameters": format_parameters(statement, queries.parameters[statement]),
+                    })
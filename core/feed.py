@@ -0,0 +1,332 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set
+from core.cache_backends import CacheBackendError, RedisBackend, RESPConnection
+from core.config import settings
+
+logger = logging.getLogger("taskmanager.feed")
+
+# Feed de alterações por projeto (GET /projects/{id}/events, Server-Sent Events).
+# Cada evento carrega a sequência do projeto depois da alteração (Project.version +
+# Project.tasks_version, calculada pelo banco na mesma transação) e a anterior: um
+# cliente percebe que perdeu eventos quando prev não é o último id que recebeu, e o
+# id é o mesmo em todos os workers, então a retomada (Last-Event-ID) vale em qualquer um.
+
+class FeedEvent:
+    __slots__ = ("project_id", "seq", "prev", "type", "data", "_frame")
+
+    def __init__(self, project_id: int, seq: Optional[int], prev: Optional[int], type: str, data: dict):
+        self.project_id = project_id
+        self.seq = seq
+        self.prev = prev
+        self.type = type
+        self.data = data
+        self._frame: Optional[bytes] = None
+
+    def encode(self) -> bytes:
+        return json.dumps({"project_id": self.project_id, "seq": self.seq, "prev": self.prev, "type": self.type, "data": self.data},
+                          separators=(",", ":"), default=str).encode()
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "FeedEvent":
+        return cls(**json.loads(payload))
+
+    # O frame SSE é montado uma vez e compartilhado por todas as conexões do projeto
+    def frame(self) -> bytes:
+        if self._frame is None:
+            data = json.dumps({"seq": self.seq, **self.data}, separators=(",", ":"), default=str)
+            lines = [] if self.seq is None else [f"id: {self.seq}"]
+            lines += [f"event: {self.type}", f"data: {data}", "", ""]
+            self._frame = "\n".join(lines).encode()
+        return self._frame
+
+def reset_frame(seq: Optional[int]) -> bytes:
+    return f"event: reset\ndata: {json.dumps({'seq': seq})}\n\n".encode()
+
+# Fila limitada de uma conexão. O publicador nunca espera: se a conexão não acompanha,
+# a fila é descartada e a conexão recebe um "reset" (o cliente recarrega a lista).
+# A espera é um future simples (sem task nem timer por conexão); o heartbeat é um único
+# timer do worker que acorda as conexões paradas.
+class Subscription:
+    __slots__ = ("project_id", "maxsize", "queue", "overflowed", "heartbeat", "_waiter")
+
+    def __init__(self, project_id: int, maxsize: int):
+        self.project_id = project_id
+        self.maxsize = maxsize
+        self.queue: Deque[FeedEvent] = deque()
+        self.overflowed = False
+        self.heartbeat = False
+        self._waiter: Optional[asyncio.Future] = None
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def push(self, event: FeedEvent) -> bool:
+        if len(self.queue) >= self.maxsize:
+            self.queue.clear()
+            self.overflowed = True
+            self._wake()
+            return False
+        self.queue.append(event)
+        self._wake()
+        return True
+
+    def overflow(self):
+        self.queue.clear()
+        self.overflowed = True
+        self._wake()
+
+    def ping(self):
+        if not self.queue:
+            self.heartbeat = True
+            self._wake()
+
+    async def wait(self):
+        if self.queue or self.overflowed or self.heartbeat:
+            return
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def drain(self) -> List[FeedEvent]:
+        events = list(self.queue)
+        self.queue.clear()
+        return events
+
+# Distribuição local (no worker): conexões por projeto e os últimos eventos de cada
+# projeto para a retomada. Tudo roda no event loop do worker, sem locks.
+class FeedHub:
+    def __init__(self, queue_size: int, history_size: int, history_projects: int):
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.history_projects = history_projects
+        self.subscribers: Dict[int, Set[Subscription]] = {}
+        self.history: "OrderedDict[int, Deque[FeedEvent]]" = OrderedDict()
+        self.events = 0
+        self.deliveries = 0
+        self.overflows = 0
+        self.resets = 0
+
+    def subscribe(self, project_id: int) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        self.subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self.subscribers.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.project_id]
+
+    def dispatch(self, event: FeedEvent):
+        self.events += 1
+        if event.seq is not None and self.history_size > 0:
+            history = self.history.get(event.project_id)
+            if history is None:
+                history = self.history[event.project_id] = deque(maxlen=self.history_size)
+                while len(self.history) > self.history_projects:
+                    self.history.popitem(last=False)
+            self.history.move_to_end(event.project_id)
+            history.append(event)
+        for subscription in self.subscribers.get(event.project_id, ()):
+            if subscription.push(event):
+                self.deliveries += 1
+            else:
+                self.overflows += 1
+
+    # Eventos depois de `after`, se o histórico ainda cobre esse ponto; None se não cobre
+    def replay(self, project_id: int, after: int) -> Optional[List[FeedEvent]]:
+        history = self.history.get(project_id, ())
+        for index, event in enumerate(history):
+            if event.prev == after:
+                return list(history)[index:]
+        return None
+
+    # Usado quando o broker reconecta: eventos podem ter sido perdidos no intervalo
+    def reset_all(self):
+        for subscribers in self.subscribers.values():
+            for subscription in subscribers:
+                subscription.overflow()
+                self.resets += 1
+        self.history.clear()
+
+    def ping_all(self):
+        for subscribers in self.subscribers.values():
+            for subscription in subscribers:
+                subscription.ping()
+
+    async def heartbeat(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.ping_all()
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self.subscribers),
+            "connections": sum(len(subscribers) for subscribers in self.subscribers.values()),
+            "queue_size": self.queue_size,
+            "history_size": self.history_size,
+            "history_projects": len(self.history),
+            "events": self.events,
+            "deliveries": self.deliveries,
+            "overflows": self.overflows,
+            "resets": self.resets,
+        }
+
+# Brokers entregam os eventos publicados a todos os workers (incluindo o próprio)
+class FeedBroker:
+    name = "base"
+
+    def __init__(self, hub: FeedHub):
+        self.hub = hub
+
+    async def start(self):
+        pass
+
+    async def publish(self, event: FeedEvent):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"broker": self.name}
+
+    async def close(self):
+        pass
+
+# Só o próprio worker: com vários workers cada cliente vê as alterações feitas no worker em que está conectado
+class MemoryBroker(FeedBroker):
+    name = "memory"
+
+    async def publish(self, event: FeedEvent):
+        self.hub.dispatch(event)
+
+# PUBLISH/SUBSCRIBE num servidor do protocolo do Redis, com o mesmo cliente RESP do cache.
+# Cada worker mantém uma conexão assinando o canal e reconecta com espera crescente;
+# depois de uma reconexão as conexões locais recebem um "reset".
+class RedisBroker(FeedBroker):
+    name = "redis"
+
+    def __init__(self, hub: FeedHub, url: str, channel: str, pool_size: int, timeout: float):
+        super().__init__(hub)
+        self.client = RedisBackend(url, pool_size, timeout)
+        self.channel = channel
+        self.timeout = timeout
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+        self.reconnects = 0
+
+    async def start(self):
+        self._listener = asyncio.create_task(self._listen())
+        # Não bloqueia a subida se o servidor estiver fora: o listener segue tentando
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), self.timeout * 4)
+        except asyncio.TimeoutError:
+            logger.warning("feed broker not subscribed yet (%s:%s)", self.client.host, self.client.port)
+
+    async def _listen(self):
+        delay = 0.1
+        first = True
+        while True:
+            conn: Optional[RESPConnection] = None
+            try:
+                conn = await asyncio.wait_for(self.client.connect(), self.timeout)
+                await asyncio.wait_for(conn.execute("SUBSCRIBE", self.channel), self.timeout)
+                if not first:
+                    self.reconnects += 1
+                    self.hub.reset_all()
+                first, delay = False, 0.1
+                self._subscribed.set()
+                while True:
+                    reply = await conn.read_reply()
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        self.received += 1
+                        try:
+                            self.hub.dispatch(FeedEvent.decode(reply[2]))
+                        except (TypeError, ValueError) as error:
+                            logger.warning("invalid feed message: %r", error)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, CacheBackendError) as error:
+                self.errors += 1
+                self._subscribed.clear()
+                logger.warning("feed broker connection failed: %r", error)
+            finally:
+                if conn is not None:
+                    conn.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+    # Se o servidor estiver fora, entrega só neste worker: os outros percebem a lacuna
+    # (prev diferente do último id) no próximo evento e mandam "reset" aos clientes
+    async def publish(self, event: FeedEvent):
+        try:
+            await self.client.execute("PUBLISH", self.channel, event.encode())
+            self.published += 1
+        except CacheBackendError as error:
+            self.errors += 1
+            logger.warning("feed publish failed: %r", error)
+            self.hub.dispatch(event)
+
+    def stats(self) -> dict:
+        return {"broker": self.name, "host": self.client.host, "port": self.client.port, "channel": self.channel,
+                "subscribed": self._subscribed.is_set(), "published": self.published, "received": self.received,
+                "errors": self.errors, "reconnects": self.reconnects}
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.client.close()
+
+def build_feed_broker(hub: FeedHub, name: str, url: Optional[str], channel: str, pool_size: int, timeout: float) -> FeedBroker:
+    if name == "memory":
+        return MemoryBroker(hub)
+    if name == "redis":
+        if not url:
+            raise RuntimeError("FEED_BROKER=redis requires FEED_URL or CACHE_URL")
+        return RedisBroker(hub, url, channel, pool_size, timeout)
+    raise ValueError(f"Unknown feed broker: {name}")
+
+hub = FeedHub(settings.FEED_QUEUE_SIZE, settings.FEED_HISTORY_SIZE, settings.FEED_HISTORY_PROJECTS)
+broker = build_feed_broker(hub, settings.FEED_BROKER, settings.FEED_URL or settings.CACHE_URL, f"{settings.CACHE_PREFIX}:feed",
+                           settings.CACHE_POOL_SIZE, settings.CACHE_TIMEOUT_SECONDS)
+
+_heartbeat: Optional[asyncio.Task] = None
+
+async def start_feed():
+    global _heartbeat
+    await broker.start()
+    _heartbeat = asyncio.create_task(hub.heartbeat(settings.FEED_HEARTBEAT_SECONDS))
+
+async def close_feed():
+    global _heartbeat
+    if _heartbeat is not None:
+        _heartbeat.cancel()
+        try:
+            await _heartbeat
+        except asyncio.CancelledError:
+            pass
+        _heartbeat = None
+    await broker.close()
+
+# Chamado depois do commit, com a sequência retornada por dependencies.etags (cada alteração
+# soma 1, então prev é seq - 1 salvo quando informado); falhas do broker não derrubam a requisição
+async def publish(project_id: int, seq: Optional[int], type: str, data: Dict[str, Any], prev: Optional[int] = None):
+    if prev is None and seq is not None:
+        prev = seq - 1
+    await broker.publish(FeedEvent(project_id, seq, prev, type, data))
+
+def feed_stats() -> dict:
+    return {**hub.stats(), **broker.stats()}
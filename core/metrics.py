@@ -0,0 +1,30 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Sequence
+
+# Limites (em segundos) usados por padrão nos histogramas de latência
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # último bucket = +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.total, self.count
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip([*map(str, self.buckets), "+Inf"], counts):
+            cumulative += bucket_count
+            buckets[bound] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
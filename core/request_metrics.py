@@ -0,0 +1,175 @@
+import inspect
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.config import settings
+from core.metrics import Histogram
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Medições da requisição corrente (None quando a requisição não foi amostrada).
+# Os eventos do SQLAlchemy rodam no mesmo contexto da task da requisição.
+class RequestStats:
+    __slots__ = ("start", "statements", "db_time", "rows", "endpoint_end")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.endpoint_end: Optional[float] = None
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+class RouteMetrics:
+    def __init__(self):
+        self.sampled = 0
+        self.statements = 0
+        self.rows = 0
+        self.duration = Histogram()
+        self.db_time = Histogram()
+        self.serialization = Histogram()
+
+class RequestMetrics:
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def count(self, method: str, route: str, status_code: int):
+        key = (method, route, status_code)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+    def observe(self, method: str, route: str, stats: RequestStats, duration: float, serialization: float):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.sampled += 1
+        metrics.statements += stats.statements
+        metrics.rows += stats.rows
+        metrics.duration.observe(duration)
+        metrics.db_time.observe(stats.db_time)
+        metrics.serialization.observe(serialization)
+
+    # Formato texto de exposição do Prometheus
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("taskmanager_http_requests_total", "counter", "Requests handled, by route template and status code.")
+        for (method, route, status_code), count in sorted(self.requests.items()):
+            lines.append(f"taskmanager_http_requests_total{{{labels(method, route)},status=\"{status_code}\"}} {count}")
+
+        family("taskmanager_http_sampled_requests_total", "counter", "Requests measured by the sampler.")
+        for (method, route), metrics in sorted(self.routes.items()):
+            lines.append(f"taskmanager_http_sampled_requests_total{{{labels(method, route)}}} {metrics.sampled}")
+
+        family("taskmanager_http_db_statements_total", "counter", "SQL statements executed by sampled requests.")
+        for (method, route), metrics in sorted(self.routes.items()):
+            lines.append(f"taskmanager_http_db_statements_total{{{labels(method, route)}}} {metrics.statements}")
+
+        family("taskmanager_http_db_rows_total", "counter", "Rows returned or affected, as reported by the driver, in sampled requests.")
+        for (method, route), metrics in sorted(self.routes.items()):
+            lines.append(f"taskmanager_http_db_rows_total{{{labels(method, route)}}} {metrics.rows}")
+
+        for name, attribute, help_text in (
+            ("taskmanager_http_request_duration_seconds", "duration", "Wall time of sampled requests."),
+            ("taskmanager_http_db_duration_seconds", "db_time", "Time spent executing SQL per sampled request."),
+            ("taskmanager_http_serialization_duration_seconds", "serialization", "Time from endpoint return to response start (validation and rendering)."),
+        ):
+            family(name, "histogram", help_text)
+            for (method, route), metrics in sorted(self.routes.items()):
+                snapshot = getattr(metrics, attribute).snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f"{name}_bucket{{{labels(method, route)},le=\"{bound}\"}} {count}")
+                lines.append(f"{name}_sum{{{labels(method, route)}}} {snapshot['sum']}")
+                lines.append(f"{name}_count{{{labels(method, route)}}} {snapshot['count']}")
+
+        return "\n".join(lines) + "\n"
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def labels(method: str, route: str) -> str:
+    return f"method=\"{method}\",route=\"{escape_label(route)}\""
+
+request_metrics = RequestMetrics()
+
+# Template da rota resolvida pelo roteador (ex.: /projects/{project_id}), evitando um label por id
+def route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    return route.path if isinstance(route, APIRoute) else UNMATCHED_ROUTE
+
+def server_timing(stats: RequestStats, app_time: float, serialization: float) -> str:
+    return (f"app;dur={app_time * 1000:.2f}, "
+            f"db;dur={stats.db_time * 1000:.2f};desc=\"{stats.statements} queries\", "
+            f"serialize;dur={serialization * 1000:.2f}")
+
+# Middleware ASGI puro (sem BaseHTTPMiddleware, que roda o app em outra task e custa mais).
+# Só as requisições amostradas medem tempo e SQL; a contagem por rota/status é sempre feita.
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, sample_rate: float = settings.METRICS_SAMPLE_RATE, server_timing: bool = settings.SERVER_TIMING_ENABLED):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats() if self.sample_rate > 0 and random.random() < self.sample_rate else None
+        token = current_request.set(stats)
+        status_code = 500
+        serialization = 0.0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, serialization
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if stats is not None:
+                    response_start = time.perf_counter()
+                    if stats.endpoint_end is not None:
+                        serialization = response_start - stats.endpoint_end
+                    if self.server_timing:
+                        MutableHeaders(scope=message).append("Server-Timing", server_timing(stats, response_start - stats.start, serialization))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = route_path(scope)
+            request_metrics.count(scope["method"], route, status_code)
+            if stats is not None:
+                request_metrics.observe(scope["method"], route, stats, time.perf_counter() - stats.start, serialization)
+
+# Marca o fim do endpoint para separar o tempo de serialização (validação do
+# response_model + renderização) do tempo do handler. A assinatura é resolvida
+# no módulo original do endpoint, então anotações em string continuam funcionando.
+def mark_endpoint_end(endpoint: Callable) -> Callable:
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            stats = current_request.get()
+            if stats is not None:
+                stats.endpoint_end = time.perf_counter()
+
+    wrapper.__signature__ = inspect.signature(endpoint, eval_str=True)  # type: ignore
+    return wrapper
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, mark_endpoint_end(endpoint), **kwargs)
@@ -1,8 +1,16 @@
-from core.config import pwd_context, settings
-from typing import Optional
+from core.config import settings
+from core.metrics import Histogram
+from typing import List, Optional
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from jose import JWTError, jwt
+from passlib.context import CryptContext
+import asyncio
+import time
 
+# Contexto de hash único (rotas, login, scripts e benchmarks usam estas funções)
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -10,6 +18,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+class HashingStats:
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+        self._lock = Lock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {"workers": settings.PASSWORD_HASH_WORKERS, "queued": self.queued, "running": self.running, "completed": self.completed}
+        data["wait_time_seconds"] = self.wait_time.snapshot()
+        data["run_time_seconds"] = self.run_time.snapshot()
+        return data
+
+hashing_stats = HashingStats()
+
+# O pbkdf2 do hashlib libera o GIL, então threads bastam para tirar o custo do event loop;
+# o tamanho do pool limita quantos hashes rodam ao mesmo tempo e o resto espera na fila
+hashing_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+def _run_measured(func, queued_at: float, *args):
+    started = time.perf_counter()
+    with hashing_stats._lock:
+        hashing_stats.queued -= 1
+        hashing_stats.running += 1
+    hashing_stats.wait_time.observe(started - queued_at)
+    try:
+        return func(*args)
+    finally:
+        hashing_stats.run_time.observe(time.perf_counter() - started)
+        with hashing_stats._lock:
+            hashing_stats.running -= 1
+            hashing_stats.completed += 1
+
+async def _run_in_hashing_pool(func, *args):
+    with hashing_stats._lock:
+        hashing_stats.queued += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hashing_executor, _run_measured, func, time.perf_counter(), *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hashing_pool(verify_password, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hashing_pool(get_password_hash, password)
+
+# Hash em lote (importação de usuários): no máximo PASSWORD_HASH_WORKERS senhas do lote ficam no pool
+# ao mesmo tempo, então um login que chega no meio da importação espera um hash, não o lote inteiro
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await hash_password_async(password)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords))
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     
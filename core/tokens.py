@@ -0,0 +1,120 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Callable, Dict
+from jose import JWTError, jwt
+from core.cache import TTLCache
+from core.config import settings
+
+JWTBackend = Callable[[str], Dict[str, Any]]
+
+HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+def b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+def jose_backend(secret_key: str, algorithm: str) -> JWTBackend:
+    def decode(token: str) -> Dict[str, Any]:
+        return jwt.decode(token, secret_key, algorithms=[algorithm])
+    return decode
+
+# HS256/384/512 com a chave já convertida em bytes: só hmac + json da stdlib.
+# Recusa qualquer "alg" diferente do configurado (sem "none" nem troca de algoritmo).
+def hmac_backend(secret_key: str, algorithm: str) -> JWTBackend:
+    if algorithm not in HMAC_DIGESTS:
+        raise ValueError(f"JWT backend 'hmac' does not support {algorithm}")
+    key = secret_key.encode()
+    digest = HMAC_DIGESTS[algorithm]
+
+    def decode(token: str) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            if not header_segment or not payload_segment or "." in payload_segment:
+                raise JWTError("Not enough segments")
+            header = json.loads(b64url_decode(header_segment))
+            if not isinstance(header, dict) or header.get("alg") != algorithm:
+                raise JWTError("The specified alg value is not allowed")
+            expected = hmac.new(key, signing_input.encode(), digest).digest()
+            if not hmac.compare_digest(expected, b64url_decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(b64url_decode(payload_segment))
+        except (ValueError, TypeError, UnicodeError) as error:
+            raise JWTError("Invalid token") from error
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+
+        now = time.time()
+        for claim in ("exp", "nbf"):
+            if claim in claims and (isinstance(claims[claim], bool) or not isinstance(claims[claim], (int, float))):
+                raise JWTError(f"Invalid {claim} claim")
+        if "exp" in claims and claims["exp"] < now:
+            raise JWTError("Signature has expired.")
+        if "nbf" in claims and claims["nbf"] > now:
+            raise JWTError("The token is not yet valid (nbf)")
+        return claims
+    return decode
+
+# PyJWT é opcional: só é importado quando escolhido em JWT_BACKEND
+def pyjwt_backend(secret_key: str, algorithm: str) -> JWTBackend:
+    try:
+        import jwt as pyjwt
+    except ImportError as error:
+        raise RuntimeError("JWT_BACKEND=pyjwt requires the PyJWT package") from error
+
+    def decode(token: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(token, secret_key, algorithms=[algorithm], options={"verify_aud": False})
+        except pyjwt.PyJWTError as error:
+            raise JWTError(str(error)) from error
+    return decode
+
+JWT_BACKENDS: Dict[str, Callable[[str, str], JWTBackend]] = {
+    "jose": jose_backend,
+    "hmac": hmac_backend,
+    "pyjwt": pyjwt_backend,
+}
+
+# "auto" usa o backend hmac para os algoritmos HS* e o python-jose para os demais
+def build_backend(name: str, secret_key: str, algorithm: str) -> JWTBackend:
+    if name == "auto":
+        name = "hmac" if algorithm in HMAC_DIGESTS else "jose"
+    if name not in JWT_BACKENDS:
+        raise ValueError(f"Unknown JWT backend: {name}")
+    return JWT_BACKENDS[name](secret_key, algorithm)
+
+# Claims já verificados, indexados pela assinatura do token e guardados só pelo tempo
+# de vida restante (exp). O token inteiro é comparado no acerto, e o exp é conferido
+# de novo contra o relógio, então um token expirado nunca sai do cache.
+# Tokens sem exp não são guardados. Erros de verificação sempre propagam JWTError.
+class TokenVerifier:
+    def __init__(self, backend: JWTBackend, cache: TTLCache):
+        self.backend = backend
+        self.cache = cache
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        signature = token.rpartition(".")[2]
+        cached = self.cache.get(signature)
+        if cached is not None:
+            cached_token, claims = cached
+            if claims["exp"] < time.time():
+                self.cache.delete(signature)
+            elif cached_token == token:
+                return dict(claims)
+
+        claims = self.backend(token)
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+            remaining = exp - time.time()
+            if remaining > 0:
+                self.cache.set(signature, (token, dict(claims)), ttl=min(remaining, self.cache.ttl))
+        return claims
+
+# O TTL padrão do cache é só um teto (o maior tempo de vida emitido, o do refresh token)
+token_cache = TTLCache("tokens", maxsize=settings.JWT_CACHE_MAX_SIZE, ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+token_verifier = TokenVerifier(build_backend(settings.JWT_BACKEND, settings.SECRET_KEY, settings.ALGORITHM), token_cache)
+
+def decode_token(token: str) -> Dict[str, Any]:
+    return token_verifier.decode(token)
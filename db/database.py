@@ -1,9 +1,74 @@
-from sqlmodel import SQLModel, Field, create_engine, Session, Column, Integer, String
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from core.config import settings
+from db.pool import InstrumentedQueuePool, register_pool_events
+from db.query_events import register_query_events
+import db.search_index  # noqa: F401  (índices da busca textual no metadata, ver db/search_index.py)
 from typing import Optional
-import dotenv, os
 
-dotenv.load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL") or os.environ["DATABASE_URL"]
-engine = create_engine(DATABASE_URL)
-SQLModel.metadata.create_all(engine)
+# Drivers assíncronos usados no lugar dos drivers síncronos do DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
+# O DATABASE_URL continua no formato síncrono (usado pelo Alembic)
+def get_async_url(url: str) -> str:
+    sa_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(sa_url.drivername, sa_url.drivername)
+    return sa_url.set(drivername=drivername).render_as_string(hide_password=False)
+
+def get_pool_options(url: str) -> dict:
+    sa_url = make_url(url)
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # SQLite em memória usa StaticPool (uma única conexão), sem dimensionamento
+    if sa_url.get_backend_name() == "sqlite" and sa_url.database in (None, "", ":memory:"):
+        return options
+    options.update({
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    })
+    return options
+
+# O engine é criado no primeiro uso (no lifespan, depois do fork de cada worker do gunicorn),
+# não no import: importar a aplicação não abre conexões e o processo master do --preload não
+# compartilha pool com os workers
+_engine: Optional[AsyncEngine] = None
+
+# expire_on_commit=False: atributos não podem ser recarregados de forma lazy fora do greenlet
+_sessionmaker = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        if not settings.DATABASE_URL:
+            raise KeyError("DATABASE_URL environment variable not set")
+        async_url = get_async_url(settings.DATABASE_URL)
+        _engine = create_async_engine(async_url, **get_pool_options(async_url))
+        register_pool_events(_engine.sync_engine.pool)
+        register_query_events(_engine)
+        _sessionmaker.configure(bind=_engine)
+    return _engine
+
+def async_session() -> AsyncSession:
+    get_engine()
+    return _sessionmaker()
+
+async def dispose_engine():
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+# O schema é das migrations (alembic upgrade head); create_all fica para benchmarks e bancos descartáveis
+async def create_db_and_tables():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
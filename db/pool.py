@@ -0,0 +1,55 @@
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from core.metrics import Histogram
+
+class PoolStats:
+    def __init__(self):
+        self.wait_time = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def snapshot(self, pool: Pool) -> dict:
+        data = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "wait_time_seconds": self.wait_time.snapshot(),
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return data
+
+pool_stats = PoolStats()
+
+# Mede o tempo até obter uma conexão (espera na fila + criação + pre-ping)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.wait_time.observe(time.perf_counter() - start)
+        pool_stats.checkouts += 1
+        return connection
+
+def register_pool_events(pool: Pool):
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_stats.connects += 1
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.invalidations += 1
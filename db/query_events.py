@@ -0,0 +1,72 @@
+import asyncio
+import time
+from typing import Any, Dict, Set
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from core.diagnostics import SLOW_QUERY, current_queries, diagnostics, format_parameters
+from core.request_metrics import current_request, route_path
+
+# EXPLAINs de queries lentas rodam em paralelo à requisição, limitados para não esgotar o pool
+MAX_PENDING_EXPLAINS = 2
+pending_explains: Set[asyncio.Task] = set()
+
+async def explain_slow_query(engine: AsyncEngine, finding: Dict[str, Any], statement: str, parameters: Any):
+    # A task herda o contexto da requisição: o EXPLAIN não entra nas métricas nem no detector
+    current_request.set(None)
+    current_queries.set(None)
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(prefix + statement, parameters, execution_options={"diagnostics": False})
+            finding["explain"] = [str(row[-1]) for row in result]
+    except Exception as error:
+        finding["explain_error"] = repr(error)
+    diagnostics.record(finding)
+
+def report_slow_query(engine: AsyncEngine, statement: str, parameters: Any, executemany: bool, duration: float):
+    queries = current_queries.get()
+    finding = {
+        "type": SLOW_QUERY,
+        "route": route_path(queries.scope) if queries is not None else None,
+        "duration_ms": round(duration * 1000, 3),
+        "statement": statement,
+        "parameters": format_parameters(statement, parameters, executemany),
+    }
+    # EXPLAIN em conexão separada: um erro não aborta a transação da requisição
+    is_select = statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    if diagnostics.explain and is_select and not executemany and len(pending_explains) < MAX_PENDING_EXPLAINS:
+        task = asyncio.get_running_loop().create_task(explain_slow_query(engine, finding, statement, parameters))
+        pending_explains.add(task)
+        task.add_done_callback(pending_explains.discard)
+    else:
+        diagnostics.record(finding)
+
+# Contabiliza cada statement na requisição corrente (quando amostrada): quantidade,
+# tempo no banco e linhas. rowcount vem do driver: o asyncpg informa SELECTs, o SQLite só DML.
+# Com DB_DIAGNOSTICS_ENABLED também alimenta o log de queries lentas e o detector de N+1.
+def register_query_events(engine: AsyncEngine):
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_request.get() is not None or (diagnostics.enabled and context.execution_options.get("diagnostics", True)):
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += duration
+            if cursor.rowcount > 0:
+                stats.rows += cursor.rowcount
+
+        if diagnostics.enabled and context.execution_options.get("diagnostics", True):
+            queries = current_queries.get()
+            if queries is not None:
+                queries.add(statement, parameters)
+            if duration * 1000 >= diagnostics.slow_query_ms:
+                report_slow_query(engine, statement, parameters, executemany, duration)
@@ -0,0 +1,50 @@
+from typing import Any, List
+from sqlalchemy import DDL, Index, event, func, text
+import sqlalchemy.dialects.postgresql  # noqa: F401  (registra to_tsvector/to_tsquery do postgresql antes de montar o índice)
+from models.models import Project, Task
+
+# Índices da busca textual (GET /search) sobre título + descrição de tasks e projetos.
+#   postgresql: GIN sobre to_tsvector('simple', ...) como índice de expressão (sem coluna nova).
+#               A consulta usa a mesma expressão, só com literais: com parâmetros o planner não reconhece o índice.
+#   sqlite:     tabelas FTS5 de conteúdo externo (task_fts, project_fts) mantidas por triggers,
+#               com índice de prefixos de 2 e 3 letras (o termo parcial mais curto e mais caro).
+# Nos dois casos é o banco que atualiza o índice em qualquer escrita (rotas unitárias, em lote,
+# cascades e scripts), então as rotas de criação/edição não precisam fazer nada.
+# A migration b2e9d4a61f35 cria os mesmos objetos; o alembic/env.py os ignora no autogenerate.
+
+SEARCH_CONFIG = "simple"
+SEARCH_TABLES = ("task", "project")
+SEARCH_INDEXES = ("ix_task_search", "ix_project_search")
+
+def search_document(title: Any, description: Any) -> Any:
+    return func.coalesce(title, text("''")).op("||")(text("' '")).op("||")(func.coalesce(description, text("''")))
+
+def search_vector(title: Any, description: Any) -> Any:
+    return func.to_tsvector(text(f"'{SEARCH_CONFIG}'"), search_document(title, description))
+
+task_table = Task.__table__  # type: ignore
+project_table = Project.__table__  # type: ignore
+Index("ix_task_search", search_vector(task_table.c.title, task_table.c.description), postgresql_using="gin").ddl_if(dialect="postgresql")
+Index("ix_project_search", search_vector(project_table.c.title, project_table.c.description), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+def fts_create_statements(table: str) -> List[str]:
+    fts = fts_table(table)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(title, description, content='{table}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF title, description ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        f"INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    ]
+
+# create_all/drop_all (desenvolvimento, benchmarks) criam e removem as tabelas FTS junto com as tabelas
+for table in (task_table, project_table):
+    for statement in fts_create_statements(table.name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {fts_table(table.name)}").execute_if(dialect="sqlite"))
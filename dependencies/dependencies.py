@@ -1,21 +1,32 @@
-from sqlmodel import Session, select
-from db.database import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from db.database import async_session
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status, Header
 from models.models import User
-from jose import jwt, JWTError
+from jose import JWTError
+from core.tokens import decode_token
+from dependencies.sessions import RefreshClaims, session_id
 from core.config import settings
+from core.cache import Cache
 from models.models import Role
-from sqlalchemy.orm import selectinload
 import uuid
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_session():
-    with Session(engine) as session:
+# Guarda só as colunas do usuário (em JSON); cada requisição recebe uma instância nova, fora da sessão
+user_cache = Cache("users", ttl=settings.USER_CACHE_TTL_SECONDS, maxsize=settings.USER_CACHE_MAX_SIZE)
+
+async def invalidate_user(user_id: uuid.UUID):
+    await user_cache.invalidate(str(user_id))
+
+def user_from_cache(data: dict) -> User:
+    return User(id=uuid.UUID(data["id"]), name=data["name"], email=data["email"], role=Role(data["role"]))
+
+async def get_session():
+    async with async_session() as session:
         yield session
         
-async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -23,7 +34,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: Session
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise credentials_exception
@@ -35,21 +46,23 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: Session
     except ValueError:
         raise credentials_exception
     
-    user = session.get(User, user_uuid)
-    if not user or user is None:
+    async def load_user():
+        user = await session.get(User, user_uuid)
+        return user.model_dump(mode="json") if user else None
+
+    data = await user_cache.get_or_load(str(user_uuid), load_user)
+    if data is None:
         raise credentials_exception
-    
-    return user
+    return user_from_cache(data)
 
 async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != Role.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="The user does not have enough privileges")
     return current_user
 
-async def validate_refresh_token(
-    refresh_token: str = Header(..., alias="x-refresh-token"), 
-    session: Session = Depends(get_session)
-) -> User:
+# Só decodifica o refresh token: a sessão é conferida (e rotacionada ou revogada)
+# pela própria escrita em dependencies/sessions.py, sem uma leitura antes
+async def validate_refresh_token(refresh_token: str = Header(..., alias="x-refresh-token")) -> RefreshClaims:
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,13 +70,14 @@ async def validate_refresh_token(
     )
 
     try:
-        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token(refresh_token)
         
         if payload.get("scope") != "refresh":
             raise HTTPException(status_code=401, detail="Invalid token type")
 
         user_id_str = payload.get("sub")
-        if user_id_str is None:
+        jti = payload.get("jti")
+        if user_id_str is None or not isinstance(jti, str):
             raise credentials_exception
             
         user_uuid = uuid.UUID(user_id_str)
@@ -71,13 +85,4 @@ async def validate_refresh_token(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    statement = select(User).where(User.id == user_uuid).options(selectinload(User.private_data)) # type: ignore
-    user = session.exec(statement).first()
-
-    if not user or not user.private_data:
-        raise credentials_exception
-
-    if user.private_data.refresh_token != refresh_token:
-        raise HTTPException(status_code=401, detail="Refresh token revoked or invalid")
-
-    return user
\ No newline at end of file
+    return RefreshClaims(user_id=user_uuid, session_id=session_id(jti))
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Any, List, Optional, Tuple
+from fastapi import Response, status
+from sqlalchemy import or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.models import Project, ProjectUserLink, Task
+import uuid
+
+# Versões usadas nos ETags das leituras (GET /projects/{id}, /tasks e /task/{id}):
+#   Project.version:       o projeto e os participantes (ProjectRead)
+#   Project.tasks_version: qualquer task do projeto (listagem)
+#   Task.version:          a task (TaskRead)
+# Os incrementos são feitos pelo banco (version = version + 1) na mesma transação da
+# alteração, então duas escritas concorrentes nunca produzem a mesma versão.
+
+def weak_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+# Parâmetros da listagem entram no ETag como um resumo curto
+def params_digest(*params: Any) -> str:
+    return hashlib.blake2b(repr(params).encode(), digest_size=8).hexdigest()
+
+# Comparação fraca (RFC 9110): ignora o prefixo W/ dos dois lados
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+# Os incrementos retornam a sequência do projeto depois da alteração (version + tasks_version),
+# usada como id dos eventos do feed (core/feed.py); None se o projeto não existe
+project_seq = Project.version + Project.tasks_version
+
+async def bump_project(session: AsyncSession, project_id: int) -> Optional[int]:
+    statement = update(Project).where(Project.id == project_id).values(version=Project.version + 1)  # type: ignore
+    return (await session.exec(statement.returning(project_seq))).scalar_one_or_none()  # type: ignore
+
+async def bump_project_tasks(session: AsyncSession, project_id: int) -> Optional[int]:
+    statement = update(Project).where(Project.id == project_id).values(tasks_version=Project.tasks_version + 1)  # type: ignore
+    return (await session.exec(statement.returning(project_seq))).scalar_one_or_none()  # type: ignore
+
+# Nome/e-mail/papel do usuário aparecem como dono, participante e responsável:
+# muda a versão de todos os projetos e tasks em que ele aparece. Retorna (projeto, sequência)
+async def bump_user_references(session: AsyncSession, user_id: uuid.UUID) -> List[Tuple[int, int]]:
+    participating = select(ProjectUserLink.project_id).where(ProjectUserLink.user_id == user_id)
+    assigned = select(Task.project_id).where(Task.assigned_to_id == user_id)
+    owned = select(Project.id).where(Project.owner_id == user_id)
+    projects = await session.exec(update(Project)  # type: ignore
+                                  .where(or_(Project.owner_id == user_id, Project.id.in_(participating), Project.id.in_(assigned)))  # type: ignore
+                                  .values(version=Project.version + 1, tasks_version=Project.tasks_version + 1)
+                                  .returning(Project.id, project_seq))
+    bumped = [(project_id, seq) for project_id, seq in projects.all()]
+    await session.exec(update(Task)  # type: ignore
+                       .where(or_(Task.assigned_to_id == user_id, Task.project_id.in_(owned)))  # type: ignore
+                       .values(version=Task.version + 1))
+    return bumped
@@ -0,0 +1,83 @@
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from fastapi.responses import StreamingResponse
+from core.config import settings
+from core.feed import FeedEvent, FeedHub, reset_frame
+
+# Resposta do GET /projects/{project_id}/events (Server-Sent Events). O próprio gerador assina
+# o projeto e só depois lê a sequência atual (load_seq), então nenhum evento publicado depois
+# dessa leitura fica de fora; eventos repetidos (histórico + fila) são descartados pelo id.
+# Assinar dentro do gerador garante o unsubscribe no finally: um stream que nunca começa
+# (cliente desconectou antes do primeiro byte) também nunca chega a assinar.
+
+def ready_frame(seq: int) -> bytes:
+    return f'id: {seq}\nevent: ready\ndata: {{"seq":{seq}}}\n\n'.encode()
+
+def is_last_event(event: FeedEvent, user_id: Optional[uuid.UUID]) -> bool:
+    if event.type == "project.deleted":
+        return True
+    if user_id is None:
+        return False
+    if event.type == "members.removed":
+        return str(user_id) in event.data["user_ids"]
+    return event.type in ("member.removed", "user.deleted") and event.data.get("user_id") == str(user_id)
+
+async def stream_events(hub: FeedHub, project_id: int, load_seq: Callable[[], Awaitable[Optional[int]]],
+                        last_event_id: Optional[int], closes_for: Optional[uuid.UUID]) -> AsyncIterator[bytes]:
+    subscription = hub.subscribe(project_id)
+    try:
+        current_seq = await load_seq()
+        if current_seq is None:
+            # Projeto excluído depois da checagem de acesso da rota
+            return
+        chunks: List[bytes] = [f"retry: {settings.FEED_RETRY_MS}\n\n".encode()]
+        last: Optional[int] = current_seq
+        if last_event_id is None:
+            chunks.append(ready_frame(current_seq))
+        elif last_event_id != current_seq:
+            replayed = hub.replay(subscription.project_id, last_event_id) if last_event_id < current_seq else None
+            if replayed is None:
+                # O histórico deste worker não cobre o ponto pedido: o cliente recarrega a lista
+                chunks.append(f"id: {current_seq}\n".encode() + reset_frame(current_seq))
+            else:
+                chunks += [event.frame() for event in replayed]
+                last = replayed[-1].seq
+        yield b"".join(chunks)
+
+        while True:
+            await subscription.wait()
+            if subscription.heartbeat:
+                subscription.heartbeat = False
+                if not subscription.queue and not subscription.overflowed:
+                    yield b": ping\n\n"
+                    continue
+            chunks = []
+            if subscription.overflowed:
+                # A conexão não acompanhou (ou o broker reconectou): eventos foram descartados
+                subscription.overflowed = False
+                chunks.append(reset_frame(None))
+                last = None
+            for event in subscription.drain():
+                if event.seq is not None and last is not None:
+                    if event.seq <= last:
+                        continue
+                    if event.prev != last:
+                        chunks.append(reset_frame(event.prev))
+                chunks.append(event.frame())
+                if event.seq is not None:
+                    last = event.seq
+                if is_last_event(event, closes_for):
+                    yield b"".join(chunks)
+                    return
+            if chunks:
+                yield b"".join(chunks)
+    finally:
+        hub.unsubscribe(subscription)
+
+def events_response(hub: FeedHub, project_id: int, load_seq: Callable[[], Awaitable[Optional[int]]],
+                    last_event_id: Optional[int], closes_for: Optional[uuid.UUID]) -> StreamingResponse:
+    return StreamingResponse(
+        stream_events(hub, project_id, load_seq, last_event_id, closes_for),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
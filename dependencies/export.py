@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+from fastapi.responses import StreamingResponse
+from db.database import async_session
+
+EXPORT_BATCH_SIZE = 1000
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+def export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+# A resposta continua sendo enviada depois que o endpoint retorna, então o gerador
+# abre a própria sessão em vez de usar a do get_session.
+# yield_per liga stream_results (cursor no servidor no asyncpg) e entrega as linhas
+# em lotes de tuplas, sem montar objetos ORM: a memória não cresce com o número de linhas.
+async def stream_rows(statement: Any, columns: Sequence[str], export_format: ExportFormat) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == ExportFormat.CSV:
+        writer.writerow(columns)
+
+    async with async_session() as session:
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            for row in rows:
+                values = [export_value(value) for value in row]
+                if export_format == ExportFormat.CSV:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_response(statement: Any, columns: Sequence[str], export_format: ExportFormat, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(statement, columns, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
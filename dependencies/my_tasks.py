@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import exists
+from sqlmodel import or_, select
+from dependencies.serialization import Owner, user_columns, user_dict
+from models.models import Project, ProjectUserLink, Role, StatusTask, Task, UrgencyTask, User
+
+# GET /me/tasks: as tasks atribuídas ao usuário em todos os projetos numa única consulta pelo
+# índice de Task.assigned_to_id, com projeto e dono no mesmo SELECT (sem consulta de
+# participação por projeto). Quem saiu de um projeto não vê mais as tasks dele que ainda estão
+# atribuídas a si (EXISTS pela PK de ProjectUserLink); admins veem todas, como no GET das tasks.
+def my_tasks_statement(user: User, status_task: Optional[StatusTask], urgency: Optional[UrgencyTask]) -> Any:
+    statement = (select(Task.id, Task.title, Task.description, Task.status, Task.urgency,  # type: ignore
+                        Project.id.label("project_id"), Project.title.label("project_title"),  # type: ignore
+                        *user_columns(Owner, "owner"))
+                 .select_from(Task)
+                 .join(Project, Task.project_id == Project.id)  # type: ignore
+                 .join(Owner, Project.owner_id == Owner.id)  # type: ignore
+                 .where(Task.assigned_to_id == user.id))
+    if user.role != Role.ADMIN:
+        is_member = exists().where(ProjectUserLink.project_id == Task.project_id, ProjectUserLink.user_id == user.id)
+        statement = statement.where(or_(Project.owner_id == user.id, is_member))
+    if status_task:
+        statement = statement.where(Task.status == status_task)
+    if urgency:
+        statement = statement.where(Task.urgency == urgency)
+    return statement
+
+# Agrupa a página (ordenada por Task.id) numa passada, na ordem em que cada projeto aparece.
+# O cursor é o id da task, então um projeto pode voltar a aparecer na página seguinte
+def group_by_project(rows: Sequence[Any]) -> List[dict]:
+    groups: Dict[int, dict] = {}
+    for (id, title, description, status, urgency, project_id, project_title,
+         owner_name, owner_email, owner_role, owner_id) in rows:
+        group = groups.get(project_id)
+        if group is None:
+            group = groups[project_id] = {
+                "project": {"id": project_id, "title": project_title,
+                            "owner": user_dict(owner_name, owner_email, owner_role, owner_id)},
+                "tasks": [],
+            }
+        group["tasks"].append({"id": id, "title": title, "description": description, "status": status, "urgency": urgency})
+    return list(groups.values())
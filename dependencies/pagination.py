@@ -0,0 +1,21 @@
+from fastapi import Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Any, Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Paginação por keyset: WHERE id > after ORDER BY id LIMIT n usa o índice da chave,
+# então o custo de uma página não depende de quão fundo o cliente está na lista.
+# O corpo continua sendo a lista; o cursor da próxima página vai no header X-Next-Cursor.
+async def paginate(session: AsyncSession, statement: Any, id_column: Any, response: Response, limit: int, after: Optional[Any] = None) -> list:
+    if after is not None:
+        statement = statement.where(id_column > after)
+    statement = statement.order_by(id_column).limit(limit + 1)
+    rows = list((await session.exec(statement)).all())
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(getattr(rows[-1], id_column.key))
+    return rows
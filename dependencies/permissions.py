@@ -0,0 +1,71 @@
+from fastapi import Depends, HTTPException, status
+from sqlmodel import select, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional, Tuple
+from core.cache import Cache
+from core.config import settings
+from dependencies.dependencies import get_session, get_current_user
+from models.models import Project, ProjectRole, ProjectUserLink, Role, User
+import uuid
+
+# "project_id:user_id" -> [owner_id, project_role]; project_role None = não participa.
+# As entradas de um projeto ficam no grupo project_id, invalidado de uma vez ao excluir o projeto.
+membership_cache = Cache("memberships", ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS, maxsize=settings.MEMBERSHIP_CACHE_MAX_SIZE)
+# project_id -> ProjectRead em JSON (GET /projects/{project_id})
+project_cache = Cache("projects", ttl=settings.PROJECT_CACHE_TTL_SECONDS, maxsize=settings.PROJECT_CACHE_MAX_SIZE)
+
+class ProjectAccess:
+    def __init__(self, project_id: int, user: User, owner_id: Optional[uuid.UUID], project_role: Optional[ProjectRole]):
+        self.project_id = project_id
+        self.owner_id = owner_id
+        self.project_role = project_role
+        self.is_admin = user.role == Role.ADMIN
+        self.is_owner = owner_id == user.id
+
+    @property
+    def is_participant(self) -> bool:
+        return self.project_role is not None
+
+    @property
+    def is_manager(self) -> bool:
+        return self.project_role == ProjectRole.MANAGER
+
+    @property
+    def has_full_access(self) -> bool:
+        return self.is_admin or self.is_owner or self.is_manager
+
+# Dono do projeto e papel do usuário numa única consulta (ou nenhuma, se estiver em cache).
+# Retorna None quando o projeto não existe.
+async def resolve_membership(session: AsyncSession, project_id: int, user_id: uuid.UUID) -> Optional[Tuple[Optional[uuid.UUID], Optional[ProjectRole]]]:
+    async def load_membership():
+        statement = (select(Project.owner_id, ProjectUserLink.project_role)
+                     .select_from(Project)
+                     .join(ProjectUserLink, and_(ProjectUserLink.project_id == Project.id, ProjectUserLink.user_id == user_id), isouter=True)
+                     .where(Project.id == project_id))
+        row = (await session.exec(statement)).first()
+        if row is None:
+            return None
+        return [str(row[0]) if row[0] else None, row[1].value if row[1] else None]
+
+    membership = await membership_cache.get_or_load(f"{project_id}:{user_id}", load_membership, group=str(project_id))
+    if membership is None:
+        return None
+    owner_id, project_role = membership
+    return (uuid.UUID(owner_id) if owner_id else None, ProjectRole(project_role) if project_role else None)
+
+# Mudança de participantes também muda a leitura do projeto
+# O cache de projetos é indexado por "{project_id}:{Project.version}": uma versão nova já
+# não encontra a entrada antiga; o grupo só descarta as versões que ficaram para trás
+async def invalidate_membership(project_id: int, user_id: uuid.UUID):
+    await membership_cache.invalidate(f"{project_id}:{user_id}")
+    await project_cache.invalidate_group(str(project_id))
+
+async def invalidate_project(project_id: int):
+    await membership_cache.invalidate_group(str(project_id))
+    await project_cache.invalidate_group(str(project_id))
+
+async def get_project_access(project_id: int, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)) -> ProjectAccess:
+    membership = await resolve_membership(session, project_id, current_user.id)
+    if membership is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    return ProjectAccess(project_id, current_user, *membership)
@@ -0,0 +1,72 @@
+import re
+from typing import Any, List, Optional
+from fastapi import Response
+from sqlalchemy import column, desc, func, literal_column, select, table, text, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import settings
+from db.search_index import SEARCH_CONFIG, fts_table, search_vector
+from dependencies.pagination import NEXT_CURSOR_HEADER
+from models.models import Project, ProjectUserLink, Role, SearchKind, Task, User
+
+MAX_TERMS = 8
+# Só letras e dígitos: nada da sintaxe do tsquery/FTS5 chega ao banco vindo do usuário
+TERM_PATTERN = re.compile(r"[^\W_]+")
+
+def search_terms(q: str) -> List[str]:
+    return TERM_PATTERN.findall(q.lower())[:MAX_TERMS]
+
+# Todos os termos precisam aparecer; o último vale como prefixo ("relat" encontra "relatório"),
+# como numa busca enquanto se digita. Prefixo em todos os termos obrigaria o índice a juntar as
+# listas de todas as palavras com cada prefixo
+def postgres_query(terms: List[str]) -> str:
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+def sqlite_query(terms: List[str]) -> str:
+    return " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+# Ocorrências de um tipo, já com o rank (maior = mais relevante) e limitadas a `candidates`:
+# o índice encontra as linhas e só essas são ranqueadas, então o custo não cresce com a tabela
+def kind_candidates(dialect: str, kind: SearchKind, terms: List[str], visible_projects: Optional[Any], candidates: int) -> Any:
+    model: Any = Task if kind == SearchKind.TASK else Project
+    project_id = Task.project_id if kind == SearchKind.TASK else Project.id
+    columns = [literal_column(f"'{kind.value}'").label("kind"), model.id.label("id"), project_id.label("project_id"),
+               model.title.label("title"), model.description.label("description")]
+    if dialect == "postgresql":
+        vector = search_vector(model.title, model.description)
+        query = func.to_tsquery(text(f"'{SEARCH_CONFIG}'"), postgres_query(terms))
+        statement = select(*columns, func.ts_rank(vector, query).label("rank")).where(vector.op("@@")(query))
+    else:
+        fts = fts_table(model.__tablename__)
+        fts_rows = table(fts, column("rowid"))
+        # bm25 é menor para os mais relevantes
+        statement = (select(*columns, (-func.bm25(literal_column(fts))).label("rank"))
+                     .select_from(model).join(fts_rows, fts_rows.c.rowid == model.id)
+                     .where(literal_column(fts).op("MATCH")(sqlite_query(terms))))
+    if visible_projects is not None:
+        statement = statement.where(project_id.in_(visible_projects))  # type: ignore
+    return statement.limit(candidates).subquery()
+
+# Escopo: projetos em que o usuário participa (ProjectUserLink, o dono inclusive); admins veem todos
+def search_statement(dialect: str, user: User, terms: List[str], kind: Optional[SearchKind], candidates: int) -> Any:
+    visible_projects = None
+    if user.role != Role.ADMIN:
+        visible_projects = select(ProjectUserLink.project_id).where(ProjectUserLink.user_id == user.id)
+    parts = [select(*kind_candidates(dialect, item, terms, visible_projects, candidates).c)
+             for item in ([kind] if kind else list(SearchKind))]
+    statement = union_all(*parts) if len(parts) > 1 else parts[0]
+    return statement.order_by(desc("rank"), "kind", "id")
+
+# O resultado é ranqueado, então o cursor (X-Next-Cursor) é a posição na lista; como cada
+# consulta ranqueia no máximo SEARCH_MAX_CANDIDATES ocorrências por tipo, o deslocamento é limitado
+async def search(session: AsyncSession, user: User, q: str, kind: Optional[SearchKind], response: Response,
+                 limit: int, after: Optional[int] = None) -> List[dict]:
+    terms = search_terms(q)
+    if not terms:
+        return []
+    offset = after or 0
+    statement = search_statement(session.bind.dialect.name, user, terms, kind, settings.SEARCH_MAX_CANDIDATES)
+    rows = [dict(row._mapping) for row in (await session.exec(statement.offset(offset).limit(limit + 1))).all()]  # type: ignore
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(offset + limit)
+    return rows
@@ -0,0 +1,79 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+from models.models import Project, ProjectUserLink, Task, User
+
+# Serialização rápida das listas (FAST_LIST_SERIALIZATION): as colunas vêm como tuplas
+# (sem objetos ORM), viram dicts no formato dos schemas de leitura e o JSON é gerado uma
+# vez pelo pydantic-core (UUID e enums incluídos). O endpoint devolve um Response pronto,
+# então o FastAPI não valida a lista de novo contra o response_model, que continua no
+# decorator e mantém o OpenAPI igual.
+# Sem essa validação, dados que o response_model recusaria (ex.: description nula)
+# saem como null em vez de erro 500.
+
+Owner = aliased(User, name="owner")
+Assignee = aliased(User, name="assignee")
+
+# Mesma ordem de campos do UserRead
+def user_columns(user: Any, prefix: str) -> list:
+    return [user.name.label(f"{prefix}_name"), user.email.label(f"{prefix}_email"),
+            user.role.label(f"{prefix}_role"), user.id.label(f"{prefix}_id")]
+
+def user_dict(name: str, email: str, role: Any, id: Any) -> dict:
+    return {"name": name, "email": email, "role": role, "id": id}
+
+# TaskRead: projeto e dono no mesmo SELECT, responsável via LEFT JOIN
+def task_list_statement() -> Any:
+    return (select(Task.id, Task.title, Task.description, Task.status, Task.urgency,  # type: ignore
+                   Project.id.label("project_id"), Project.title.label("project_title"),  # type: ignore
+                   *user_columns(Owner, "owner"), *user_columns(Assignee, "assigned_to"))
+            .select_from(Task)
+            .join(Project, Task.project_id == Project.id)  # type: ignore
+            .join(Owner, Project.owner_id == Owner.id)  # type: ignore
+            .outerjoin(Assignee, Task.assigned_to_id == Assignee.id))  # type: ignore
+
+def task_dicts(rows: Sequence[Any]) -> List[dict]:
+    tasks = []
+    for (id, title, description, status, urgency, project_id, project_title,
+         owner_name, owner_email, owner_role, owner_id, *assigned_to) in rows:
+        tasks.append({
+            "id": id, "title": title, "description": description, "status": status, "urgency": urgency,
+            "project": {"id": project_id, "title": project_title,
+                        "owner": user_dict(owner_name, owner_email, owner_role, owner_id)},
+            "assigned_to": user_dict(*assigned_to) if assigned_to[3] is not None else None,
+        })
+    return tasks
+
+# ProjectRead: projetos e dono num SELECT; participantes num segundo, pelos ids da página
+# (o mesmo número de queries do selectinload)
+def project_list_statement() -> Any:
+    return (select(Project.id, Project.title, *user_columns(Owner, "owner"), Project.description)  # type: ignore
+            .select_from(Project)
+            .join(Owner, Project.owner_id == Owner.id))  # type: ignore
+
+def participants_statement(project_ids: Sequence[int]) -> Any:
+    return (select(ProjectUserLink.project_id, *user_columns(User, "user"))
+            .join(User, ProjectUserLink.user_id == User.id)  # type: ignore
+            .where(ProjectUserLink.project_id.in_(project_ids)))  # type: ignore
+
+def project_dicts(rows: Sequence[Any], participant_rows: Sequence[Any]) -> List[dict]:
+    participants: Dict[int, List[dict]] = defaultdict(list)
+    for project_id, *user in participant_rows:
+        participants[project_id].append(user_dict(*user))
+    return [{"id": id, "title": title, "owner": user_dict(owner_name, owner_email, owner_role, owner_id),
+             "description": description, "participants": participants.get(id, [])}
+            for id, title, owner_name, owner_email, owner_role, owner_id, description in rows]
+
+# UserRead
+def user_list_statement() -> Any:
+    return select(User.name, User.email, User.role, User.id)
+
+def user_dicts(rows: Sequence[Any]) -> List[dict]:
+    return [user_dict(*row) for row in rows]
+
+# Os headers já definidos no Response injetado (ETag, X-Next-Cursor) vão junto
+def json_response(content: Any, response: Response) -> Response:
+    return Response(to_json(content), media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from datetime import timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import delete, insert, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import settings
+from core.security import create_refresh_token
+from db.database import async_session
+from models.models import UserSession
+import uuid
+
+logger = logging.getLogger("taskmanager.sessions")
+
+class RefreshClaims(NamedTuple):
+    user_id: uuid.UUID
+    session_id: str
+
+# O jti é aleatório (256 bits), então um sha256 sem salt basta para não guardar o token
+def session_id(jti: str) -> str:
+    return hashlib.sha256(jti.encode()).hexdigest()
+
+def new_refresh_token(user_id: uuid.UUID) -> tuple:
+    jti = secrets.token_urlsafe(32)
+    expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    token = create_refresh_token(data={"sub": str(user_id), "jti": jti}, expires_delta=expires_delta)
+    return token, session_id(jti), int(time.time() + expires_delta.total_seconds())
+
+# Login: um único INSERT; sessões de outros dispositivos continuam valendo
+async def start_session(session: AsyncSession, user_id: uuid.UUID) -> str:
+    token, new_id, expires_at = new_refresh_token(user_id)
+    await session.exec(insert(UserSession).values(id=new_id, user_id=user_id, created_at=int(time.time()), expires_at=expires_at))  # type: ignore
+    return token
+
+# Refresh: troca o id da sessão pelo do novo token num único UPDATE pela PK.
+# Se nenhuma linha mudou a sessão foi revogada, expirou ou o token já foi usado
+# (dois refreshes concorrentes com o mesmo token: só um vence).
+async def rotate_session(session: AsyncSession, claims: RefreshClaims) -> Optional[str]:
+    token, new_id, expires_at = new_refresh_token(claims.user_id)
+    statement = (update(UserSession)
+                 .where(UserSession.id == claims.session_id, UserSession.user_id == claims.user_id, UserSession.expires_at > int(time.time()))  # type: ignore
+                 .values(id=new_id, expires_at=expires_at))
+    result = await session.exec(statement)  # type: ignore
+    return token if result.rowcount else None
+
+async def revoke_session(session: AsyncSession, claims: RefreshClaims) -> int:
+    statement = delete(UserSession).where(UserSession.id == claims.session_id, UserSession.user_id == claims.user_id)  # type: ignore
+    return (await session.exec(statement)).rowcount  # type: ignore
+
+async def revoke_user_sessions(session: AsyncSession, user_id: uuid.UUID) -> int:
+    return (await session.exec(delete(UserSession).where(UserSession.user_id == user_id))).rowcount  # type: ignore
+
+async def purge_expired_sessions(session: AsyncSession) -> int:
+    return (await session.exec(delete(UserSession).where(UserSession.expires_at <= int(time.time())))).rowcount  # type: ignore
+
+# Roda no lifespan de cada worker; o DELETE é idempotente, então workers concorrentes não conflitam
+async def purge_sessions_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as session:
+                purged = await purge_expired_sessions(session)
+                await session.commit()
+            if purged:
+                logger.info("purged %d expired sessions", purged)
+        except Exception:
+            logger.exception("failed to purge expired sessions")
@@ -0,0 +1,146 @@
+from collections import Counter
+from sqlalchemy import String, case, cast, delete, func, insert, literal, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Any, Dict, List, Optional, Tuple
+from models.models import Project, ProjectTaskStat, ProjectTaskStats, StatusTask, Task, UrgencyTask
+import uuid
+
+STATUS = "status"
+URGENCY = "urgency"
+ASSIGNEE = "assignee"
+UNASSIGNED = ""
+
+StatKey = Tuple[str, str]
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def task_stat_keys(status_task: Any, urgency: Any, assigned_to_id: Optional[uuid.UUID]) -> List[StatKey]:
+    return [
+        (STATUS, StatusTask(status_task).value),
+        (URGENCY, UrgencyTask(urgency).value),
+        (ASSIGNEE, str(assigned_to_id) if assigned_to_id else UNASSIGNED),
+    ]
+
+# Soma (amount=1) ou subtrai (amount=-1) tasks dos contadores acumulados em deltas
+def count_task(deltas: Counter, status_task: Any, urgency: Any, assigned_to_id: Optional[uuid.UUID], amount: int = 1) -> Counter:
+    for key in task_stat_keys(status_task, urgency, assigned_to_id):
+        deltas[key] += amount
+    return deltas
+
+# Trava a linha do projeto (FOR UPDATE) no início da transação de quem escreve tasks ou contadores.
+# Serializa os escritores com a reconstrução do check_task_stats: ela vê todas as tasks já
+# gravadas e os deltas dos demais só são aplicados depois dela. No SQLite o FOR UPDATE é omitido
+# (a transação de escrita já trava o banco inteiro)
+async def lock_project_tasks(session: AsyncSession, project_id: int) -> Optional[int]:
+    statement = select(Project.id).where(Project.id == project_id).with_for_update()
+    return (await session.exec(statement)).first()
+
+# Aplica os deltas com um único upsert (count = count + delta) na transação corrente.
+# O incremento é feito pelo banco, então updates concorrentes não perdem contagens.
+async def apply_task_stats(session: AsyncSession, project_id: int, deltas: Counter):
+    rows = [{"project_id": project_id, "dimension": dimension, "value": value, "count": delta}
+            for (dimension, value), delta in deltas.items() if delta]
+    if not rows:
+        return
+    statement = UPSERT_DIALECTS[session.bind.dialect.name](ProjectTaskStat)  # type: ignore
+    statement = statement.on_conflict_do_update(
+        index_elements=["project_id", "dimension", "value"],
+        set_={"count": ProjectTaskStat.count + statement.excluded["count"]},
+    )
+    await session.exec(statement, params=rows)  # type: ignore
+
+# Ao excluir um usuário o ORM anula assigned_to_id das tasks dele: move os contadores para "sem responsável"
+async def unassign_task_stats(session: AsyncSession, user_id: uuid.UUID):
+    statement = (select(ProjectTaskStat).where(ProjectTaskStat.dimension == ASSIGNEE, ProjectTaskStat.value == str(user_id))
+                 .order_by(ProjectTaskStat.project_id))
+    for stat in (await session.exec(statement)).all():
+        # Em ordem de project_id, para dois escritores nunca travarem os projetos em ordem inversa
+        await lock_project_tasks(session, stat.project_id)
+        await apply_task_stats(session, stat.project_id, Counter({(ASSIGNEE, str(user_id)): -stat.count, (ASSIGNEE, UNASSIGNED): stat.count}))
+
+async def delete_task_stats(session: AsyncSession, project_id: int):
+    await session.exec(delete(ProjectTaskStat).where(ProjectTaskStat.project_id == project_id))  # type: ignore
+
+async def read_task_stats(session: AsyncSession, project_id: int) -> ProjectTaskStats:
+    statement = select(ProjectTaskStat.dimension, ProjectTaskStat.value, ProjectTaskStat.count).where(ProjectTaskStat.project_id == project_id)
+    counts: Dict[str, Dict[str, int]] = {STATUS: {}, URGENCY: {}, ASSIGNEE: {}}
+    for dimension, value, count in (await session.exec(statement)).all():
+        counts[dimension][value] = count
+
+    return ProjectTaskStats(
+        project_id=project_id,
+        total=sum(counts[STATUS].values()),
+        status={status_task: counts[STATUS].get(status_task.value, 0) for status_task in StatusTask},
+        urgency={urgency: counts[URGENCY].get(urgency.value, 0) for urgency in UrgencyTask},
+        assignees={uuid.UUID(value): count for value, count in counts[ASSIGNEE].items() if value != UNASSIGNED and count},
+        unassigned=counts[ASSIGNEE].get(UNASSIGNED, 0),
+    )
+
+# Valor da dimensão como texto no próprio banco, igual ao de task_stat_keys: o Enum é gravado pelo
+# nome do membro e o UUID, no SQLite, como 32 dígitos hexadecimais sem hífens
+def stat_value_columns(dialect_name: str) -> List[Tuple[str, Any]]:
+    if dialect_name == "postgresql":
+        assignee = cast(Task.assigned_to_id, String)
+    else:
+        digits = Task.assigned_to_id
+        assignee = func.lower(func.substr(digits, 1, 8) + "-" + func.substr(digits, 9, 4) + "-" + func.substr(digits, 13, 4)
+                              + "-" + func.substr(digits, 17, 4) + "-" + func.substr(digits, 21, 12))
+    return [
+        (STATUS, case(*((Task.status == member, member.value) for member in StatusTask))),
+        (URGENCY, case(*((Task.urgency == member, member.value) for member in UrgencyTask))),
+        (ASSIGNEE, func.coalesce(assignee, UNASSIGNED)),
+    ]
+
+# Reescreve os contadores de um projeto numa transação: trava o projeto como os escritores de
+# tasks (lock_project_tasks), apaga os contadores e refaz com INSERT ... SELECT ... GROUP BY da
+# tabela task. Nenhum escritor altera tasks ou contadores do projeto entre o DELETE e o INSERT
+async def rebuild_task_stats(session: AsyncSession, project_id: int):
+    await lock_project_tasks(session, project_id)
+    await delete_task_stats(session, project_id)
+    grouped = union_all(*(
+        select(Task.project_id, literal(dimension), value, func.count())
+        .where(Task.project_id == project_id).group_by(Task.project_id, value)
+        for dimension, value in stat_value_columns(session.bind.dialect.name)  # type: ignore
+    ))
+    statement = insert(ProjectTaskStat).from_select(["project_id", "dimension", "value", "count"], grouped)
+    await session.exec(statement)  # type: ignore
+    await session.commit()
+
+# Verificador de consistência: recalcula os contadores a partir da tabela task (GROUP BY)
+# e compara com os armazenados. Com fix=True reconstrói os contadores dos projetos divergentes
+# (rebuild_task_stats, um projeto por transação).
+# Retorna {project_id: {(dimension, value): (armazenado, esperado)}} com as divergências.
+async def check_task_stats(session: AsyncSession, project_id: Optional[int] = None, fix: bool = False) -> Dict[int, Dict[StatKey, Tuple[int, int]]]:
+    expected: Dict[int, Counter] = {}
+    grouped = select(Task.project_id, Task.status, Task.urgency, Task.assigned_to_id, func.count()).group_by(
+        Task.project_id, Task.status, Task.urgency, Task.assigned_to_id)  # type: ignore
+    stored_statement = select(ProjectTaskStat.project_id, ProjectTaskStat.dimension, ProjectTaskStat.value, ProjectTaskStat.count)
+    if project_id is not None:
+        grouped = grouped.where(Task.project_id == project_id)
+        stored_statement = stored_statement.where(ProjectTaskStat.project_id == project_id)
+
+    for task_project_id, status_task, urgency, assigned_to_id, count in (await session.exec(grouped)).all():
+        if task_project_id is not None:
+            count_task(expected.setdefault(task_project_id, Counter()), status_task, urgency, assigned_to_id, count)
+
+    stored: Dict[int, Counter] = {}
+    for stat_project_id, dimension, value, count in (await session.exec(stored_statement)).all():
+        stored.setdefault(stat_project_id, Counter())[(dimension, value)] = count
+
+    mismatches: Dict[int, Dict[StatKey, Tuple[int, int]]] = {}
+    for mismatch_project_id in expected.keys() | stored.keys():
+        expected_counts = expected.get(mismatch_project_id, Counter())
+        stored_counts = stored.get(mismatch_project_id, Counter())
+        diff = {key: (stored_counts[key], expected_counts[key])
+                for key in expected_counts.keys() | stored_counts.keys() if stored_counts[key] != expected_counts[key]}
+        if diff:
+            mismatches[mismatch_project_id] = diff
+
+    if fix and mismatches:
+        # Encerra a transação de leitura: cada projeto é reconstruído na sua
+        await session.commit()
+        for mismatch_project_id in sorted(mismatches):
+            await rebuild_task_stats(session, mismatch_project_id)
+    return mismatches
@@ -0,0 +1,111 @@
+import csv
+import io
+import itertools
+import uuid
+from typing import IO, Any, Iterable, Iterator, List, Set, Tuple
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.security import hash_passwords_async
+from dependencies.task_stats import UPSERT_DIALECTS
+from models.models import PrivateData, User, UserBulkResult, UserCreate
+
+IMPORT_BATCH_SIZE = 1000
+CSV_REQUIRED_COLUMNS = ("name", "email", "password")
+CSV_COLUMNS = CSV_REQUIRED_COLUMNS + ("role",)
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+# UserCreate da linha, ou o erro de validação como texto (vira 422 só nessa linha)
+def validate_user(data: dict) -> Any:
+    try:
+        return UserCreate.model_validate(data)
+    except ValidationError as error:
+        return validation_detail(error)
+
+# Itens do POST /users/bulk como (índice, UserCreate ou erro)
+def json_users(users: List[dict]) -> Iterator[Tuple[int, Any]]:
+    for index, data in enumerate(users):
+        yield index, validate_user(data)
+
+# Linhas do CSV (cabeçalho com name, email, password e role opcional) como (índice, UserCreate ou erro).
+# O arquivo é lido aos poucos pelo csv.reader, então só o lote corrente fica em memória
+def csv_users(file: IO[bytes]) -> Iterator[Tuple[int, Any]]:
+    try:
+        reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+        header = [column.strip().lower() for column in next(reader, [])]
+        missing = [column for column in CSV_REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing CSV columns: {', '.join(missing)}")
+
+        for index, row in enumerate(row for row in reader if row):
+            if len(row) != len(header):
+                yield index, f"Expected {len(header)} columns, got {len(row)}"
+                continue
+            # Campo vazio usa o padrão do UserCreate (role)
+            data = {column: value for column, value in zip(header, row) if column in CSV_COLUMNS and value != ""}
+            yield index, validate_user(data)
+    except (csv.Error, UnicodeDecodeError) as error:
+        # Os lotes anteriores já foram gravados
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {error}")
+
+# Cria os usuários em lotes de IMPORT_BATCH_SIZE, cada um na sua transação. Por lote: um SELECT ... IN
+# com os e-mails (índice único ix_user_email), as senhas no pool de hash e um INSERT em lote de
+# User (ON CONFLICT DO NOTHING: e-mail criado por outra requisição no meio do lote vira 409) e de PrivateData.
+# Erros ficam no resultado da linha; as demais seguem.
+# Cada lote é lido e validado no threadpool: a leitura do upload (arquivo temporário em disco
+# acima de 1 MB) e a validação não bloqueiam o event loop
+async def import_users(session: AsyncSession, users: Iterable[Tuple[int, Any]]) -> List[UserBulkResult]:
+    results: List[UserBulkResult] = []
+    seen: Set[str] = set()
+    iterator = iter(users)
+    while batch := await run_in_threadpool(lambda: list(itertools.islice(iterator, IMPORT_BATCH_SIZE))):
+        results += await import_batch(session, batch, seen)
+    return results
+
+async def import_batch(session: AsyncSession, batch: List[Tuple[int, Any]], seen: Set[str]) -> List[UserBulkResult]:
+    results = {}
+    candidates: List[Tuple[int, UserCreate]] = []
+    for index, user in batch:
+        if not isinstance(user, UserCreate):
+            results[index] = UserBulkResult(index=index, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=user)
+        elif user.email in seen:
+            results[index] = UserBulkResult(index=index, email=user.email, status_code=status.HTTP_409_CONFLICT, detail="Duplicate email in request")
+        else:
+            seen.add(user.email)
+            candidates.append((index, user))
+
+    if candidates:
+        statement = select(User.email).where(User.email.in_([user.email for _, user in candidates])) # type: ignore
+        existing = set((await session.exec(statement)).all())
+        new_users = [(index, user) for index, user in candidates if user.email not in existing]
+        for index, user in candidates:
+            if user.email in existing:
+                results[index] = UserBulkResult(index=index, email=user.email, status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
+
+        if new_users:
+            hashed_passwords = await hash_passwords_async([user.password for _, user in new_users])
+            user_ids = [uuid.uuid4() for _ in new_users]
+            statement = UPSERT_DIALECTS[session.bind.dialect.name](User) # type: ignore
+            statement = statement.on_conflict_do_nothing(index_elements=["email"]).returning(User.id)
+            created = set((await session.exec(statement, params=[ # type: ignore
+                {"id": user_id, "name": user.name, "email": user.email, "role": user.role}
+                for user_id, (_, user) in zip(user_ids, new_users)
+            ])).scalars().all())
+            private_rows = [{"user_id": user_id, "hashed_password": hashed_password}
+                            for user_id, hashed_password in zip(user_ids, hashed_passwords) if user_id in created]
+            if private_rows:
+                await session.exec(insert(PrivateData), params=private_rows) # type: ignore
+            await session.commit()
+
+            for user_id, (index, user) in zip(user_ids, new_users):
+                if user_id in created:
+                    results[index] = UserBulkResult(index=index, id=user_id, email=user.email, status_code=status.HTTP_200_OK)
+                else:
+                    results[index] = UserBulkResult(index=index, email=user.email, status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
+
+    return [results[index] for index, _ in batch]
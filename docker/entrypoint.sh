@@ -8,4 +8,4 @@ echo "Running migrations..."
 alembic upgrade head || echo "Migration failed or already up to date"
 
 echo "Starting application..."
-exec gunicorn main:app -w ${WORKERS:-4} -k uvicorn.workers.UvicornWorker --bind ${HOST:-0.0.0.0}:${PORT:-8000} --timeout 30 --max-requests 1000
\ No newline at end of file
+exec gunicorn main:app -w ${WORKERS:-4} -k uvicorn.workers.UvicornWorker --bind ${HOST:-0.0.0.0}:${PORT:-8000} --timeout 30 --max-requests 1000 --max-requests-jitter 100 --preload
\ No newline at end of file
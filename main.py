@@ -1,12 +1,49 @@
-from fastapi import Depends, FastAPI
-from dependencies.dependencies import get_current_user
-from models.models import User, UserRead
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import hmac
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse
+from core.cache import close_cache_backend
+from core.config import settings
+from core.feed import close_feed, start_feed
+from core.diagnostics import DiagnosticsMiddleware
+from core.request_metrics import InstrumentedRoute, MetricsMiddleware, request_metrics
+from db.database import dispose_engine, get_engine
+from dependencies.dependencies import get_current_user, get_session
+from dependencies.my_tasks import group_by_project, my_tasks_statement
+from dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
+from dependencies.serialization import json_response
+from dependencies.sessions import purge_sessions_periodically
+from models.models import ProjectTasksRead, StatusTask, Task, UrgencyTask, User, UserRead
+from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
 from routes.user_routes import user_router
 from routes.project_routes import project_router
 from routes.auth_routes import auth_router
+from routes.admin_routes import admin_router
+from routes.search_routes import search_router
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nada de DDL aqui: o schema vem das migrations (alembic upgrade head, no entrypoint do docker).
+    # O engine é criado por worker, depois do fork (veja db/database.py)
+    get_engine()
+    await start_feed()
+    purge_task = None
+    if settings.SESSION_PURGE_INTERVAL_SECONDS > 0:
+        purge_task = asyncio.create_task(purge_sessions_periodically(settings.SESSION_PURGE_INTERVAL_SECONDS))
+    yield
+    if purge_task is not None:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+    await close_feed()
+    await close_cache_backend()
+    await dispose_engine()
+
 app = FastAPI(
+    lifespan=lifespan,
     swagger_ui_parameters={
         "operationsSorter": "method",
     }
@@ -22,12 +59,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(DiagnosticsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.router.route_class = InstrumentedRoute
 
 @app.get("/me", response_model=UserRead)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     return current_user
 
+# Tasks atribuídas ao usuário em todos os projetos, agrupadas por projeto, numa única consulta
+# (veja dependencies/my_tasks.py). limit conta tasks; after é o id da última task recebida
+@app.get("/me/tasks", response_model=List[ProjectTasksRead])
+async def get_my_tasks(response: Response,
+                       status_task: Optional[StatusTask] = Query(None, alias="status"),
+                       urgency: Optional[UrgencyTask] = None,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                       after: Optional[int] = None,
+                       session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
+    rows = await paginate(session, my_tasks_statement(current_user, status_task, urgency), Task.id, response, limit, after)
+    groups = group_by_project(rows)
+    if settings.FAST_LIST_SERIALIZATION:
+        return json_response(groups, response)
+    return groups
+
+# Métricas por rota no formato do Prometheus; protegido por METRICS_TOKEN quando definido
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    if settings.METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
 app.include_router(user_router)
 app.include_router(project_router)
-app.include_router(auth_router)
\ No newline at end of file
+app.include_router(auth_router)
+app.include_router(admin_router)
+app.include_router(search_router)
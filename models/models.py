@@ -1,6 +1,6 @@
 from sqlmodel import Relationship, SQLModel, Field
-from sqlalchemy import Column, ForeignKey as SA_FK
-from typing import Optional, List
+from sqlalchemy import Column, ForeignKey as SA_FK, Index
+from typing import Dict, Optional, List
 from enum import Enum
 import uuid
 from pydantic import EmailStr
@@ -16,6 +16,9 @@ class ProjectRole(str, Enum):
     EDITOR = "editor"
 
 class ProjectUserLink(SQLModel, table=True):
+    # A PK (project_id, user_id) não serve para buscar os projetos de um usuário
+    __table_args__ = (Index("ix_projectuserlink_user_id_project_role", "user_id", "project_role"),)
+
     project_id: Optional[int] = Field(default=None, foreign_key="project.id", primary_key=True)
     user_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id", primary_key=True)
     project_role: Optional[ProjectRole] = Field(default=ProjectRole.VIEWER)
@@ -24,9 +27,18 @@ class PrivateData(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key="user.id",primary_key=True)
     
     hashed_password: str
-    refresh_token: Optional[str] = None
 
     user: "User" = Relationship(back_populates="private_data")
+
+# Uma linha por sessão de login (refresh token emitido). O id é o sha256 do jti do
+# refresh token: o token não é gravado. Revogar uma sessão é apagar a linha.
+# Os instantes são timestamps unix, como o exp do JWT.
+class UserSession(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    user_id: uuid.UUID = Field(sa_column=Column(SA_FK("user.id", ondelete="CASCADE"), nullable=False, index=True))
+    created_at: int
+    expires_at: int = Field(index=True)
+
 class UserBase(SQLModel):
     name: str
     email: EmailStr = Field(index=True, unique=True)
@@ -85,7 +97,10 @@ class Project(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: Optional[str] = Field(default="No description provided")
-    owner_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id")
+    owner_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id", index=True)
+    # Versões para os ETags das leituras (ver dependencies/etags.py)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    tasks_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     # Dono (criado por)
     owner: Optional[User] = Relationship(back_populates="created_projects")
@@ -109,6 +124,12 @@ class UrgencyTask(str, Enum):
     HIGH = "high"
     
 class Task(SQLModel, table=True):
+    # Os compostos começam por project_id e também atendem o cascade do delete_project
+    __table_args__ = (
+        Index("ix_task_project_id_status", "project_id", "status"),
+        Index("ix_task_project_id_assigned_to_id", "project_id", "assigned_to_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: Optional[str] = None
@@ -116,10 +137,27 @@ class Task(SQLModel, table=True):
     urgency: UrgencyTask = UrgencyTask.LOW
     
     project_id: Optional[int] = Field(default=None, sa_column=Column(SA_FK("project.id", ondelete="CASCADE"), nullable=True))
-    assigned_to_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id")
+    assigned_to_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id", index=True)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     
     assigned_to: Optional[User] = Relationship(back_populates="tasks_assigned")
     project: Optional[Project] = Relationship(back_populates="tasks")
+
+# Contadores de tasks por projeto, mantidos na mesma transação que altera as tasks.
+# dimension: "status" | "urgency" | "assignee"; value: valor da task ("" = sem responsável)
+class ProjectTaskStat(SQLModel, table=True):
+    project_id: int = Field(sa_column=Column(SA_FK("project.id", ondelete="CASCADE"), primary_key=True))
+    dimension: str = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    count: int = 0
+
+class ProjectTaskStats(SQLModel):
+    project_id: int
+    total: int
+    status: Dict[StatusTask, int]
+    urgency: Dict[UrgencyTask, int]
+    assignees: Dict[uuid.UUID, int]
+    unassigned: int
     
 class TaskCreate(SQLModel):
     title: str
@@ -135,6 +173,32 @@ class TaskUpdate(SQLModel):
     urgency: Optional[UrgencyTask] = None
     assigned_to_id: Optional[uuid.UUID] = None
     
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+class TaskBulkResult(SQLModel):
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    detail: Optional[str] = None
+    
+class UserBulkResult(SQLModel):
+    index: int
+    id: Optional[uuid.UUID] = None
+    email: Optional[str] = None
+    status_code: int
+    detail: Optional[str] = None
+
+class ProjectMemberBulk(SQLModel):
+    user_id: uuid.UUID
+    project_role: ProjectRole = ProjectRole.VIEWER
+
+class ProjectMemberBulkResult(SQLModel):
+    index: int
+    user_id: uuid.UUID
+    status_code: int
+    detail: Optional[str] = None
+
 class TaskReadOnCreate(SQLModel):
     id: int
     title: str
@@ -152,8 +216,32 @@ class TaskRead(SQLModel):
     urgency: UrgencyTask
     project: ProjectReadTask
     assigned_to: UserRead
+
+# GET /me/tasks: tasks do usuário agrupadas por projeto
+class TaskReadInProject(SQLModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    status: StatusTask
+    urgency: UrgencyTask
+
+class ProjectTasksRead(SQLModel):
+    project: ProjectReadTask
+    tasks: List[TaskReadInProject]
     
     
+class SearchKind(str, Enum):
+    TASK = "task"
+    PROJECT = "project"
+
+class SearchResult(SQLModel):
+    kind: SearchKind
+    id: int
+    project_id: int
+    title: str
+    description: Optional[str] = None
+    rank: float
+
 class Login(SQLModel):
     email: str
     password: str
\ No newline at end of file
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from core.cache import caches
+from core.diagnostics import diagnostics
+from core.feed import feed_stats
+from core.request_metrics import InstrumentedRoute
+from core.security import hashing_stats
+from db.database import get_engine
+from db.pool import pool_stats
+from dependencies.dependencies import get_admin_user, get_session
+from dependencies.sessions import revoke_user_sessions
+from sqlmodel.ext.asyncio.session import AsyncSession
+import uuid
+
+admin_router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_admin_user)], route_class=InstrumentedRoute)
+
+@admin_router.get("/db/pool", response_model=dict)
+async def get_pool_stats():
+    return pool_stats.snapshot(get_engine().sync_engine.pool)
+
+# Queries lentas e N+1 mais recentes (DB_DIAGNOSTICS_ENABLED), do mais novo para o mais antigo
+@admin_router.get("/db/diagnostics", response_model=dict)
+async def get_db_diagnostics(limit: int = Query(50, ge=1, le=1000)):
+    return diagnostics.snapshot(limit)
+
+@admin_router.delete("/db/diagnostics", response_model=dict)
+async def clear_db_diagnostics():
+    diagnostics.findings.clear()
+    return {"detail": "Diagnostics cleared"}
+
+@admin_router.get("/cache", response_model=dict)
+async def get_cache_stats():
+    return {name: cache.stats() for name, cache in caches.items()}
+
+# Conexões do feed de alterações neste worker, eventos distribuídos e descartes por fila cheia
+@admin_router.get("/feed", response_model=dict)
+async def get_feed_stats():
+    return feed_stats()
+
+@admin_router.get("/password-hashing", response_model=dict)
+async def get_password_hashing_stats():
+    return hashing_stats.snapshot()
+
+# Encerra todas as sessões (refresh tokens) de um usuário
+@admin_router.delete("/users/{user_id}/sessions", response_model=dict)
+async def revoke_sessions(user_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
+    revoked = await revoke_user_sessions(session, user_id)
+    await session.commit()
+    return {"detail": "Sessions revoked", "revoked": revoked}
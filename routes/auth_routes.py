@@ -1,25 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-from core.security import verify_password
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from dependencies.dependencies import get_session, get_current_user
 from models.models import User
-from core.security import verify_password, create_access_token, create_refresh_token
+from core.request_metrics import InstrumentedRoute
+from core.security import verify_password_async, create_access_token
 from core.config import settings
 from datetime import timedelta
 from dependencies.dependencies import validate_refresh_token
+from dependencies.sessions import RefreshClaims, revoke_session, revoke_user_sessions, rotate_session, start_session
 
-auth_router = APIRouter(prefix="/auth", tags=["auth"])
+auth_router = APIRouter(prefix="/auth", tags=["auth"], route_class=InstrumentedRoute)
 
 @auth_router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)) -> dict:    
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_session)) -> dict:    
     statement = (select(User).where(User.email == form_data.username)
                  .options(selectinload(User.private_data))) #type: ignore
-    user = session.exec(statement=statement).first()
+    user = (await session.exec(statement=statement)).first()
     
-    if not user or not user.private_data or not verify_password(form_data.password, user.private_data.hashed_password): 
+    if not user or not user.private_data or not await verify_password_async(form_data.password, user.private_data.hashed_password): 
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
                             detail="Failed in Login. Verify Email and Password", 
                             headers={"WWW-Authenticate": "Bearer"},
@@ -28,34 +30,42 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Sessi
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": str(user.id)},
                                        expires_delta=access_token_expires)
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
-    
-    user.private_data.refresh_token = refresh_token
-    session.add(user.private_data)
-    session.commit()
+    refresh_token = await start_session(session, user.id)
+    await session.commit()
     
     return {"access_token": access_token,
             "refresh_token": refresh_token, 
             "token_type": "bearer"}
 
 @auth_router.post("/refresh")
-async def refresh_token(user: User = Depends(validate_refresh_token), session: Session = Depends(get_session)):
+async def refresh_token(claims: RefreshClaims = Depends(validate_refresh_token), session: AsyncSession = Depends(get_session)):
+    
+    new_refresh_token = await rotate_session(session, claims)
+    if new_refresh_token is None:
+        raise HTTPException(status_code=401, detail="Refresh token revoked or invalid")
+    await session.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, 
+        data={"sub": str(claims.user_id)}, 
         expires_delta=access_token_expires
     )
     
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
-    
-    if user.private_data:
-        user.private_data.refresh_token = new_refresh_token
-        session.add(user.private_data)
-        session.commit()
-    
     return { 
         "access_token": access_token, 
         "refresh_token": new_refresh_token,
         "token_type": "bearer"
-    }
\ No newline at end of file
+    }
+
+# Encerra a sessão do refresh token informado; o access token já emitido vale até expirar
+@auth_router.post("/logout", response_model=dict)
+async def logout(claims: RefreshClaims = Depends(validate_refresh_token), session: AsyncSession = Depends(get_session)):
+    await revoke_session(session, claims)
+    await session.commit()
+    return {"detail": "Session revoked"}
+
+@auth_router.post("/logout-all", response_model=dict)
+async def logout_all(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    revoked = await revoke_user_sessions(session, current_user.id)
+    await session.commit()
+    return {"detail": "Sessions revoked", "revoked": revoked}
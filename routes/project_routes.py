@@ -1,31 +1,64 @@
 import uuid
-from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel
-from models.models import ProjectCreate, Project, ProjectRead, TaskRead, User, Task, TaskCreate, TaskReadOnCreate, TaskUpdate, ProjectUserLink, ProjectRole, ProjectReadOnCreate, Role
+from fastapi import APIRouter, Body, HTTPException, Depends, Header, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from models.models import ProjectCreate, Project, ProjectRead, TaskRead, User, UserRead, Task, TaskCreate, TaskReadOnCreate, TaskUpdate, TaskBulkUpdate, TaskBulkResult, ProjectMemberBulk, ProjectMemberBulkResult, ProjectTaskStats, ProjectUserLink, ProjectRole, ProjectReadOnCreate, Role, StatusTask, UrgencyTask
+from core.config import settings
+from core.feed import hub, publish
+from core.request_metrics import InstrumentedRoute
+from db.database import async_session
 from dependencies.dependencies import get_session, get_current_user
-from typing import List
+from dependencies.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from dependencies.export import ExportFormat, export_response
+from dependencies.serialization import json_response, participants_statement, project_dicts, project_list_statement, task_dicts, task_list_statement
+from dependencies.etags import bump_project, bump_project_tasks, etag_matches, not_modified, params_digest, project_seq, weak_etag
+from dependencies.events import events_response
+from dependencies.user_import import validation_detail
+from dependencies.task_stats import UPSERT_DIALECTS, apply_task_stats, count_task, delete_task_stats, lock_project_tasks, read_task_stats
+from dependencies.permissions import ProjectAccess, get_project_access, resolve_membership, invalidate_membership, invalidate_project, project_cache
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
 
-from sqlmodel import Session, select , or_, and_
+from sqlmodel import select , or_, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 
-project_router = APIRouter(prefix="/projects", tags=["projects and tasks"], dependencies=[Depends(get_current_user)])
+project_router = APIRouter(prefix="/projects", tags=["projects and tasks"], dependencies=[Depends(get_current_user)], route_class=InstrumentedRoute)
+
+# Com AsyncSession não existe lazy load durante a serialização da resposta,
+# então os relacionamentos usados pelos schemas de leitura são carregados aqui.
+# Many-to-one vai no mesmo SELECT (joinedload); coleções usam um SELECT ... IN
+# extra por consulta (selectinload), então o número de queries não cresce com as linhas.
+project_read_options = (joinedload(Project.owner), selectinload(Project.participants)) # type: ignore
+task_read_options = (joinedload(Task.project).joinedload(Project.owner), joinedload(Task.assigned_to)) # type: ignore
+
+async def load_project(session: AsyncSession, project_id: int) -> Optional[Project]:
+    statement = (select(Project).where(Project.id == project_id)
+                 .options(*project_read_options)
+                 .execution_options(populate_existing=True))
+    return (await session.exec(statement)).first()
+
+async def load_task(session: AsyncSession, task_id: int) -> Optional[Task]:
+    statement = (select(Task).where(Task.id == task_id)
+                 .options(*task_read_options)
+                 .execution_options(populate_existing=True))
+    return (await session.exec(statement)).first()
 
 @project_router.post("/", response_model=ProjectReadOnCreate)
-async def create_project(project_data: ProjectCreate, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def create_project(project_data: ProjectCreate, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     db_project = Project(title=project_data.title, description=project_data.description, owner_id=current_user.id)
     session.add(db_project)
-    print(f"id Enviado: {project_data.manager_id}")
     
-    session.flush() # Cria o id mas sem commit ainda
-    session.refresh(db_project)
+    await session.flush() # Cria o id mas sem commit ainda
+    await session.refresh(db_project)
     
     if project_data.manager_id and project_data.manager_id != current_user.id:
-        db_manager = session.get(User, project_data.manager_id)
+        db_manager = await session.get(User, project_data.manager_id)
         if not db_manager:
-            session.rollback() # Cancela criação se user não existir
+            await session.rollback() # Cancela criação se user não existir
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found")
-        print(f"id Resgatado do banco: {db_manager}")
-        print(f"Manager: {db_manager}")
         manager_link = ProjectUserLink(project_id=db_project.id, user_id=db_manager.id, project_role=ProjectRole.MANAGER)
         session.add(manager_link)
         
@@ -39,7 +72,8 @@ async def create_project(project_data: ProjectCreate, session: Session = Depends
         )
         session.add(owner_link)
         
-    session.commit()
+    await session.commit()
+    await session.refresh(db_project, attribute_names=["owner"])
     
     return db_project
 
@@ -47,9 +81,9 @@ class UserRequest(BaseModel):
     user_id: uuid.UUID
     
 @project_router.patch("/{project_id}/remove_user", response_model=dict)
-async def remove_user_from_project(project_id: int, request: UserRequest, session: Session = Depends(get_session)):
-    db_user = session.get(User, request.user_id)
-    db_project = session.get(Project, project_id)
+async def remove_user_from_project(project_id: int, request: UserRequest, session: AsyncSession = Depends(get_session)):
+    db_user = await session.get(User, request.user_id)
+    db_project = await load_project(session, project_id)
     if not db_user or not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User or project not found")
 
@@ -59,18 +93,20 @@ async def remove_user_from_project(project_id: int, request: UserRequest, sessio
     db_project.participants.remove(db_user)
     try:
         session.add(db_project)
-        session.commit()
-        session.refresh(db_project)
+        seq = await bump_project(session, project_id)
+        await session.commit()
     except Exception:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not remove user from project")
+    await invalidate_membership(project_id, request.user_id)
+    await publish(project_id, seq, "member.removed", {"user_id": str(request.user_id)})
 
     return {"detail": "User removed from project successfully"}
 
 @project_router.post("/{project_id}/add_user", response_model=ProjectRead)
-async def add_user_to_project(request: UserRequest, project_id: int, session: Session = Depends(get_session)):
-    db_user = session.get(User, request.user_id)
-    db_project = session.get(Project, project_id)
+async def add_user_to_project(request: UserRequest, project_id: int, session: AsyncSession = Depends(get_session)):
+    db_user = await session.get(User, request.user_id)
+    db_project = await load_project(session, project_id)
     if not db_user or not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User or project not found")
 
@@ -80,187 +116,333 @@ async def add_user_to_project(request: UserRequest, project_id: int, session: Se
     db_project.participants.append(db_user)
     try:
         session.add(db_project)
-        session.commit()
-        session.refresh(db_project)
+        seq = await bump_project(session, project_id)
+        await session.commit()
     except IntegrityError:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User already added to project")
     except Exception:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not add user to project")
+    await invalidate_membership(project_id, request.user_id)
+    await publish(project_id, seq, "member.added", {"user": UserRead.model_validate(db_user).model_dump(mode="json")})
 
-    return db_project
+    return await load_project(session, project_id)
     
+MAX_BULK_MEMBERS = 10000
+
+# Participação em lote sem carregar db_project.participants: os usuários são validados
+# com um único SELECT ... IN (que já traz o papel atual de cada um no projeto) e os
+# vínculos gravados com um único upsert (INSERT ... ON CONFLICT DO UPDATE).
+# Usuário repetido vira um único vínculo (o último papel vence).
+@project_router.post("/{project_id}/add_users", response_model=List[ProjectMemberBulkResult])
+async def add_users_to_project(project_id: int, members: List[ProjectMemberBulk] = Body(..., max_length=MAX_BULK_MEMBERS),
+                               session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):
+    if not access.has_full_access:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permissions to manage the members of this project")
+
+    roles = {member.user_id: member.project_role for member in members}
+    statement = (select(User.id, ProjectUserLink.project_role)
+                 .join(ProjectUserLink, and_(ProjectUserLink.user_id == User.id, ProjectUserLink.project_id == project_id), isouter=True)
+                 .where(User.id.in_(roles.keys()))) # type: ignore
+    current_roles = {user_id: role for user_id, role in (await session.exec(statement)).all()}
+
+    results: List[ProjectMemberBulkResult] = []
+    for index, member in enumerate(members):
+        if member.user_id not in current_roles:
+            results.append(ProjectMemberBulkResult(index=index, user_id=member.user_id, status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found"))
+        else:
+            results.append(ProjectMemberBulkResult(index=index, user_id=member.user_id, status_code=status.HTTP_200_OK))
+
+    # Só grava quem entra no projeto ou muda de papel
+    rows = [{"project_id": project_id, "user_id": user_id, "project_role": role}
+            for user_id, role in roles.items() if user_id in current_roles and current_roles[user_id] != role]
+    if rows:
+        statement = UPSERT_DIALECTS[session.bind.dialect.name](ProjectUserLink) # type: ignore
+        statement = statement.on_conflict_do_update(index_elements=["project_id", "user_id"],
+                                                    set_={"project_role": statement.excluded["project_role"]})
+        await session.exec(statement, params=rows) # type: ignore
+        seq = await bump_project(session, project_id)
+        await session.commit()
+        await invalidate_project(project_id)
+        # Lotes publicam só os ids e papéis (novos participantes e mudanças de papel)
+        await publish(project_id, seq, "members.added",
+                      {"members": [{"user_id": str(row["user_id"]), "project_role": row["project_role"].value} for row in rows]})
+
+    return results
+
+# Remove os vínculos com um único DELETE ... RETURNING; quem não participava recebe 404
+@project_router.patch("/{project_id}/remove_users", response_model=List[ProjectMemberBulkResult])
+async def remove_users_from_project(project_id: int, user_ids: List[uuid.UUID] = Body(..., max_length=MAX_BULK_MEMBERS),
+                                    session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):
+    if not access.has_full_access:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permissions to manage the members of this project")
+
+    removed: Set[uuid.UUID] = set()
+    if user_ids:
+        statement = (delete(ProjectUserLink)
+                     .where(ProjectUserLink.project_id == project_id, ProjectUserLink.user_id.in_(set(user_ids))) # type: ignore
+                     .returning(ProjectUserLink.user_id))
+        removed = set((await session.exec(statement)).scalars().all()) # type: ignore
+    if removed:
+        seq = await bump_project(session, project_id)
+        await session.commit()
+        await invalidate_project(project_id)
+        await publish(project_id, seq, "members.removed", {"user_ids": [str(user_id) for user_id in removed]})
+
+    return [ProjectMemberBulkResult(index=index, user_id=user_id, status_code=status.HTTP_200_OK) if user_id in removed else
+            ProjectMemberBulkResult(index=index, user_id=user_id, status_code=status.HTTP_404_NOT_FOUND, detail="User is not a participant of the project")
+            for index, user_id in enumerate(user_ids)]
+
 @project_router.get("/{project_id}", response_model=ProjectRead)
-async def get_project(project_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):   
-    db_project = session.get(Project, project_id)
-    if not db_project:
+async def get_project(project_id: int, if_none_match: Optional[str] = Header(None),
+                      session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):   
+    if not (access.is_admin or access.is_owner or access.is_participant):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this project")
+
+    # Uma consulta só da versão: se o cliente já tem essa versão, 304 sem carregar nada
+    version = (await session.exec(select(Project.version).where(Project.id == project_id))).first()
+    if version is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    if current_user.role == Role.ADMIN:
-        return db_project
-    if db_project.owner_id == current_user.id:
-        return db_project
-    
-    statement = select(ProjectUserLink).where(
-        ProjectUserLink.project_id == project_id,
-        ProjectUserLink.user_id == current_user.id
-    )
-    is_member = session.exec(statement=statement).first()
-    if is_member:
-        return db_project
-    
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this project")
+    etag = weak_etag("project", project_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def load_project_read():
+        db_project = await load_project(session, project_id)
+        return ProjectRead.model_validate(db_project).model_dump(mode="json") if db_project else None
+
+    # O cache guarda o JSON já validado pelo ProjectRead, indexado pela versão:
+    # a resposta sai sem nova validação e nunca fica atrás do ETag
+    data = await project_cache.get_or_load(f"{project_id}:{version}", load_project_read, group=str(project_id))
+    if data is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    return JSONResponse(data, headers={"ETag": etag})
         
 
 @project_router.get("/", response_model=List[ProjectRead]) 
-async def get_all_projects(session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    if current_user.role == Role.ADMIN:
-        statement = select(Project)
-    else:
-        statement = (select(Project)
-                     .join(ProjectUserLink, isouter=True)
+async def get_all_projects(response: Response,
+                           limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           after: Optional[int] = None,
+                           session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
+    fast = settings.FAST_LIST_SERIALIZATION
+    statement = project_list_statement() if fast else select(Project)
+    if current_user.role != Role.ADMIN:
+        # Subquery em vez de join + DISTINCT: evita deduplicar as linhas do joinedload
+        managed_projects = select(ProjectUserLink.project_id).where(
+            ProjectUserLink.user_id == current_user.id,
+            ProjectUserLink.project_role == ProjectRole.MANAGER
+        )
+        statement = (statement
                      .where(
                          or_(
                              Project.owner_id == current_user.id,
-                             and_(
-                                 ProjectUserLink.user_id == current_user.id,
-                                 ProjectUserLink.project_role == ProjectRole.MANAGER
-                             )
+                             Project.id.in_(managed_projects) # type: ignore
                          )
-                     ).distinct()
+                     )
                     )
 
-    projects = session.exec(statement).all()
-    return projects
+    if fast:
+        rows = await paginate(session, statement, Project.id, response, limit, after)
+        participant_rows = (await session.exec(participants_statement([row.id for row in rows]))).all() if rows else []
+        return json_response(project_dicts(rows, participant_rows), response)
+    return await paginate(session, statement.options(*project_read_options), Project.id, response, limit, after)
 
 @project_router.delete("/{project_id}", response_model=dict)
-async def delete_project(project_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
+async def delete_project(project_id: int, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
+    db_project = await session.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if db_project.owner_id != current_user.id and current_user.role != Role.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to delete this project")
-    session.delete(db_project)
-    session.commit()
+    await delete_task_stats(session, project_id)
+    await session.delete(db_project)
+    await session.commit()
+    await invalidate_project(project_id)
+    await publish(project_id, None, "project.deleted", {})
     return {"detail": "Project deleted successfully"}
 
 
 ##tasks
 @project_router.post("/{project_id}/tasks", response_model=TaskReadOnCreate)
-async def create_task(project_id: int, data_task: TaskCreate, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
-    db_user = session.get(User, data_task.assigned_to_id)
-    if not db_project or not db_user:
+async def create_task(project_id: int, data_task: TaskCreate, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user), access: ProjectAccess = Depends(get_project_access)):
+    db_user = await session.get(User, data_task.assigned_to_id)
+    if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project or User Not Found")
-    is_admin = current_user.role == Role.ADMIN
-    is_owner = db_project.owner_id == current_user.id
-    is_manager= False
-    
-    if not(is_admin or is_owner):
-        member_link = session.get(ProjectUserLink, (project_id, current_user.id))
-        if member_link and member_link.project_role == ProjectRole.MANAGER:
-            is_manager = True
 
-    if not(is_admin or is_manager or is_owner):
+    if not access.has_full_access:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permissions to create a task in this project")            
         
     if data_task.assigned_to_id:
         if data_task.assigned_to_id == current_user.id:
             pass
         else:
-            db_assigned = session.get(User, data_task.assigned_to_id)
-            if not db_assigned:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found")
+            is_assignee_owner = access.owner_id == db_user.id
+            _, assigned_role = await resolve_membership(session, project_id, db_user.id) or (None, None)
             
-            is_assignee_owner = db_project.owner_id == db_assigned.id
-            assigned_link = session.get(ProjectUserLink, (project_id, db_assigned.id))
-            
-            if not is_assignee_owner and not assigned_link:
+            if not is_assignee_owner and not assigned_role:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Assigned is not a participant of this project")
             
+    await lock_project_tasks(session, project_id)
     db_task = Task(title=data_task.title, description=data_task.description, urgency=data_task.urgency, project_id=project_id, assigned_to_id=data_task.assigned_to_id, status=data_task.status)
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await apply_task_stats(session, project_id, count_task(Counter(), db_task.status, db_task.urgency, db_task.assigned_to_id))
+    seq = await bump_project_tasks(session, project_id)
+    await session.commit()
+    await session.refresh(db_task, attribute_names=["assigned_to"])
+    await publish(project_id, seq, "task.created", {"task": TaskReadOnCreate.model_validate(db_task).model_dump(mode="json")})
     
     return db_task
 
 @project_router.get("/{project_id}/task/{task_id}", response_model=TaskRead)
-async def get_task(project_id: int, task_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
-    db_task = session.get(Task, task_id)
-    if not db_project or not db_task:
+async def get_task(project_id: int, task_id: int, response: Response, if_none_match: Optional[str] = Header(None),
+                   session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):
+    if not (access.is_admin or access.is_participant):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not from the project")
+
+    row = (await session.exec(select(Task.project_id, Task.version).where(Task.id == task_id))).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project or Task Not Found")
-    if db_task.project_id != db_project.id:
+    if row[0] != project_id:
         raise HTTPException(status_code=404, detail="Task does not belogin to this project")
-    
-    is_admin = current_user.role == Role.ADMIN
-    is_participant = session.get(ProjectUserLink, (project_id, current_user.id))
-    if not (is_admin or is_participant):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not from the project")
+    etag = weak_etag("task", task_id, row[1])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    db_task = await load_task(session, task_id)
+    if not db_task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project or Task Not Found")
+    response.headers["ETag"] = etag
     return db_task
 
+def filter_tasks(statement, project_id: int, current_user: User, mines: bool, status_task: Optional[StatusTask],
+                 urgency: Optional[UrgencyTask], assigned_to_id: Optional[uuid.UUID]):
+    statement = statement.where(Task.project_id == project_id)
+    if mines:
+        statement = statement.where(Task.assigned_to_id == current_user.id)
+    if status_task:
+        statement = statement.where(Task.status == status_task)
+    if urgency:
+        statement = statement.where(Task.urgency == urgency)
+    if assigned_to_id:
+        statement = statement.where(Task.assigned_to_id == assigned_to_id)
+    return statement
+
 @project_router.get("/{project_id}/tasks", response_model=List[TaskRead])
-async def get_tasks(project_id: int, mines: bool = False, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
-    if not db_project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project Not Found")
-    
-    is_participant = session.get(ProjectUserLink, (project_id, current_user.id))
-    is_admin = current_user.role == Role.ADMIN
-    if not (is_participant or is_admin):
+async def get_tasks(project_id: int, response: Response, mines: bool = False,
+                    status_task: Optional[StatusTask] = Query(None, alias="status"),
+                    urgency: Optional[UrgencyTask] = None,
+                    assigned_to_id: Optional[uuid.UUID] = None,
+                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                    after: Optional[int] = None,
+                    if_none_match: Optional[str] = Header(None),
+                    session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user),
+                    access: ProjectAccess = Depends(get_project_access)):
+    if not (access.is_participant or access.is_admin):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not a participant from this project")
+
+    # tasks_version muda com qualquer task do projeto; os filtros e a página entram no resumo
+    tasks_version = (await session.exec(select(Project.tasks_version).where(Project.id == project_id))).first()
+    etag = weak_etag("tasks", project_id, tasks_version,
+                     params_digest(current_user.id if mines else None, status_task, urgency, assigned_to_id, limit, after))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    statement = select(Task).where(Task.project_id == project_id)
-    if mines:
-        statement = statement.where(Task.assigned_to_id == current_user.id)
-    tasks = session.exec(statement).all()
-    return tasks
+    response.headers["ETag"] = etag
+    if settings.FAST_LIST_SERIALIZATION:
+        statement = filter_tasks(task_list_statement(), project_id, current_user, mines, status_task, urgency, assigned_to_id)
+        rows = await paginate(session, statement, Task.id, response, limit, after)
+        return json_response(task_dicts(rows), response)
+    statement = filter_tasks(select(Task), project_id, current_user, mines, status_task, urgency, assigned_to_id)
+    return await paginate(session, statement.options(*task_read_options), Task.id, response, limit, after)
+
+# Colunas da exportação: tuplas cruas (sem ORM), com o responsável via LEFT JOIN
+task_export_columns = {
+    "id": Task.id,
+    "title": Task.title,
+    "description": Task.description,
+    "status": Task.status,
+    "urgency": Task.urgency,
+    "project_id": Task.project_id,
+    "assigned_to_id": Task.assigned_to_id,
+    "assigned_to_name": User.name,
+    "assigned_to_email": User.email,
+}
+
+@project_router.get("/{project_id}/tasks/export", response_class=StreamingResponse)
+async def export_tasks(project_id: int, export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+                       mines: bool = False,
+                       status_task: Optional[StatusTask] = Query(None, alias="status"),
+                       urgency: Optional[UrgencyTask] = None,
+                       assigned_to_id: Optional[uuid.UUID] = None,
+                       current_user: User = Depends(get_current_user),
+                       access: ProjectAccess = Depends(get_project_access)):
+    if not (access.is_participant or access.is_admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not a participant from this project")
+
+    statement = select(*task_export_columns.values()).select_from(Task).outerjoin(User, Task.assigned_to_id == User.id) # type: ignore
+    statement = filter_tasks(statement, project_id, current_user, mines, status_task, urgency, assigned_to_id).order_by(Task.id)
+    return export_response(statement, list(task_export_columns), export_format, f"project-{project_id}-tasks")
+
+@project_router.get("/{project_id}/stats", response_model=ProjectTaskStats)
+async def get_project_stats(project_id: int, session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):
+    if not (access.is_participant or access.is_admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not a participant from this project")
+    return await read_task_stats(session, project_id)
+
+# Feed de alterações do projeto (Server-Sent Events) no lugar do polling das listas.
+# Last-Event-ID retoma a partir do último evento recebido, inclusive em outro worker
+@project_router.get("/{project_id}/events", response_class=StreamingResponse)
+async def get_project_events(project_id: int, last_event_id: Optional[int] = Header(None),
+                             session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user),
+                             access: ProjectAccess = Depends(get_project_access)):
+    if not (access.is_participant or access.is_admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not a participant from this project")
+
+    # O stream continua depois que a rota retorna: a sessão do get_session não fica presa a ele e
+    # a sequência é lida numa sessão própria, depois da assinatura (veja dependencies/events.py)
+    await session.close()
+
+    async def load_seq() -> Optional[int]:
+        async with async_session() as stream_session:
+            return (await stream_session.exec(select(project_seq).where(Project.id == project_id))).first()
+
+    # Quem sai do projeto deixa de receber eventos (admins continuam com acesso)
+    closes_for = None if access.is_admin else current_user.id
+    return events_response(hub, project_id, load_seq, last_event_id, closes_for)
 
 @project_router.delete("/{project_id}/task/{task_id}", response_model=dict)
-async def delete_task(project_id: int, task_id:int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
-    db_task = session.get(Task, task_id)
-    if not db_project or not db_task:
+async def delete_task(project_id: int, task_id:int, session: AsyncSession = Depends(get_session), access: ProjectAccess = Depends(get_project_access)):
+    await lock_project_tasks(session, project_id)
+    db_task = await session.get(Task, task_id, with_for_update=True)
+    if not db_task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project or Task Not Found")
-    if db_task.project_id != db_project.id:
+    if db_task.project_id != project_id:
         raise HTTPException(status_code=404, detail="Task does not belogin to this project")
     
-    is_admin = current_user.role == Role.ADMIN
-    is_owner = current_user.id == db_project.owner_id
-    is_manager = False
-    
-    if not(is_admin or is_owner):
-        member_link = session.get(ProjectUserLink, (project_id, current_user.id))
-        if member_link and member_link.project_role == ProjectRole.MANAGER:
-            is_manager = True
-    if not(is_admin or is_owner or is_manager):
+    if not access.has_full_access:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to delete this task")
-    session.delete(db_task)
-    session.commit()
+    await session.delete(db_task)
+    await apply_task_stats(session, project_id, count_task(Counter(), db_task.status, db_task.urgency, db_task.assigned_to_id, -1))
+    seq = await bump_project_tasks(session, project_id)
+    await session.commit()
+    await publish(project_id, seq, "task.deleted", {"task_id": task_id})
     return {"detail": f"Task {task_id} from {project_id} deleted successfully"}
 
 @project_router.patch("/{project_id}/task/{task_id}", response_model=TaskRead)
-async def update_task(project_id: int, task_id:int, update_task: TaskUpdate, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    db_project = session.get(Project, project_id)
-    statement_task = select(Task).where(Task.id == task_id, Task.project_id == project_id)
-    db_task = session.exec(statement_task).first()
+async def update_task(project_id: int, task_id:int, update_task: TaskUpdate, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user), access: ProjectAccess = Depends(get_project_access)):
+    # FOR UPDATE: os valores antigos usados nos contadores não mudam até o commit
+    await lock_project_tasks(session, project_id)
+    statement_task = select(Task).where(Task.id == task_id, Task.project_id == project_id).with_for_update()
+    db_task = (await session.exec(statement_task)).first()
 
-    if not db_project or not db_task:
+    if not db_task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project or Task Not Found")
     
     data_task = update_task.model_dump(exclude_unset=True)
     
-    is_admin = current_user.role == Role.ADMIN
-    is_owner = db_project.owner_id == current_user.id
     is_assigned = db_task.assigned_to_id == current_user.id
-    is_manager = False
-    
-    if not(is_admin or is_owner):
-        member_link = session.get(ProjectUserLink, (project_id, current_user.id))
-        if member_link and member_link.project_role == ProjectRole.MANAGER:
-            is_manager = True
-    has_full_access = is_admin or is_owner or is_manager
+    has_full_access = access.has_full_access
     
     if not(has_full_access or is_assigned):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You dont have permission to update this task")
@@ -278,19 +460,164 @@ async def update_task(project_id: int, task_id:int, update_task: TaskUpdate, ses
         if new_assigned_id is None:
             pass
         else:
-            new_assigned = session.get(User, new_assigned_id)
+            new_assigned = await session.get(User, new_assigned_id)
             
             if not new_assigned:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found")
             
-            if new_assigned.id != db_project.owner_id:
-                link_exists = session.get(ProjectUserLink, (project_id, new_assigned.id))
-                if not link_exists:
+            if new_assigned.id != access.owner_id:
+                _, assigned_role = await resolve_membership(session, project_id, new_assigned.id) or (None, None)
+                if not assigned_role:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New assignee is not a participant")
                 
+    deltas = count_task(Counter(), db_task.status, db_task.urgency, db_task.assigned_to_id, -1)
     db_task.sqlmodel_update(data_task)
+    db_task.version = Task.version + 1 # type: ignore
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await apply_task_stats(session, project_id, count_task(deltas, db_task.status, db_task.urgency, db_task.assigned_to_id))
+    seq = await bump_project_tasks(session, project_id)
+    await session.commit()
+    db_task = await load_task(session, task_id)
+    await publish(project_id, seq, "task.updated", {"task": TaskReadOnCreate.model_validate(db_task).model_dump(mode="json")})
     return db_task
-    
\ No newline at end of file
+    
+
+##bulk tasks
+MAX_BULK_TASKS = 10000
+
+# Valida todos os responsáveis com uma única consulta: retorna o erro (status, detalhe)
+# de cada id inválido; ids ausentes do dict são válidos
+async def validate_assignees(session: AsyncSession, project_id: int, access: ProjectAccess, current_user: User, assignee_ids: Set[uuid.UUID]) -> Dict[uuid.UUID, tuple]:
+    if not assignee_ids:
+        return {}
+    statement = (select(User.id, ProjectUserLink.project_role)
+                 .join(ProjectUserLink, and_(ProjectUserLink.user_id == User.id, ProjectUserLink.project_id == project_id), isouter=True)
+                 .where(User.id.in_(assignee_ids))) # type: ignore
+    roles = {user_id: role for user_id, role in (await session.exec(statement)).all()}
+
+    errors = {}
+    for assignee_id in assignee_ids:
+        if assignee_id not in roles:
+            errors[assignee_id] = (status.HTTP_404_NOT_FOUND, "User Not Found")
+        elif assignee_id != current_user.id and assignee_id != access.owner_id and roles[assignee_id] is None:
+            errors[assignee_id] = (status.HTTP_400_BAD_REQUEST, "Assigned is not a participant of this project")
+    return errors
+
+@project_router.post("/{project_id}/tasks/bulk", response_model=List[TaskBulkResult])
+async def create_tasks_bulk(project_id: int, data_tasks: List[dict] = Body(..., max_length=MAX_BULK_TASKS),
+                            session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user),
+                            access: ProjectAccess = Depends(get_project_access)):
+    if not access.has_full_access:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permissions to create a task in this project")
+
+    # Cada item é validado separadamente: um item inválido é 422 só no seu resultado
+    tasks: List[Any] = []
+    for data in data_tasks:
+        try:
+            tasks.append(TaskCreate.model_validate(data))
+        except ValidationError as error:
+            tasks.append(validation_detail(error))
+
+    assignee_ids = {data_task.assigned_to_id for data_task in tasks if isinstance(data_task, TaskCreate) and data_task.assigned_to_id}
+    assignee_errors = await validate_assignees(session, project_id, access, current_user, assignee_ids)
+
+    results: List[TaskBulkResult] = []
+    rows, row_results = [], []
+    deltas: Counter = Counter()
+    for index, data_task in enumerate(tasks):
+        if not isinstance(data_task, TaskCreate):
+            results.append(TaskBulkResult(index=index, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=data_task))
+            continue
+        if not data_task.assigned_to_id:
+            results.append(TaskBulkResult(index=index, status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found"))
+            continue
+        if data_task.assigned_to_id in assignee_errors:
+            status_code, detail = assignee_errors[data_task.assigned_to_id]
+            results.append(TaskBulkResult(index=index, status_code=status_code, detail=detail))
+            continue
+        result = TaskBulkResult(index=index, status_code=status.HTTP_200_OK)
+        results.append(result)
+        row_results.append(result)
+        rows.append({**data_task.model_dump(), "project_id": project_id})
+        count_task(deltas, data_task.status, data_task.urgency, data_task.assigned_to_id)
+
+    if rows:
+        await lock_project_tasks(session, project_id)
+        # executemany com RETURNING na mesma transação, na ordem dos parâmetros
+        statement = insert(Task).returning(Task.id, sort_by_parameter_order=True) # type: ignore
+        task_ids = (await session.exec(statement, params=rows)).scalars().all()
+        await apply_task_stats(session, project_id, deltas)
+        seq = await bump_project_tasks(session, project_id)
+        await session.commit()
+        for result, task_id in zip(row_results, task_ids):
+            result.id = task_id
+        # Lotes publicam só os ids: o cliente busca as tasks que estiver exibindo
+        await publish(project_id, seq, "tasks.created", {"task_ids": list(task_ids)})
+
+    return results
+
+@project_router.patch("/{project_id}/tasks/bulk", response_model=List[TaskBulkResult])
+async def update_tasks_bulk(project_id: int, update_tasks: List[TaskBulkUpdate] = Body(..., max_length=MAX_BULK_TASKS),
+                            session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user),
+                            access: ProjectAccess = Depends(get_project_access)):
+    await lock_project_tasks(session, project_id)
+    task_ids = {update_task.id for update_task in update_tasks}
+    statement = (select(Task.id, Task.status, Task.urgency, Task.assigned_to_id)
+                 .where(Task.project_id == project_id, Task.id.in_(task_ids)).with_for_update()) # type: ignore
+    current_tasks = {task_id: {"status": status_task, "urgency": urgency, "assigned_to_id": assigned_to_id}
+                     for task_id, status_task, urgency, assigned_to_id in (await session.exec(statement)).all()}
+
+    has_full_access = access.has_full_access
+    new_assignee_ids = set()
+    if has_full_access:
+        new_assignee_ids = {update_task.assigned_to_id for update_task in update_tasks if update_task.assigned_to_id}
+    assignee_errors = await validate_assignees(session, project_id, access, current_user, new_assignee_ids)
+
+    results: List[TaskBulkResult] = []
+    rows: Dict[int, dict] = {}
+    for index, update_task in enumerate(update_tasks):
+        if update_task.id not in current_tasks:
+            results.append(TaskBulkResult(index=index, id=update_task.id, status_code=status.HTTP_404_NOT_FOUND, detail="Project or Task Not Found"))
+            continue
+
+        data_task = update_task.model_dump(exclude_unset=True, exclude={"id"})
+        is_assigned = current_tasks[update_task.id]["assigned_to_id"] == current_user.id
+
+        if not(has_full_access or is_assigned):
+            results.append(TaskBulkResult(index=index, id=update_task.id, status_code=status.HTTP_403_FORBIDDEN, detail="You dont have permission to update this task"))
+            continue
+
+        if is_assigned and not has_full_access:
+            if "status" not in data_task:
+                results.append(TaskBulkResult(index=index, id=update_task.id, status_code=status.HTTP_403_FORBIDDEN, detail="You can only update status"))
+                continue
+            data_task = {"status": data_task["status"]}
+
+        new_assigned_id = data_task.get("assigned_to_id")
+        if new_assigned_id in assignee_errors:
+            status_code, detail = assignee_errors[new_assigned_id]
+            results.append(TaskBulkResult(index=index, id=update_task.id, status_code=status_code, detail=detail))
+            continue
+
+        results.append(TaskBulkResult(index=index, id=update_task.id, status_code=status.HTTP_200_OK))
+        if data_task:
+            # ids repetidos viram uma única linha (o último valor de cada campo vence)
+            rows.setdefault(update_task.id, {"id": update_task.id}).update(data_task)
+
+    if rows:
+        deltas: Counter = Counter()
+        for task_id, row in rows.items():
+            current = current_tasks[task_id]
+            count_task(deltas, current["status"], current["urgency"], current["assigned_to_id"], -1)
+            current.update({key: value for key, value in row.items() if key in current})
+            count_task(deltas, current["status"], current["urgency"], current["assigned_to_id"])
+
+        # UPDATE em lote pela chave primária (agrupado por conjunto de colunas alteradas)
+        await session.exec(update(Task), params=list(rows.values())) # type: ignore
+        await session.exec(update(Task).where(Task.id.in_(rows.keys())).values(version=Task.version + 1)) # type: ignore
+        await apply_task_stats(session, project_id, deltas)
+        seq = await bump_project_tasks(session, project_id)
+        await session.commit()
+        await publish(project_id, seq, "tasks.updated", {"task_ids": list(rows)})
+
+    return results
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query, Response
+from core.request_metrics import InstrumentedRoute
+from dependencies.dependencies import get_current_user, get_session
+from dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from dependencies.search import search
+from models.models import SearchKind, SearchResult, User
+from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+search_router = APIRouter(prefix="/search", tags=["search"], route_class=InstrumentedRoute)
+
+# Busca em título e descrição de tasks e projetos visíveis para o usuário, da mais relevante para a menos
+@search_router.get("", response_model=List[SearchResult])
+async def search_tasks_and_projects(response: Response,
+                                    q: str = Query(..., min_length=1, max_length=200),
+                                    kind: Optional[SearchKind] = None,
+                                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                                    after: Optional[int] = Query(None, ge=0),
+                                    session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
+    return await search(session, current_user, q, kind, response, limit, after)
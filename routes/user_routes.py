@@ -1,23 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from models.models import UserCreate, UserRead, User, UserUpdate, PrivateData, Role
+from fastapi import APIRouter, Body, File, HTTPException, Depends, Query, Response, UploadFile, status
+from models.models import UserCreate, UserRead, User, UserUpdate, UserBulkResult, PrivateData, Role
 from dependencies.dependencies import get_session
-from passlib.context import CryptContext
-from typing import List
-from dependencies.dependencies import get_admin_user, get_current_user
+from core.config import settings
+from core.feed import publish
+from core.request_metrics import InstrumentedRoute
+from core.security import hash_password_async
+from typing import List, Optional
+from dependencies.dependencies import get_admin_user, get_current_user, invalidate_user
+from dependencies.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from dependencies.serialization import json_response, user_dicts, user_list_statement
+from dependencies.etags import bump_user_references
+from dependencies.sessions import revoke_user_sessions
+from dependencies.task_stats import unassign_task_stats
+from dependencies.user_import import csv_users, import_users, json_users
 import uuid
 from sqlalchemy.orm import selectinload
-from sqlmodel import Session, select 
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-user_router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(get_current_user)])
-
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+user_router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(get_current_user)], route_class=InstrumentedRoute)
 
 @user_router.post("/", response_model=UserRead)
-async def create_user(user_input: UserCreate, session: Session = Depends(get_session), _: User = Depends(get_admin_user)):
-    hashed_password = pwd_context.hash(user_input.password)
+async def create_user(user_input: UserCreate, session: AsyncSession = Depends(get_session), _: User = Depends(get_admin_user)):
+    hashed_password = await hash_password_async(user_input.password)
     
     statement = select(User).where(User.email == user_input.email)
-    db_user = session.exec(statement).first()
+    db_user = (await session.exec(statement)).first()
     if db_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
     
@@ -32,32 +40,53 @@ async def create_user(user_input: UserCreate, session: Session = Depends(get_ses
     
     session.add(new_user)
     session.add(new_private_data)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     
     return new_user
 
+MAX_BULK_USERS = 10000
+
+# Cadastro em lote (somente admin): um resultado por item, na ordem do corpo. Cada item é
+# validado separadamente (UserCreate), então um item inválido é 422 só no seu resultado
+@user_router.post("/bulk", response_model=List[UserBulkResult])
+async def create_users_bulk(users: List[dict] = Body(..., max_length=MAX_BULK_USERS),
+                            session: AsyncSession = Depends(get_session), _: User = Depends(get_admin_user)):
+    return await import_users(session, json_users(users))
+
+# Importação de CSV (multipart, campo "file"): mesmas regras do lote, sem limite de linhas;
+# index é a posição da linha de dados (sem contar o cabeçalho)
+@user_router.post("/import", response_model=List[UserBulkResult])
+async def import_users_csv(file: UploadFile = File(...),
+                           session: AsyncSession = Depends(get_session), _: User = Depends(get_admin_user)):
+    return await import_users(session, csv_users(file.file))
+
 @user_router.get("/{user_id}", response_model=UserRead)
-async def get_user(user_id: uuid.UUID, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_user(user_id: uuid.UUID, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     if (current_user.role != Role.ADMIN) and (current_user.id != user_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    db_user = session.get(User, user_id)
+    db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return db_user
 
 @user_router.get("/", response_model=List[UserRead])
-async def get_all_user(session: Session = Depends(get_session), _:User = Depends(get_admin_user)):
-    users = session.exec(select(User)).all()
-    return users
+async def get_all_user(response: Response,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                       after: Optional[uuid.UUID] = None,
+                       session: AsyncSession = Depends(get_session), _:User = Depends(get_admin_user)):
+    if settings.FAST_LIST_SERIALIZATION:
+        rows = await paginate(session, user_list_statement(), User.id, response, limit, after)
+        return json_response(user_dicts(rows), response)
+    return await paginate(session, select(User), User.id, response, limit, after)
 
 @user_router.patch("/{user_id}", response_model=UserRead)
-async def update_user(user_update: UserUpdate, user_id: uuid.UUID, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def update_user(user_update: UserUpdate, user_id: uuid.UUID, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     if (current_user.role != Role.ADMIN) and (current_user.id != user_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
     
     statement = select(User).where(User.id == user_id).options(selectinload(User.private_data)) #type: ignore
-    db_user = session.exec(statement=statement).first()
+    db_user = (await session.exec(statement=statement)).first()
     
     if not db_user or not db_user.private_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User Not Found")
@@ -66,7 +95,7 @@ async def update_user(user_update: UserUpdate, user_id: uuid.UUID, session: Sess
 
     if "email" in user_data and user_data["email"] != db_user.email:
         statement = select(User).where(User.email == user_data["email"])
-        existing_user = session.exec(statement).first()
+        existing_user = (await session.exec(statement)).first()
         if existing_user:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
     
@@ -74,25 +103,42 @@ async def update_user(user_update: UserUpdate, user_id: uuid.UUID, session: Sess
         raw_password = user_data.pop("password")
         
         if db_user.private_data:
-            hashed_password = pwd_context.hash(raw_password)
+            hashed_password = await hash_password_async(raw_password)
             db_user.private_data.hashed_password = hashed_password
             session.add(db_user.private_data)
+            # Troca de senha encerra todas as sessões do usuário
+            await revoke_user_sessions(session, user_id)
     
+    # Nome, e-mail e papel aparecem nas leituras de projetos e tasks: os ETags mudam
+    bumped = []
+    if any(user_data.get(field, value) != value for field, value in (("name", db_user.name), ("email", db_user.email), ("role", db_user.role))):
+        bumped = await bump_user_references(session, user_id)
     db_user.sqlmodel_update(user_data)
     
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await invalidate_user(user_id)
+    await session.refresh(db_user)
+    # bump_user_references soma 1 em version e em tasks_version de cada projeto
+    user_read = UserRead.model_validate(db_user).model_dump(mode="json")
+    for project_id, seq in bumped:
+        await publish(project_id, seq, "user.updated", {"user": user_read}, prev=seq - 2)
     
     return db_user
 
 @user_router.delete("/{user_id}", response_model=dict)
-async def delete_user(user_id: uuid.UUID, session: Session = Depends(get_session), current_user:User = Depends(get_admin_user)):
-    db_user = session.get(User, user_id)
+async def delete_user(user_id: uuid.UUID, session: AsyncSession = Depends(get_session), current_user:User = Depends(get_admin_user)):
+    db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    session.delete(db_user)
-    session.commit()
+    await unassign_task_stats(session, user_id)
+    await revoke_user_sessions(session, user_id)
+    bumped = await bump_user_references(session, user_id)
+    await session.delete(db_user)
+    await session.commit()
+    await invalidate_user(user_id)
+    for project_id, seq in bumped:
+        await publish(project_id, seq, "user.deleted", {"user_id": str(user_id)}, prev=seq - 2)
     
     return {"detail": "User deleted successfully"}
 
@@ -0,0 +1,38 @@
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db.database import async_session, dispose_engine
+from dependencies.task_stats import check_task_stats
+import dotenv
+
+dotenv.load_dotenv()
+
+
+# Compara os contadores de projecttaskstat com as tasks reais; --fix reconstrói os projetos
+# divergentes, cada um numa transação com a linha do projeto travada (seguro com escritas em andamento).
+async def main(args) -> int:
+    async with async_session() as session:
+        mismatches = await check_task_stats(session, args.project, fix=args.fix)
+    await dispose_engine()
+
+    for project_id, diff in sorted(mismatches.items()):
+        for (dimension, value), (stored, expected) in sorted(diff.items()):
+            print(f"project {project_id} {dimension}={value or '<none>'}: stored {stored}, expected {expected}")
+    if not mismatches:
+        print("task stats are consistent")
+        return 0
+    if args.fix:
+        print(f"fixed {len(mismatches)} project(s)")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check (and optionally rebuild) the per-project task counters")
+    parser.add_argument("--project", type=int, default=None)
+    parser.add_argument("--fix", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,25 @@
+from pathlib import Path
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db.database import async_session, dispose_engine
+from dependencies.sessions import purge_expired_sessions
+import dotenv
+
+dotenv.load_dotenv()
+
+
+# Apaga as sessões expiradas de uma vez (ex.: via cron com SESSION_PURGE_INTERVAL_SECONDS=0)
+async def main() -> int:
+    async with async_session() as session:
+        purged = await purge_expired_sessions(session)
+        await session.commit()
+    await dispose_engine()
+    print(f"purged {purged} expired session(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
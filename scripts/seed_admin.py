@@ -1,32 +1,28 @@
 from pathlib import Path
+import asyncio
 import sys
 
-from sqlmodel import Session, select
+from sqlmodel import select
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from db.database import engine
-from passlib.context import CryptContext
+from core.security import get_password_hash
+from db.database import async_session
 from models.models import User, PrivateData, Role
-import dotenv
-
-dotenv.load_dotenv()
-
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 ADMIN_EMAIL = "admin@localhost.com"
 ADMIN_PASSWORD = "12345678"
 
 
-def seed_admin():
-    with Session(engine) as session:
+async def seed_admin():
+    async with async_session() as session:
         statement = select(User).where(User.email == ADMIN_EMAIL)
-        existing = session.exec(statement).first()
+        existing = (await session.exec(statement)).first()
 
         if existing:
             return existing
 
-        hashed_password = pwd_context.hash(ADMIN_PASSWORD)
+        hashed_password = get_password_hash(ADMIN_PASSWORD)
 
         new_user = User(
             name="admin",
@@ -34,7 +30,7 @@ def seed_admin():
             role=Role.ADMIN,
         )
         session.add(new_user)
-        session.flush()
+        await session.flush()
 
         new_private_data = PrivateData(
             user_id=new_user.id,
@@ -42,11 +38,11 @@ def seed_admin():
         )
 
         session.add(new_private_data)
-        session.commit()
-        session.refresh(new_user)
+        await session.commit()
+        await session.refresh(new_user)
 
         return new_user
 
 
 if __name__ == "__main__":
-    seed_admin()
+    asyncio.run(seed_admin())